@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Reconstruction de l'archive (backfill)
+====================================================
+Régénère en une passe les articles quotidiens manquants (ou incomplets)
+sur une plage de dates. L'historique de marché est récupéré en bloc via
+l'endpoint `market_chart/range` de CoinGecko (une requête par devise pour
+toute la plage), le rendu est parallélisé et les écritures disque sont
+regroupées en fin de traitement. Les jours des mois clos rejoignent ensuite
+leur synthèse mensuelle (voir monthly_digest.py).
+
+Usage :
+  python scripts/generate_article.py --backfill 2024-01-01 2026-05-01 [--force] [--ai]
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+
+import chart_data
+import http_client
+import llm_routing
+import monthly_digest
+import price_history
+import run_report
+from generate_article import (
+    analysis_prompt,
+    article_path,
+    fetch_etc_data,
+    generate_basic_analysis,
+    render_hugo_article,
+)
+
+
+COINGECKO_RANGE_PATH = "/coins/ethereum-classic/market_chart/range"
+
+# Jours d'historique supplémentaires nécessaires au calcul de la variation 30j
+LOOKBACK_DAYS = 30
+
+# Jours de cours précédant la plage sur lesquels les indicateurs sont amorcés
+# (≈ 4 × la plus longue période, MME 26j) : les premiers jours reconstruits
+# ont alors les mêmes MME / RSI / volatilité que les articles quotidiens
+INDICATOR_WARMUP_DAYS = 120
+
+# Heure de publication affichée pour les articles reconstruits (celle du cron)
+PUBLISH_HOUR = 9
+
+
+# ──────────────────────────────────────────────
+# 1. Récupération groupée de l'historique
+# ──────────────────────────────────────────────
+
+def _fetch_range(vs_currency: str, start: date, end: date) -> dict:
+    """Récupère prix / capitalisation / volume sur toute la plage en une requête."""
+    params = {
+        "vs_currency": vs_currency,
+        "from": int(datetime(start.year, start.month, start.day, tzinfo=timezone.utc).timestamp()),
+        "to":   int(datetime(end.year, end.month, end.day, 23, 59, tzinfo=timezone.utc).timestamp()),
+    }
+    headers = {"Accept": "application/json"}
+
+    resp = http_client.get(http_client.url("coingecko", COINGECKO_RANGE_PATH), endpoint="coingecko",
+                           params=params, headers=headers, timeout=60)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _daily(points: list) -> dict:
+    """Réduit une série [[timestamp_ms, valeur], …] à un point par jour UTC
+    (le premier du jour, soit l'ouverture à 00:00 UTC en granularité quotidienne)."""
+    daily = {}
+    for ts_ms, value in points:
+        day = datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).date()
+        daily.setdefault(day, value)
+    return daily
+
+
+def _pct(current: float, previous) -> float:
+    return ((current / previous) - 1) * 100 if previous else 0.0
+
+
+def fetch_market_history(start: date, end: date, warmup: dict = None) -> dict:
+    """Retourne {date: etc_data} pour chaque jour de la plage, au format de `fetch_etc_data`.
+
+    Trois requêtes au total quelle que soit la longueur de la plage :
+    l'historique USD, l'historique EUR et l'instantané courant (pour l'ATH).
+    `warmup` reçoit {date: cours USD} des `INDICATOR_WARMUP_DAYS` jours
+    précédant la plage (amorçage des indicateurs).
+    """
+    usd = _fetch_range("usd", start - timedelta(days=max(LOOKBACK_DAYS, INDICATOR_WARMUP_DAYS)),
+                       end)
+    eur = _fetch_range("eur", start, end)
+    current = fetch_etc_data()
+
+    prices  = _daily(usd.get("prices", []))
+    caps    = _daily(usd.get("market_caps", []))
+    volumes = _daily(usd.get("total_volumes", []))
+    prices_eur = _daily(eur.get("prices", []))
+
+    ath_date = date.fromisoformat(current["ath_date"])
+    running_ath = 0.0
+    history = {}
+
+    for day in sorted(prices):
+        price = prices[day]
+        running_ath = max(running_ath, price)
+        if day < start and warmup is not None:
+            warmup[day] = price
+        if day < start or day > end:
+            continue
+        # L'ATH actuel n'est valable qu'à partir de sa date ; avant, on
+        # retient le plus haut observé dans la série récupérée.
+        ath_usd, ath_day = ((current["ath_usd"], current["ath_date"]) if day >= ath_date
+                            else (running_ath, day.isoformat()))
+        history[day] = {
+            "price_usd":      price,
+            "price_eur":      prices_eur.get(day, 0.0),
+            "change_24h":     _pct(price, prices.get(day - timedelta(days=1))),
+            "change_7d":      _pct(price, prices.get(day - timedelta(days=7))),
+            "change_30d":     _pct(price, prices.get(day - timedelta(days=30))),
+            "market_cap_usd": caps.get(day, 0.0),
+            "volume_24h_usd": volumes.get(day, 0.0),
+            "ath_usd":        ath_usd,
+            "ath_date":       ath_day,
+        }
+    return history
+
+
+# ──────────────────────────────────────────────
+# 2. Sélection et rendu des articles
+# ──────────────────────────────────────────────
+
+def needs_rebuild(day: date, force: bool = False) -> bool:
+    """Un article est à (re)générer s'il manque (ni publié, ni archivé dans un
+    mois compacté) ou si son front matter est incomplet."""
+    filepath = article_path(day)
+    if not os.path.exists(filepath):
+        filepath = monthly_digest.archived_path(day)
+    if force or not os.path.exists(filepath):
+        return True
+    try:
+        return not price_history.parse_post_front_matter(filepath)
+    except (OSError, ValueError):
+        return True
+
+
+def daily_indicators(history: dict, warmup: dict = None) -> dict:
+    """Indicateurs techniques de chaque jour, calculés en une passe vectorisée
+    sur toute la série, précédée des cours d'amorçage `warmup` ({date: cours
+    USD} antérieurs à la plage). Retourne {} si NumPy est indisponible."""
+    try:
+        from indicators import compute_indicators
+    except ImportError:
+        return {}
+
+    days  = sorted(history)
+    first = days[0] if days else None
+    prior = sorted(day for day in (warmup or {}) if first and day < first)
+    ath   = max((d["ath_usd"] for d in history.values() if d["ath_date"] < first.isoformat()),
+                default=0.0) if days else 0.0
+    series = compute_indicators([warmup[day] for day in prior]
+                                + [history[day]["price_usd"] for day in days], ath)
+    return {
+        day: {name: (None if values[i] != values[i] else float(values[i]))
+              for name, values in series.items()}
+        for i, day in enumerate(days, len(prior))
+    }
+
+
+def batch_ai_analyses(todo: list, ind: dict, api_key: str) -> dict:
+    """Analyses Claude de tous les jours à régénérer, en un lot de l'API
+    Message Batches par route (séances ordinaires / inhabituelles, voir
+    llm_routing.py). Retourne {date: analyse} pour les jours obtenus."""
+    import anthropic
+    from llm_batch import run_message_batch
+
+    client = anthropic.Anthropic(api_key=api_key)
+    routes = {}
+    for day, etc_data in todo:
+        route = llm_routing.route_analysis(etc_data, ind.get(day))
+        routes.setdefault(route, {})[day.isoformat()] = analysis_prompt(etc_data, ind.get(day), route)
+
+    results = {}
+    for route, items in sorted(routes.items()):
+        settings = llm_routing.ROUTES[route]
+        try:
+            results.update(run_message_batch(client, settings["model"], items,
+                                             max_tokens=settings["max_tokens"]))
+        except Exception as exc:
+            print(f"   ⚠️  Erreur API Message Batches ({route} : {exc}) — analyses basiques utilisées.")
+        run_report.count(f"llm.route.{route}", len(items))
+    print(f"   {len(results)}/{len(todo)} analyse(s) IA obtenue(s) "
+          f"({', '.join(f'{route} : {len(items)}' for route, items in sorted(routes.items()))})")
+    return {date.fromisoformat(day): text for day, text in results.items()}
+
+
+def _render_day(item: tuple) -> tuple:
+    """Rendu d'un jour (exécuté dans un processus de travail)."""
+    day, etc_data, ind, analysis = item
+    now = datetime(day.year, day.month, day.day, PUBLISH_HOUR)
+    analysis = analysis or generate_basic_analysis(etc_data, ind=ind)
+    return article_path(now), render_hugo_article(etc_data, analysis, now)
+
+
+def write_batch(rendered: list) -> None:
+    """Écrit tous les articles rendus en une passe (écriture atomique par fichier)."""
+    os.makedirs(os.path.join("content", "posts"), exist_ok=True)
+    for filepath, content in rendered:
+        tmp_path = filepath + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            fh.write(content)
+        os.replace(tmp_path, filepath)
+
+
+# ──────────────────────────────────────────────
+# 3. Orchestration
+# ──────────────────────────────────────────────
+
+def run_backfill(start: date, end: date, force: bool = False, workers: int = None,
+                 api_key: str = "") -> int:
+    """Reconstruit les articles manquants ou incomplets entre `start` et `end` (inclus).
+
+    Avec `api_key`, les analyses sont demandées à Claude en un lot asynchrone ;
+    sinon (ou en cas d'échec) l'analyse basique est utilisée.
+    Retourne le nombre d'articles écrits.
+    """
+    if end < start:
+        raise ValueError(f"Plage invalide : {start} > {end}")
+
+    print(f"\n📡 Récupération groupée de l'historique CoinGecko ({start} → {end})…")
+    warmup = {}
+    with run_report.stage("fetch"):
+        history = fetch_market_history(start, end, warmup)
+        # Amorçage : cours des articles déjà publiés de préférence (ceux sur
+        # lesquels leurs indicateurs ont été calculés), sinon série CoinGecko
+        warmup.update((date.fromisoformat(rec["date"]), rec["price_usd"]) for rec in
+                      price_history.read_range(start - timedelta(days=INDICATOR_WARMUP_DAYS),
+                                               start - timedelta(days=1)))
+    print(f"   {len(history)} jour(s) de données de marché")
+
+    todo = [(day, history[day]) for day in sorted(history) if needs_rebuild(day, force)]
+    print(f"   {len(todo)} article(s) manquant(s) ou incomplet(s) à générer")
+    run_report.set_meta(days=len(history), rebuilt=len(todo))
+
+    if todo:
+        with run_report.stage("indicators"):
+            ind = daily_indicators(history, warmup)
+        analyses = {}
+        if api_key:
+            print("\n🤖 Analyses IA (API Message Batches)…")
+            with run_report.stage("analysis"):
+                analyses = batch_ai_analyses(todo, ind, api_key)
+
+        print("\n📝 Rendu des articles…")
+        items = [(day, etc_data, ind.get(day), analyses.get(day)) for day, etc_data in todo]
+        with run_report.stage("render"), ProcessPoolExecutor(max_workers=workers) as pool:
+            rendered = list(pool.map(_render_day, items, chunksize=64))
+        with run_report.stage("write"):
+            write_batch(rendered)
+        print(f"✅ {len(rendered)} article(s) écrit(s)")
+
+    # Seuls les jours régénérés sont fusionnés : les jours déjà publiés
+    # conservent les valeurs de leur article d'origine.
+    with run_report.stage("write"):
+        count = price_history.write_days(dict(todo))
+        print(f"   Historique mis à jour : {count} jour(s) dans {price_history.HISTORY_PATH}")
+        print(f"   Séries du graphique : {chart_data.write_chart_data()}")
+
+    # Les jours des mois clos rejoignent leur synthèse mensuelle
+    with run_report.stage("digest"):
+        stats = monthly_digest.compact()
+    if stats["months"]:
+        print(f"   Synthèses mensuelles : {len(stats['months'])} mois, "
+              f"{stats['days']} article(s) archivé(s)")
+    return len(todo)
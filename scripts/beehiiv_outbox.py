@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — File d'envoi Beehiiv
+==================================
+File persistante des publications Beehiiv (history/beehiiv-outbox.json),
+indexées par une clé stable : `etc-2026-05-14` pour l'article du jour,
+`etc-2026-05-14-1530` pour une mise à jour intrajournalière.
+
+  - `enqueue` n'envoie rien : la génération du contenu ne dépend jamais de
+    Beehiiv. Un contenu dont l'empreinte n'a pas changé depuis son dernier
+    envoi est ignoré (une relance du job ne renvoie pas la newsletter) ; un
+    contenu modifié met à jour le post déjà créé (PUT) au lieu d'en créer
+    un second.
+  - `flush` livre en parallèle les publications dues. Un échec reprogramme
+    la publication (`next_attempt`, backoff exponentiel) jusqu'à
+    `MAX_ATTEMPTS` essais ; une erreur définitive (4xx) la marque en échec.
+  - Une création (POST) est marquée `unconfirmed` avant l'envoi. Si son
+    issue reste inconnue (délai dépassé, 5xx, arrêt du processus), le
+    passage suivant cherche d'abord le post parmi les derniers publiés :
+    jamais de doublon.
+
+Variables d'environnement :
+  BEEHIIV_API_KEY        Clé API Beehiiv
+  BEEHIIV_PUBLICATION_ID ID de la publication Beehiiv
+
+Usage :
+  python scripts/beehiiv_outbox.py status   État de la file
+  python scripts/beehiiv_outbox.py flush    Livre les publications dues
+  python scripts/beehiiv_outbox.py retry    Remet en file les publications en échec
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import requests
+
+import http_client
+import run_report
+
+
+OUTBOX_PATH     = os.path.join("history", "beehiiv-outbox.json")
+OUTBOX_WORKERS  = 4         # livraisons simultanées (le débit reste borné par http_client)
+MAX_ATTEMPTS    = 8         # essais avant abandon (statut « failed »)
+RETRY_BASE      = 60.0      # s — premier report après un échec (avant gigue)
+RETRY_CAP       = 6 * 3600  # s — report maximal
+SAVE_INTERVAL   = 1.0       # s — sauvegarde de la file pendant une livraison
+LOOKUP_LIMIT    = 100       # derniers posts consultés après une issue incertaine
+
+_TIME_FMT = "%Y-%m-%dT%H:%M:%S"
+
+
+def payload_hash(payload: dict) -> str:
+    """Empreinte du contenu publié (clés triées : indépendante de l'ordre)."""
+    blob = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()[:16]
+
+
+# ──────────────────────────────────────────────
+# 1. File persistante
+# ──────────────────────────────────────────────
+
+class Outbox:
+    """Publications en attente ou livrées, par clé. Chaque entrée garde
+    l'empreinte du contenu en file (`hash`) et du dernier contenu livré
+    (`sent_hash`) ; le contenu lui-même n'est conservé que jusqu'à la
+    livraison."""
+
+    def __init__(self, path: str = OUTBOX_PATH):
+        self.path  = path
+        self.posts = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as fh:
+                self.posts = json.load(fh).get("posts", {})
+        self._lock = threading.Lock()
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump({"posts": self.posts}, fh, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def enqueue(self, key: str, payload: dict, now: datetime = None, save: bool = True) -> bool:
+        """Met une publication en file. Retourne False si ce contenu est déjà
+        livré ou déjà en file (rien à faire). `save=False` laisse l'écriture
+        de la file à l'appelant (mise en file groupée)."""
+        digest = payload_hash(payload)
+        stamp  = (now or datetime.now()).strftime(_TIME_FMT)
+        with self._lock:
+            entry = self.posts.get(key)
+            if entry and (digest == entry.get("sent_hash")
+                          or (digest == entry["hash"] and entry["status"] != "sent")):
+                run_report.count("beehiiv.unchanged")
+                return False
+            entry = self.posts.setdefault(key, {})
+            entry.update(payload=payload, hash=digest, status="pending", attempts=0,
+                         next_attempt=stamp, queued_at=stamp, error=None)
+            if save:
+                self.save()
+        return True
+
+    def due(self, now: datetime = None) -> list:
+        stamp = (now or datetime.now()).strftime(_TIME_FMT)
+        return sorted(key for key, entry in self.posts.items()
+                      if entry["status"] == "pending" and entry["next_attempt"] <= stamp)
+
+    def retry_failed(self) -> int:
+        """Remet en file les publications abandonnées (après correction d'une
+        clé ou d'un contenu refusé, par exemple)."""
+        failed = [entry for entry in self.posts.values() if entry["status"] == "failed"]
+        stamp  = datetime.now().strftime(_TIME_FMT)
+        for entry in failed:
+            entry.update(status="pending", attempts=0, next_attempt=stamp)
+        if failed:
+            self.save()
+        return len(failed)
+
+    def counts(self) -> dict:
+        counts = {"pending": 0, "sent": 0, "failed": 0}
+        for entry in self.posts.values():
+            counts[entry["status"]] += 1
+        return counts
+
+    # ── Livraison ──
+
+    def flush(self, api_key: str, pub_id: str, max_workers: int = OUTBOX_WORKERS,
+              now: datetime = None) -> dict:
+        """Livre en parallèle les publications dues et retourne le nombre de
+        créations, mises à jour, reports et abandons."""
+        stats = {"created": 0, "updated": 0, "retry": 0, "failed": 0}
+        due = self.due(now)
+        if not due:
+            return stats
+
+        # Issues incertaines d'un passage précédent : derniers posts consultés
+        # une fois ; puis toute création est marquée avant l'envoi
+        recent = None
+        if any(self.posts[key].get("unconfirmed") for key in due):
+            recent = _recent_posts(api_key, pub_id)
+        with self._lock:
+            for key in due:
+                if not self.posts[key].get("post_id"):
+                    self.posts[key]["unconfirmed"] = True
+            self.save()
+
+        last_save = time.monotonic()
+
+        def deliver(key: str) -> str:
+            nonlocal last_save
+            outcome = self._deliver(key, api_key, pub_id, recent)
+            with self._lock:
+                if time.monotonic() - last_save >= SAVE_INTERVAL:
+                    self.save()
+                    last_save = time.monotonic()
+            return outcome
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(due))) as pool:
+            for outcome in pool.map(deliver, due):
+                stats[outcome] += 1
+                run_report.count(f"beehiiv.{outcome}")
+        with self._lock:
+            self.save()
+        return stats
+
+    def _deliver(self, key: str, api_key: str, pub_id: str, recent: dict = None) -> str:
+        entry   = self.posts[key]
+        payload = entry["payload"]
+        posts   = http_client.url("beehiiv", f"/publications/{pub_id}/posts")
+        headers = {"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"}
+
+        # Création peut-être déjà reçue par Beehiiv : on la retrouve par son titre
+        found = (recent or {}).get(payload["title"]) if entry.get("unconfirmed") else None
+        if found and not entry.get("post_id"):
+            with self._lock:
+                entry.update(post_id=found["id"], web_url=found.get("web_url"))
+            run_report.count("beehiiv.recovered")
+
+        post_id = entry.get("post_id")
+        try:
+            if post_id:
+                resp = http_client.request("PUT", f"{posts}/{post_id}", endpoint="beehiiv",
+                                           json=payload, headers=headers, timeout=30)
+            else:
+                resp = http_client.post(posts, endpoint="beehiiv", json=payload,
+                                        headers=headers, timeout=30)
+        except requests.exceptions.RequestException as exc:
+            # Seul un échec de connexion garantit que la requête n'a pas été reçue
+            sure = isinstance(exc, requests.exceptions.ConnectTimeout)
+            return self._reschedule(key, f"{exc.__class__.__name__} : {exc}", None,
+                                    unconfirmed=not post_id and not sure)
+
+        if resp.status_code in (200, 201):
+            data = resp.json().get("data", {})
+            with self._lock:
+                entry.update(status="sent", sent_hash=entry["hash"], attempts=0, error=None,
+                             unconfirmed=False, sent_at=datetime.now().strftime(_TIME_FMT),
+                             post_id=data.get("id", post_id),
+                             web_url=data.get("web_url") or data.get("url") or entry.get("web_url"))
+                entry.pop("payload", None)
+            print(f"✅ Beehiiv — {key} {'mis à jour' if post_id else 'publié'} "
+                  f"(id={entry['post_id']}) : {entry['web_url'] or '—'}")
+            return "updated" if post_id else "created"
+
+        error = f"HTTP {resp.status_code} : {resp.text[:300]}"
+        if resp.status_code == 429 or resp.status_code >= 500:
+            return self._reschedule(key, error, resp,
+                                    unconfirmed=not post_id and resp.status_code != 429)
+        with self._lock:
+            entry.update(status="failed", error=error, unconfirmed=False)
+        print(f"⚠️  Beehiiv — {key} refusé ({error})")
+        return "failed"
+
+    def _reschedule(self, key: str, error: str, resp, unconfirmed: bool) -> str:
+        """Reporte une livraison (backoff exponentiel, Retry-After respecté),
+        ou l'abandonne après `MAX_ATTEMPTS` essais."""
+        with self._lock:
+            entry = self.posts[key]
+            entry["attempts"] += 1
+            entry.update(error=error, unconfirmed=unconfirmed)
+            if entry["attempts"] >= MAX_ATTEMPTS:
+                entry["status"] = "failed"
+                print(f"⚠️  Beehiiv — {key} abandonné après {entry['attempts']} essais ({error})")
+                return "failed"
+            delay = http_client.backoff_delay(entry["attempts"] - 1, resp,
+                                              base=RETRY_BASE, cap=RETRY_CAP)
+            entry["next_attempt"] = (datetime.now() + timedelta(seconds=delay)).strftime(_TIME_FMT)
+        print(f"⏳ Beehiiv — {key} reporté au {entry['next_attempt']} ({error})")
+        return "retry"
+
+
+def _recent_posts(api_key: str, pub_id: str) -> dict:
+    """{titre: post} des derniers posts de la publication ({} en cas d'erreur)."""
+    try:
+        resp = http_client.get(
+            http_client.url("beehiiv", f"/publications/{pub_id}/posts"), endpoint="beehiiv",
+            params={"limit": LOOKUP_LIMIT, "order_by": "created", "direction": "desc"},
+            headers={"Authorization": f"Bearer {api_key}"}, timeout=30,
+        )
+        resp.raise_for_status()
+    except requests.exceptions.RequestException as exc:
+        print(f"⚠️  Beehiiv — liste des posts indisponible ({exc})")
+        return {}
+    return {post.get("title"): post for post in resp.json().get("data", [])}
+
+
+# ──────────────────────────────────────────────
+# 2. Publication
+# ──────────────────────────────────────────────
+
+def publish(key: str, payload: dict, api_key: str, pub_id: str, outbox: Outbox = None) -> dict:
+    """Met la publication en file puis livre tout ce qui est dû (elle-même et
+    les publications reportées des passages précédents)."""
+    outbox = outbox or Outbox()
+    if not outbox.enqueue(key, payload):
+        print(f"ℹ️  Beehiiv — {key} inchangé depuis le dernier envoi, rien à publier.")
+    return outbox.flush(api_key, pub_id)
+
+
+# ──────────────────────────────────────────────
+# 3. Point d'entrée
+# ──────────────────────────────────────────────
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="ETC Tracker — file d'envoi Beehiiv")
+    parser.add_argument("command", choices=("status", "flush", "retry"), nargs="?",
+                        default="status")
+    parser.add_argument("--workers", type=int, default=OUTBOX_WORKERS,
+                        help=f"livraisons simultanées (défaut {OUTBOX_WORKERS})")
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    args   = parse_args()
+    outbox = Outbox()
+
+    if args.command == "status":
+        counts = outbox.counts()
+        print(f"📬 {counts['pending']} en attente  |  {counts['sent']} livrée(s)  |  "
+              f"{counts['failed']} en échec")
+        for key, entry in sorted(outbox.posts.items()):
+            if entry["status"] != "sent":
+                print(f"   {key:<22} {entry['status']:<8} essai(s) {entry['attempts']}  "
+                      f"prochain {entry['next_attempt']}  {entry.get('error') or ''}")
+        return
+
+    if args.command == "retry":
+        print(f"↻ {outbox.retry_failed()} publication(s) remise(s) en file")
+
+    api_key = os.environ.get("BEEHIIV_API_KEY", "").strip()
+    pub_id  = os.environ.get("BEEHIIV_PUBLICATION_ID", "").strip()
+    if not (api_key and pub_id):
+        print("❌ Variables BEEHIIV_API_KEY / BEEHIIV_PUBLICATION_ID manquantes.")
+        sys.exit(1)
+
+    with run_report.run("beehiiv_outbox"):
+        stats = outbox.flush(api_key, pub_id, max_workers=args.workers)
+        run_report.set_meta(outbox=stats)
+        print(f"\n📬 {stats['created']} créée(s), {stats['updated']} mise(s) à jour, "
+              f"{stats['retry']} reportée(s), {stats['failed']} en échec")
+        print("\nTerminé ✓")
+
+
+if __name__ == "__main__":
+    main()
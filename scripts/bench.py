@@ -0,0 +1,646 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Benchmarks
+========================
+Mesures de performance hors ligne des briques du pipeline. Les scénarios
+réseau s'exécutent contre les services factices de fake_services.py, dans
+un répertoire de travail temporaire : aucune clé ni connexion requise.
+
+Usage :
+  python scripts/bench.py                Tous les scénarios
+  python scripts/bench.py indicators     Indicateurs techniques sur 10 ans de cours
+  python scripts/bench.py e2e            Génération quotidienne complète (avec et sans fautes)
+  python scripts/bench.py pipeline       Article + actualités : enchaînement séquentiel vs graphe
+  python scripts/bench.py backfill       Reconstruction de 3 000 jours (sans et avec analyses IA)
+  python scripts/bench.py news           Lot de 300 actualités (filtre, reformulation, pages),
+                                         débit du filtre, ingestion paginée de 3 000 articles
+                                         et regroupement des reprises sur 5 000 articles
+  python scripts/bench.py render         Rendu de 5 000 articles (Markdown, HTML Beehiiv, écriture)
+  python scripts/bench.py search         Index de recherche de 3 000 articles (complet, incrémental)
+  python scripts/bench.py outbox         File d'envoi Beehiiv : 200 publications (parallèle, relance, pannes)
+  python scripts/bench.py sites          Sites multilingues : 2 sites × 3 langues en un run
+  python scripts/bench.py prices         Étape market : source principale lente, limitée ou en panne
+  python scripts/bench.py routing        Routage Claude : analyse et reformulation, routées ou complètes
+  python scripts/bench.py digest         Synthèses mensuelles : compaction de 3 ans d'articles quotidiens
+"""
+
+import io
+import os
+import sys
+import time
+import tempfile
+import statistics
+from contextlib import contextmanager, redirect_stdout
+from datetime import date, datetime
+
+
+# ──────────────────────────────────────────────
+# 1. Outils de mesure
+# ──────────────────────────────────────────────
+
+def timeit(fn, repeat: int = 50) -> dict:
+    """Exécute `fn` `repeat` fois et retourne médiane / p95 / max en millisecondes."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "median_ms": statistics.median(samples),
+        "p95_ms":    samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "max_ms":    samples[-1],
+    }
+
+
+def report(name: str, result: dict, budget_ms: float = None) -> bool:
+    """Affiche une mesure ; retourne False si la médiane dépasse le budget."""
+    ok = budget_ms is None or result["median_ms"] <= budget_ms
+    status = "✓" if ok else "✗"
+    budget = f"  (budget {budget_ms:.1f} ms)" if budget_ms is not None else ""
+    print(f"   {status} {name:<42} médiane {result['median_ms']:8.3f} ms  "
+          f"p95 {result['p95_ms']:8.3f} ms{budget}")
+    return ok
+
+
+@contextmanager
+def offline(**faults):
+    """Services factices démarrés, clés factices, répertoire de travail
+    temporaire, cache LLM désactivé, budgets de débit levés et sortie
+    standard des scripts masquée. Fournit l'instance `FakeServices`."""
+    import http_client
+    import llm_cache
+    from fake_services import FakeServices, service_env
+
+    env = {"ANTHROPIC_API_KEY": "fake", "NEWSAPI_API_KEY": "fake",
+           "BEEHIIV_API_KEY": "fake", "BEEHIIV_PUBLICATION_ID": "pub_fake"}
+    saved_env = {name: os.environ.get(name) for name in [*env, *service_env("")]}
+    saved_endpoints = dict(http_client.ENDPOINTS)
+    cwd = os.getcwd()
+
+    with FakeServices(**faults) as fake, tempfile.TemporaryDirectory() as workdir:
+        os.environ.update(env, **fake.env())
+        http_client.ENDPOINTS.update({name: {"rate": 1e6, "burst": 1e6} for name in saved_endpoints})
+        http_client.close()
+        http_client._budgets.clear()
+        http_client._validators.clear()
+        llm_cache._default_cache = llm_cache.LLMCache(enabled=False)
+        os.chdir(workdir)
+        try:
+            with redirect_stdout(io.StringIO()):
+                yield fake
+        finally:
+            os.chdir(cwd)
+            http_client.close()
+            http_client._budgets.clear()
+            http_client._validators.clear()
+            http_client.ENDPOINTS.clear()
+            http_client.ENDPOINTS.update(saved_endpoints)
+            llm_cache._default_cache = None
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+
+# ──────────────────────────────────────────────
+# 2. Scénarios
+# ──────────────────────────────────────────────
+
+def bench_indicators() -> bool:
+    """Calcul complet et mise à jour incrémentale sur 10 ans de cours quotidiens."""
+    import numpy as np
+    from indicators import IndicatorState, compute_indicators
+
+    rng    = np.random.default_rng(42)
+    prices = 10 * np.exp(np.cumsum(rng.normal(0, 0.04, 3650)))
+
+    print("\n📊 Indicateurs techniques — 3 650 jours")
+    ok = report("compute_indicators (série complète)",
+                timeit(lambda: compute_indicators(prices, 167.09)), budget_ms=5.0)
+
+    state = IndicatorState(prices[:-1], 167.09)
+    ok &= report("IndicatorState.update (1 jour)",
+                 timeit(lambda: state.update(prices[-1]), repeat=500), budget_ms=0.5)
+    return ok
+
+
+def _daily_run() -> None:
+    """Séquence de generate_article.main() sans la mise en forme console."""
+    import chart_data
+    import price_history
+    from generate_article import (
+        article_path, compute_market_indicators, create_hugo_article,
+        fetch_etc_data, generate_ai_analysis, publish_to_beehiiv,
+    )
+
+    now = datetime.now()
+    etc_data = fetch_etc_data()
+    ind = compute_market_indicators(etc_data, now)
+    analysis = generate_ai_analysis(etc_data, os.environ["ANTHROPIC_API_KEY"], ind)
+    if os.path.exists(article_path(now)):
+        os.remove(article_path(now))
+    create_hugo_article(etc_data, analysis, now)
+    price_history.append_day(now, etc_data)
+    chart_data.write_chart_data()
+    publish_to_beehiiv(etc_data, analysis, os.environ["BEEHIIV_API_KEY"],
+                       os.environ["BEEHIIV_PUBLICATION_ID"])
+
+
+def bench_e2e() -> bool:
+    """Génération quotidienne complète : données, analyse, article, historique, Beehiiv."""
+    print("\n🧪 Génération quotidienne (services factices)")
+    with offline():
+        _daily_run()    # imports et création des clients hors mesure
+        clean = timeit(_daily_run, repeat=20)
+    with offline(latency=0.02, throttle_rate=0.1, error_rate=0.05) as fake:
+        faulty = timeit(_daily_run, repeat=10)
+        injected = sum(s["throttled"] + s["failed"] for s in fake.stats.values())
+
+    ok = report("run quotidien", clean, budget_ms=150.0)
+    ok &= report(f"run quotidien (20 ms, {injected} 429/503)", faulty, budget_ms=1500.0)
+    return ok
+
+
+def bench_pipeline() -> bool:
+    """Run complet (article + actualités) : les deux scripts enchaînés contre
+    le graphe de pipeline.py, avec 50 ms de latence par appel."""
+    import news_store
+    from fetch_ethereum_news import refresh_news
+    from generate_article import article_path
+    from pipeline import build_daily_pipeline
+
+    def reset():
+        for path in (news_store.INDEX_PATH, article_path(datetime.now())):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def sequential():
+        reset()
+        _daily_run()
+        refresh_news(os.environ["NEWSAPI_API_KEY"], os.environ["ANTHROPIC_API_KEY"])
+
+    def graph():
+        reset()
+        build_daily_pipeline().run()
+
+    print("\n🧪 Article + actualités (services factices, 50 ms/appel)")
+    with offline(latency=0.05):
+        sequential()    # imports et création des clients hors mesure
+        chained    = timeit(sequential, repeat=5)
+        overlapped = timeit(graph, repeat=5)
+
+    ok = report("scripts enchaînés", chained)
+    ok &= report("pipeline (graphe)", overlapped, budget_ms=chained["median_ms"] * 0.8)
+    return ok
+
+
+def bench_backfill() -> bool:
+    """Reconstruction de l'archive sur ~3 000 jours, sans puis avec analyses IA (Message Batches)."""
+    from backfill import run_backfill
+
+    start, end = date(2018, 1, 1), date(2026, 3, 31)
+    days = (end - start).days + 1
+    print(f"\n🧪 Reconstruction de l'archive — {days} jours (services factices)")
+    with offline():
+        basic = timeit(lambda: run_backfill(start, end, force=True), repeat=3)
+        ai = timeit(lambda: run_backfill(start, end, force=True, api_key="fake"), repeat=3)
+
+    ok = report("backfill (analyses basiques)", basic, budget_ms=5_000.0)
+    ok &= report("backfill (Message Batches)", ai, budget_ms=8_000.0)
+    return ok
+
+
+def bench_news() -> bool:
+    """Lot de 300 actualités : filtre strict, reformulation groupée ou concurrente, pages ;
+    débit du filtre sur 5 000 articles, ingestion paginée de 3 000 articles et
+    regroupement des reprises (30 % d'articles syndiqués) sur 5 000 articles."""
+    import news_clusters
+    import news_store
+    from fake_services import synthetic_articles
+    from fetch_ethereum_news import (
+        create_news_markdown, fetch_ethereum_news, filter_strict_etc, reformulate_articles,
+        reformulate_batch,
+    )
+
+    raw = synthetic_articles(300)
+    print(f"\n🧪 Actualités — {len(raw)} articles bruts (services factices)")
+    with offline(latency=0.02):
+        filtering  = timeit(lambda: filter_strict_etc(raw))
+        articles   = filter_strict_etc(raw)
+        batched    = timeit(lambda: reformulate_batch(articles, "fake"), repeat=3)
+        concurrent = timeit(lambda: reformulate_articles(articles, "fake"), repeat=3)
+
+        summaries = reformulate_batch(articles, "fake")
+        index = news_store.load_index()
+
+        def pages():
+            news_store.add_articles(index, articles, summaries)
+            create_news_markdown(*news_store.latest(index, 5))
+            create_news_markdown(*news_store.seen_on(index, datetime.now()))
+
+        rendering = timeit(pages, repeat=10)
+
+    volume = synthetic_articles(5_000)
+    throughput = timeit(lambda: filter_strict_etc(volume), repeat=3)
+    with offline(news_count=3_000):
+        paged = timeit(lambda: fetch_ethereum_news("fake", max_articles=10**6, pages=30,
+                                                   page_size=100), repeat=3)
+
+    pool = filter_strict_etc(synthetic_articles(5_000, syndication=0.3))
+    empty = {"last_published_at": None, "articles": {}}
+    clustering = timeit(lambda: news_clusters.mark_duplicates(empty, [dict(a) for a in pool]),
+                        repeat=3)
+    summaries_needed = len(pool) - news_clusters.mark_duplicates(empty, pool)
+
+    ok = report("filter_strict_etc", filtering, budget_ms=30.0)
+    ok &= report("reformulation groupée (20 ms/appel)", batched, budget_ms=1_000.0)
+    ok &= report("reformulation concurrente (20 ms/appel)", concurrent, budget_ms=3_000.0)
+    ok &= report("index + pages d'actualités", rendering, budget_ms=50.0)
+    ok &= report("filtre de 5 000 articles", throughput, budget_ms=500.0)
+    ok &= report("ingestion paginée (30 pages de 100)", paged, budget_ms=500.0)
+    ok &= report("regroupement des reprises", clustering, budget_ms=1_000.0)
+    print(f"   → {summaries_needed} résumé(s) à produire au lieu de {len(pool)} "
+          f"(−{1 - summaries_needed / len(pool):.0%} d'appels de reformulation)")
+    return ok
+
+
+def bench_render() -> bool:
+    """Débit de rendu de 5 000 articles, comparé à leur seule écriture sur disque."""
+    from datetime import timedelta
+    from backfill import write_batch
+    from generate_article import ETC_ASSET, article_path, generate_basic_analysis
+    from post_document import build_document, render
+
+    count = 5_000
+    first = datetime(2012, 1, 1, 9)
+    posts = []
+    for idx in range(count):
+        price = 10 + (idx % 97) / 7
+        etc_data = {
+            "price_usd": price, "price_eur": price * 0.92, "change_24h": (idx % 11) - 5.0,
+            "change_7d": (idx % 13) - 6.0, "change_30d": (idx % 17) - 8.0,
+            "market_cap_usd": price * 1.5e8, "volume_24h_usd": price * 7e6,
+            "ath_usd": 167.09, "ath_date": "2021-05-06",
+        }
+        posts.append((etc_data, generate_basic_analysis(etc_data), first + timedelta(days=idx)))
+
+    def markdown():
+        return [render(build_document(d, a, now, ETC_ASSET), "markdown") for d, a, now in posts]
+
+    def all_outputs():
+        for d, a, now in posts:
+            doc = build_document(d, a, now, ETC_ASSET)
+            render(doc, "markdown")
+            render(doc, "beehiiv_html")
+
+    rendered = [(article_path(now), text) for (_, _, now), text in zip(posts, markdown())]
+
+    print(f"\n🧾 Rendu des articles — {count} articles")
+    md = timeit(markdown, repeat=5)
+    ok = report("document + Markdown", md, budget_ms=400.0)
+    ok &= report("document + Markdown + HTML Beehiiv", timeit(all_outputs, repeat=5), budget_ms=700.0)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            io_cost = timeit(lambda: write_batch(rendered), repeat=3)
+        finally:
+            os.chdir(cwd)
+    report("écriture des fichiers (référence)", io_cost)
+    print(f"   → {count / md['median_ms'] * 1000:,.0f} articles/s rendus ; "
+          f"rendu / écriture = {md['median_ms'] / io_cost['median_ms']:.2f}")
+    return ok
+
+
+def bench_search() -> bool:
+    """Index de recherche sur 3 000 articles (articles réels du dépôt recopiés
+    à d'autres dates) : construction complète, ajout d'un article, taille des
+    fragments chargés par une recherche."""
+    import glob
+    import shutil
+    from datetime import timedelta
+    import search_index
+
+    posts = sorted(glob.glob(os.path.join("content", "posts", "etc-*.md")))
+    texts = []
+    for path in posts:
+        with open(path, encoding="utf-8") as fh:
+            texts.append((path[-13:-3], fh.read()))
+    if not texts:
+        print("\n⚠️  Aucun article dans content/posts/ — benchmark de recherche ignoré.")
+        return True
+
+    count, first = 3000, date(2018, 1, 1)
+    print(f"\n🔎 Index de recherche — {count} articles")
+    with tempfile.TemporaryDirectory() as workdir:
+        posts_dir = os.path.join(workdir, "content", "posts")
+        out_dir   = os.path.join(workdir, "search")
+        terms_dir = os.path.join(workdir, "search-terms")
+        os.makedirs(posts_dir)
+        for i in range(count):
+            day = (first + timedelta(days=i)).isoformat()
+            old_day, text = texts[i % len(texts)]
+            with open(os.path.join(posts_dir, f"etc-{day}.md"), "w", encoding="utf-8") as fh:
+                fh.write(text.replace(old_day, day))
+        sources = (posts_dir,)
+
+        full = timeit(lambda: search_index.update_index(sources, out_dir, rebuild=True,
+                                                        terms_dir=terms_dir), repeat=3)
+
+        extra = os.path.join(posts_dir, f"etc-{first + timedelta(days=count)}.md")
+
+        def add_one():
+            old_day, text = texts[0]
+            with open(extra, "w", encoding="utf-8") as fh:
+                fh.write(text.replace(old_day, str(first + timedelta(days=count))))
+            search_index.update_index(sources, out_dir, terms_dir=terms_dir)
+            os.remove(extra)
+            search_index.update_index(sources, out_dir, terms_dir=terms_dir)
+
+        incremental = timeit(add_one, repeat=5)
+
+        sizes = sorted(os.path.getsize(path) / 1024
+                       for path in glob.glob(os.path.join(out_dir, "*", "*.json")))
+        meta_kb = os.path.getsize(os.path.join(out_dir, "meta.json")) / 1024
+        shutil.rmtree(out_dir)
+
+    ok = report("reconstruction complète", full, budget_ms=10_000.0)
+    ok &= report("ajout + retrait d'un article", incremental, budget_ms=1_000.0)
+    print(f"   ℹ️  {len(sizes)} fragments : médiane {statistics.median(sizes):.1f} Ko, "
+          f"max {sizes[-1]:.1f} Ko, meta.json {meta_kb:.1f} Ko")
+    return ok
+
+
+def bench_outbox() -> bool:
+    """File d'envoi Beehiiv : livraison de 200 publications (20 ms par appel)
+    en série puis en parallèle, relance sans changement, pannes 503."""
+    from datetime import timedelta
+    from beehiiv_outbox import Outbox
+
+    count = 200
+    payloads = {f"etc-{date(2020, 1, 1) + timedelta(days=i)}":
+                {"title": f"ETC {i}", "subtitle": "", "content_html": f"<p>{i}</p>",
+                 "status": "confirmed", "send_at": None}
+                for i in range(count)}
+
+    def deliver(workers: int) -> dict:
+        outbox = Outbox()
+        outbox.posts.clear()
+        for key, payload in payloads.items():
+            outbox.enqueue(key, payload, save=False)
+        return outbox.flush("fake", "pub_fake", max_workers=workers)
+
+    print(f"\n📬 File d'envoi Beehiiv — {count} publications (services factices, 20 ms/appel)")
+    with offline(latency=0.02) as fake:
+        serial   = timeit(lambda: deliver(1), repeat=1)
+        parallel = timeit(lambda: deliver(4), repeat=3)
+
+        outbox = Outbox()
+
+        def unchanged():
+            for key, payload in payloads.items():
+                outbox.enqueue(key, payload, save=False)
+            outbox.flush("fake", "pub_fake")
+
+        before = fake.stats["beehiiv"]["requests"]
+        rerun  = timeit(unchanged, repeat=3)
+        resent = fake.stats["beehiiv"]["requests"] - before
+
+    with offline(faults={"beehiiv": {"error_rate": 0.2}}) as fake:
+        outbox = Outbox()
+        for key, payload in payloads.items():
+            outbox.enqueue(key, payload, save=False)
+        passes, later = 0, datetime.now()
+        while outbox.counts()["pending"] and passes < 10:
+            outbox.flush("fake", "pub_fake", now=later)
+            passes, later = passes + 1, later + timedelta(days=1)
+        created = len(fake.posts)
+
+    ok = report("livraison en série", serial)
+    ok &= report("livraison parallèle (4)", parallel, budget_ms=serial["median_ms"] * 0.5)
+    ok &= report("relance sans changement", rerun, budget_ms=50.0)
+    ok &= resent == 0 and created == count
+    print(f"   ℹ️  relance : {resent} requête(s) ; pannes 20 % : {created}/{count} posts "
+          f"en {passes} passage(s), sans doublon")
+    return ok
+
+
+def bench_sites() -> bool:
+    """Sites multilingues (2 sites × 3 langues, 10 articles chacun) en un run,
+    20 ms par appel : durée et nombre de requêtes Claude."""
+    import shutil
+    import multi_site
+    from fetch_ethereum_news import make_anthropic_client
+    from pipeline import Pipeline
+
+    names = list(multi_site.SITES)
+    langs = {lang for name in names for lang in multi_site.SITES[name]["languages"]}
+
+    def run() -> None:
+        for name in names:
+            shutil.rmtree(multi_site.SITES[name]["root"], ignore_errors=True)
+            if os.path.exists(multi_site.index_path(name)):
+                os.remove(multi_site.index_path(name))
+        pipeline = Pipeline()
+        multi_site.add_site_tasks(pipeline, names, "fake", client, datetime.now())
+        pipeline.run()
+
+    print(f"\n🌐 Sites multilingues — {len(names)} sites × {len(langs)} langues "
+          f"(services factices, 20 ms/appel)")
+    with offline(latency=0.02, news_count=60) as fake:
+        client = make_anthropic_client("fake")
+        run()           # imports et connexions hors mesure
+        before = fake.stats["anthropic"]["requests"]
+        result = timeit(run, repeat=5)
+        calls  = (fake.stats["anthropic"]["requests"] - before) / 5
+        files  = sum(1 for name in names
+                     for _, _, found in os.walk(multi_site.SITES[name]["root"])
+                     for filename in found if filename != "_index.md")
+
+    ok = report("run multi-sites", result, budget_ms=500.0)
+    ok &= calls <= len(names) + len(langs) - 1
+    print(f"   ℹ️  {calls:.0f} requête(s) Claude pour {files} fichier(s) "
+          f"(une génération par site et par langue : {len(names) * len(langs)})")
+    return ok
+
+
+def bench_prices() -> bool:
+    """Étape market (sources de prix couvertes) : CoinGecko nominal, lent
+    (2 s), limité (429, Retry-After 60 s) puis en panne (503)."""
+    import price_sources
+    from generate_article import ETC_ASSET
+
+    def measure(repeat: int = 10, **plan) -> tuple:
+        with offline() as fake:
+            sources = price_sources.PriceSources()
+            for _ in range(price_sources.HEDGE_MIN_SAMPLES):    # latences de référence
+                sources.fetch(ETC_ASSET)
+            fake.faults["coingecko"].update(plan)              # dégradation en cours de route
+            result = timeit(lambda: sources.fetch(ETC_ASSET), repeat=repeat)
+            backups = sum(fake.stats[name]["requests"] for name in ("cryptocompare", "kraken"))
+        return result, backups, fake.stats["coingecko"]["requests"]
+
+    print("\n💱 Étape market — sources de prix couvertes (services factices)")
+    nominal, spare, primary = measure()
+    slow, _, _              = measure(repeat=5, latency=2.0)
+    limited, _, _           = measure(throttle_rate=1.0, retry_after=60)
+    down, _, _              = measure(error_rate=1.0)
+
+    ok = report("CoinGecko nominal", nominal, budget_ms=50.0)
+    ok &= report("CoinGecko lent (2 s) → couverture", slow, budget_ms=100.0)
+    ok &= report("CoinGecko limité (429, 60 s) → secours", limited, budget_ms=100.0)
+    ok &= report("CoinGecko en panne (503) → secours", down, budget_ms=100.0)
+    ok &= spare == 1
+    print(f"   ℹ️  régime nominal (cours stable) : {spare} requête(s) de confirmation pour "
+          f"{primary} requête(s) CoinGecko ; source unique avec nouveaux essais : ~90 s sur "
+          f"429 (3 attentes plafonnées à 30 s)")
+    return ok
+
+
+def bench_routing() -> bool:
+    """Routage des appels Claude (llm_routing) : analyse d'une séance
+    ordinaire ou agitée et reformulation d'un article court, routées ou
+    toutes en traitement complet, génération simulée à 2 ms par jeton."""
+    import llm_routing
+    import run_report
+    from fetch_ethereum_news import make_anthropic_client, reformulate_article
+    from generate_article import generate_ai_analysis
+
+    routine  = {"price_usd": 17.42, "price_eur": 16.03, "change_24h": -1.2, "change_7d": 3.4,
+                "change_30d": -6.1, "market_cap_usd": 2.6e9, "volume_24h_usd": 1.1e8,
+                "ath_usd": 167.09, "ath_date": "2021-05-06"}
+    volatile = dict(routine, change_24h=8.4, change_7d=17.9)
+    ind      = {"sma_30": 16.9, "rsi_14": 54.0, "volatility_30": 62.0, "zscore_30": 0.4}
+
+    def measure(routing: bool, fn, repeat: int = 5) -> tuple:
+        saved = llm_routing.ROUTING_ENABLED
+        llm_routing.ROUTING_ENABLED = routing
+        run_report.start("bench")
+        try:
+            with offline(token_latency=0.002) as fake:
+                client = make_anthropic_client("fake")
+                article = next(a for a in fake.articles if a["title"] != "[Removed]")
+                result = timeit(lambda: fn(client, article), repeat=repeat)
+        finally:
+            llm_routing.ROUTING_ENABLED = saved
+        calls = run_report.current().llm_calls
+        return result, sum(c["input_tokens"] + c["output_tokens"] for c in calls) / len(calls)
+
+    def analyse(data: dict):
+        return lambda client, _: generate_ai_analysis(data, "fake", ind, client=client)
+
+    def reformulate(client, article: dict) -> None:
+        reformulate_article(article["title"], article["description"], "fake", client,
+                            content=article["content"])
+
+    print("\n🧭 Routage Claude (services factices, 2 ms/jeton généré)")
+    routine_full,   routine_full_tokens   = measure(False, analyse(routine))
+    routine_routed, routine_routed_tokens = measure(True, analyse(routine))
+    volatile_routed, _                    = measure(True, analyse(volatile))
+    news_full,   news_full_tokens         = measure(False, reformulate, repeat=10)
+    news_routed, news_routed_tokens       = measure(True, reformulate, repeat=10)
+
+    ok = report("analyse ordinaire (complète)", routine_full)
+    ok &= report("analyse ordinaire (routée)", routine_routed,
+                 budget_ms=routine_full["median_ms"] * 0.8)
+    ok &= report("analyse agitée (routée → complète)", volatile_routed,
+                 budget_ms=routine_full["median_ms"] * 1.2)
+    ok &= report("reformulation courte (complète)", news_full)
+    ok &= report("reformulation courte (routée)", news_routed,
+                 budget_ms=news_full["median_ms"] * 0.8)
+    print(f"   ℹ️  jetons par appel : analyse {routine_full_tokens:.0f} → {routine_routed_tokens:.0f}, "
+          f"reformulation {news_full_tokens:.0f} → {news_routed_tokens:.0f}")
+    return ok
+
+
+def bench_digest() -> bool:
+    """Synthèses mensuelles (monthly_digest) sur 3 ans d'articles quotidiens :
+    première compaction, run quotidien sans mois à clore, régénération
+    complète ; pages et octets de content/posts/ avant et après."""
+    from datetime import timedelta
+    import monthly_digest
+    from backfill import write_batch
+    from generate_article import article_path, generate_basic_analysis, render_hugo_article
+
+    count = 3 * 365
+    today = date(2026, 10, 17)
+    posts = []
+    for idx in range(count):
+        price = 10 + (idx % 97) / 7
+        etc_data = {
+            "price_usd": price, "price_eur": price * 0.92, "change_24h": (idx % 11) - 5.0,
+            "change_7d": (idx % 13) - 6.0, "change_30d": (idx % 17) - 8.0,
+            "market_cap_usd": price * 1.5e8, "volume_24h_usd": price * 7e6,
+            "ath_usd": 167.09, "ath_date": "2021-05-06",
+        }
+        now = datetime(today.year, today.month, today.day, 9) - timedelta(days=count - 1 - idx)
+        posts.append((article_path(now), render_hugo_article(
+            etc_data, generate_basic_analysis(etc_data), now)))
+
+    def footprint() -> tuple:
+        names = [n for n in os.listdir(monthly_digest.POSTS_DIR) if n.endswith(".md")]
+        return len(names), sum(os.path.getsize(os.path.join(monthly_digest.POSTS_DIR, n))
+                               for n in names)
+
+    print(f"\n🗜️  Synthèses mensuelles — {count} articles quotidiens")
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            write_batch(posts)
+            pages, size = footprint()
+            first   = timeit(lambda: monthly_digest.compact(today), repeat=1)
+            daily   = timeit(lambda: monthly_digest.compact(today), repeat=20)
+            rebuilt = timeit(monthly_digest.rebuild, repeat=3)
+            after, after_size = footprint()
+            months = len(os.listdir(monthly_digest.ARCHIVE_DIR))
+        finally:
+            os.chdir(cwd)
+
+    ok = report("première compaction", first, budget_ms=1_000.0)
+    ok &= report("run quotidien (aucun mois à clore)", daily, budget_ms=20.0)
+    ok &= report("régénération des synthèses", rebuilt, budget_ms=1_000.0)
+    ok &= after <= months + monthly_digest.KEEP_DAYS + 31
+    print(f"   ℹ️  content/posts : {pages} pages ({size / 1e6:.1f} Mo) → {after} pages "
+          f"({after_size / 1e6:.1f} Mo) dont {months} synthèses")
+    return ok
+
+
+BENCHMARKS = {
+    "indicators": bench_indicators,
+    "e2e":        bench_e2e,
+    "pipeline":   bench_pipeline,
+    "backfill":   bench_backfill,
+    "news":       bench_news,
+    "render":     bench_render,
+    "search":     bench_search,
+    "outbox":     bench_outbox,
+    "sites":      bench_sites,
+    "prices":     bench_prices,
+    "routing":    bench_routing,
+    "digest":     bench_digest,
+}
+
+
+# ──────────────────────────────────────────────
+# 3. Point d'entrée
+# ──────────────────────────────────────────────
+
+def main() -> None:
+    names = sys.argv[1:] or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"❌ Benchmark(s) inconnu(s) : {', '.join(unknown)} "
+              f"(disponibles : {', '.join(BENCHMARKS)})")
+        sys.exit(2)
+
+    ok = all([BENCHMARKS[name]() for name in names])
+    print("\nTerminé ✓" if ok else "\n⚠️  Budget dépassé")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
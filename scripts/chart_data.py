@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Séries du graphique de cours
+==========================================
+Précalcule, à partir de l'historique binaire (`price_history`), les séries
+affichées par le graphique de la page d'accueil et les écrit dans un fichier
+JSON statique (static/data/etc-chart.json, servi tel quel par Hugo) :
+
+  - `daily`   : les 90 derniers jours ;
+  - `weekly`  : clôtures hebdomadaires (semaines ISO) des deux dernières années ;
+  - `monthly` : clôtures mensuelles sur tout l'historique.
+
+Chaque série est ensuite réduite à `POINT_BUDGET` points au plus par
+l'algorithme LTTB (Largest-Triangle-Three-Buckets), qui conserve la forme
+visuelle de la courbe : la taille du fichier ne dépend plus du nombre de
+jours archivés.
+
+Usage :
+  python scripts/chart_data.py           Régénère static/data/etc-chart.json
+"""
+
+import os
+import json
+
+import price_history
+
+
+def chart_path(slug: str) -> str:
+    """Fichier de séries d'un actif (ex. 'etc' → static/data/etc-chart.json)."""
+    return os.path.join("static", "data", f"{slug}-chart.json")
+
+
+def chart_url(slug: str) -> str:
+    """URL publique du fichier de séries (ex. 'etc' → /data/etc-chart.json)."""
+    return f"/data/{slug}-chart.json"
+
+
+CHART_PATH = chart_path("etc")
+
+POINT_BUDGET  = 120     # points max par série après réduction
+DAILY_WINDOW  = 90      # jours
+WEEKLY_WINDOW = 104     # semaines
+
+
+# ──────────────────────────────────────────────
+# 1. Agrégations
+# ──────────────────────────────────────────────
+
+def _rollup(records: list, period) -> list:
+    """Regroupe les jours par période (`period(date) → clé`) et retourne la
+    clôture de chaque période, datée de son dernier jour."""
+    closes = {}
+    for rec in records:
+        closes[period(rec["date"])] = rec       # le dernier jour de la période l'emporte
+    rows = list(closes.values())
+
+    out = []
+    for idx, rec in enumerate(rows):
+        prev = rows[idx - 1]["price_usd"] if idx else 0.0
+        change = (rec["price_usd"] / prev - 1) * 100 if prev else 0.0
+        out.append({"date": rec["date"], "price_usd": rec["price_usd"], "change": change})
+    return out
+
+
+def daily(records: list, window: int = DAILY_WINDOW) -> list:
+    return [{"date": rec["date"], "price_usd": rec["price_usd"], "change": rec["change_24h"]}
+            for rec in records[-window:]]
+
+
+def weekly(records: list, window: int = WEEKLY_WINDOW) -> list:
+    def iso_week(day: str) -> tuple:
+        return price_history._to_date(day).isocalendar()[:2]
+    return _rollup(records, iso_week)[-window:]
+
+
+def monthly(records: list) -> list:
+    return _rollup(records, lambda day: day[:7])
+
+
+# ──────────────────────────────────────────────
+# 2. Réduction LTTB
+# ──────────────────────────────────────────────
+
+def lttb(xs: list, ys: list, budget: int) -> list:
+    """Indices des points retenus par Largest-Triangle-Three-Buckets.
+
+    Le premier et le dernier point sont toujours conservés ; entre les deux,
+    chaque seau garde le point qui forme le plus grand triangle avec le point
+    retenu précédent et la moyenne du seau suivant.
+    """
+    n = len(xs)
+    if budget >= n or budget < 3:
+        return list(range(n))
+
+    every = (n - 2) / (budget - 2)
+    keep = [0]
+    a = 0
+    for i in range(budget - 2):
+        lo = int(i * every) + 1
+        hi = int((i + 1) * every) + 1
+
+        # Moyenne du seau suivant (le dernier point pour le dernier seau)
+        nxt_lo, nxt_hi = hi, min(int((i + 2) * every) + 1, n)
+        if nxt_lo >= nxt_hi:
+            nxt_lo, nxt_hi = n - 1, n
+        span = nxt_hi - nxt_lo
+        avg_x = sum(xs[nxt_lo:nxt_hi]) / span
+        avg_y = sum(ys[nxt_lo:nxt_hi]) / span
+
+        ax, ay = xs[a], ys[a]
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        keep.append(best)
+        a = best
+
+    keep.append(n - 1)
+    return keep
+
+
+def _series(rows: list, label, budget: int) -> dict:
+    """Réduit une série à `budget` points et la met au format colonnaire."""
+    xs = [price_history._to_date(row["date"]).toordinal() for row in rows]
+    ys = [row["price_usd"] for row in rows]
+    picked = [rows[idx] for idx in lttb(xs, ys, budget)]
+    return {
+        "labels":     [label(row["date"]) for row in picked],
+        "price_usd":  [round(row["price_usd"], 4) for row in picked],
+        "change":     [round(row["change"], 2) for row in picked],
+    }
+
+
+# ──────────────────────────────────────────────
+# 3. Export
+# ──────────────────────────────────────────────
+
+def build_chart_data(records: list, budget: int = POINT_BUDGET) -> dict:
+    """Calcule les trois séries du graphique à partir des jours `records`."""
+    return {
+        "updated": records[-1]["date"] if records else None,
+        "series": {
+            "daily":   _series(daily(records),   lambda d: f"{d[8:10]}/{d[5:7]}", budget),
+            "weekly":  _series(weekly(records),  lambda d: f"{d[8:10]}/{d[5:7]}/{d[2:4]}", budget),
+            "monthly": _series(monthly(records), lambda d: f"{d[5:7]}/{d[:4]}", budget),
+        },
+    }
+
+
+def write_chart_data(path: str = price_history.HISTORY_PATH, out_path: str = CHART_PATH,
+                     budget: int = POINT_BUDGET) -> str:
+    """Régénère le fichier JSON statique des séries à partir de l'historique."""
+    data = build_chart_data(price_history.read_range(path=path), budget)
+
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, separators=(",", ":"))
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+# ──────────────────────────────────────────────
+# 4. Point d'entrée
+# ──────────────────────────────────────────────
+
+def main() -> None:
+    print(f"✅ Séries du graphique : {write_chart_data()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Services factices (hors ligne)
+============================================
+Serveur HTTP local qui se substitue à CoinGecko (et aux sources de prix de
+secours CryptoCompare et Kraken), NewsAPI, Anthropic et Beehiiv. Les
+réponses reprennent les charges enregistrées de scripts/fixtures/ (mêmes
+formes que les API réelles), extrapolées à la demande : historique de cours
+sur n'importe quelle plage, centaines d'actualités, réponses JSON groupées,
+lots Message Batches, textes Claude de la longueur demandée par le prompt
+et bornés par `max_tokens`.
+
+Chaque service peut simuler de la latence, des réponses 429 (avec
+Retry-After) et des pannes 503, avec une graine fixe pour des mesures
+reproductibles ; Anthropic peut en plus simuler un temps de génération
+proportionnel aux jetons produits.
+
+Les scripts sont redirigés vers le serveur par variables d'environnement
+(`FakeServices.env()`) : COINGECKO_BASE_URL, CRYPTOCOMPARE_BASE_URL,
+KRAKEN_BASE_URL, NEWSAPI_BASE_URL et BEEHIIV_BASE_URL (lues par http_client),
+ANTHROPIC_BASE_URL (lue par le SDK).
+
+Usage :
+  python scripts/fake_services.py [PORT]     Lance les services (Ctrl-C pour arrêter)
+  eval "$(python scripts/fake_services.py --env 8900)"  Variables à exporter
+
+  with FakeServices(latency=0.05, throttle_rate=0.1) as fake:
+      os.environ.update(fake.env())
+      …
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import random
+import threading
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from typing import Optional
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SERVICES     = ("coingecko", "cryptocompare", "kraken", "newsapi", "anthropic", "beehiiv")
+
+
+def service_env(base_url: str) -> dict:
+    """Variables d'environnement redirigeant les scripts vers `base_url`."""
+    return {
+        "COINGECKO_BASE_URL":     f"{base_url}/coingecko",
+        "CRYPTOCOMPARE_BASE_URL": f"{base_url}/cryptocompare",
+        "KRAKEN_BASE_URL":        f"{base_url}/kraken",
+        "NEWSAPI_BASE_URL":       f"{base_url}/newsapi",
+        "BEEHIIV_BASE_URL":       f"{base_url}/beehiiv",
+        "ANTHROPIC_BASE_URL":     f"{base_url}/anthropic",
+    }
+
+
+def load_fixture(name: str) -> dict:
+    with open(os.path.join(FIXTURES_DIR, f"{name}.json"), encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+# ──────────────────────────────────────────────
+# 1. Données synthétiques
+# ──────────────────────────────────────────────
+
+def synthetic_price(day: date) -> float:
+    """Cours USD déterministe d'un jour (cycles superposés, toujours > 0)."""
+    t = day.toordinal()
+    return 20 + 8 * math.sin(t / 37) + 3 * math.sin(t / 5.3) + 1.5 * math.sin(t / 1.7)
+
+
+def _range_payload(params: dict) -> dict:
+    """Réponse market_chart/range : un point par jour UTC entre `from` et `to`."""
+    start = datetime.fromtimestamp(int(params["from"]), tz=timezone.utc).date()
+    end   = datetime.fromtimestamp(int(params["to"]), tz=timezone.utc).date()
+    rate  = 0.92 if params.get("vs_currency") == "eur" else 1.0
+
+    prices, caps, volumes = [], [], []
+    day = start
+    while day <= end:
+        ts = int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp() * 1000)
+        price = synthetic_price(day) * rate
+        prices.append([ts, price])
+        caps.append([ts, price * 1.5e8])
+        volumes.append([ts, price * 7e6])
+        day += timedelta(days=1)
+    return {"prices": prices, "market_caps": caps, "total_volumes": volumes}
+
+
+def _markets_payload(params: dict) -> list:
+    """Réponse coins/markets : une ligne par identifiant demandé."""
+    rows = []
+    for idx, coin_id in enumerate(params.get("ids", "").split(",")):
+        if not coin_id:
+            continue
+        price = 1.0 + 10 * idx + math.sin(idx)
+        rows.append({
+            "id":                                      coin_id,
+            "current_price":                           price,
+            "market_cap":                              price * 1e9,
+            "total_volume":                            price * 5e7,
+            "ath":                                     price * 3,
+            "ath_date":                                "2021-11-10T14:24:11.849Z",
+            "circulating_supply":                      1e9,
+            "max_supply":                              None,
+            "price_change_percentage_24h_in_currency": math.sin(idx) * 4,
+            "price_change_percentage_7d_in_currency":  math.cos(idx) * 8,
+            "price_change_percentage_30d_in_currency": math.sin(idx / 2) * 15,
+        })
+    return rows
+
+
+def _cryptocompare_payload(params: dict) -> dict:
+    """Réponse data/pricemultifull, cohérente avec l'instantané CoinGecko enregistré."""
+    md = load_fixture("coingecko_coin")["market_data"]
+    return {"RAW": {symbol: {
+        "USD": {"PRICE":             md["current_price"]["usd"],
+                "CHANGEPCT24HOUR":   md["price_change_percentage_24h"],
+                "MKTCAP":            md["market_cap"]["usd"],
+                "TOTALVOLUME24HTO":  md["total_volume"]["usd"],
+                "CIRCULATINGSUPPLY": md["circulating_supply"]},
+        "EUR": {"PRICE":             md["current_price"]["eur"]},
+    } for symbol in params.get("fsyms", "").split(",") if symbol}}
+
+
+def _kraken_payload(params: dict) -> dict:
+    """Réponse 0/public/Ticker (dernier cours `c`, ouverture du jour `o`)."""
+    md = load_fixture("coingecko_coin")["market_data"]
+    result = {}
+    for pair in params.get("pair", "").split(","):
+        price = md["current_price"][pair[-3:].lower()]
+        opening = price / (1 + md["price_change_percentage_24h"] / 100)
+        result[f"X{pair[:-3]}Z{pair[-3:]}"] = {"c": [f"{price:.5f}", "1.0"], "o": f"{opening:.5f}"}
+    return {"error": [], "result": result}
+
+
+# Vocabulaire des variantes d'articles (sans alias ni sigle de sujet)
+_STORY_WORDS = (
+    "network", "block", "node", "wallet", "fee", "gas", "contract", "token", "validator",
+    "chain", "protocol", "governance", "proposal", "vote", "community", "partner",
+    "integration", "bridge", "liquidity", "volume", "price", "rally", "dip", "whale",
+    "custody", "fund", "report", "audit", "patch", "bug", "bounty", "grant", "team",
+    "launch", "release", "version", "support", "tool", "explorer", "analytics", "data",
+    "user", "growth", "decline", "record", "week", "month", "quarter", "analyst", "outlook",
+)
+_OUTLETS = ("Yahoo Finance", "MarketWatch", "Benzinga", "Investing.com", "CryptoPotato",
+            "U.Today", "Bitcoinist", "NewsBTC")
+
+
+def synthetic_articles(count: int, start: datetime = None, syndication: float = 0.0,
+                       seed: int = 42) -> list:
+    """`count` articles au format NewsAPI, du plus récent au plus ancien,
+    dérivés des articles enregistrés (mêmes proportions hors sujet / [Removed]).
+
+    Chaque article reçoit des phrases propres (articles distincts). Une part
+    `syndication` des articles sont des reprises d'un article récent par un
+    autre média : même description, titre légèrement modifié.
+    """
+    templates = load_fixture("newsapi_everything")["articles"]
+    start = start or datetime(2026, 5, 14, 9, tzinfo=timezone.utc)
+    rng = random.Random(seed)
+    articles, originals = [], []
+    for idx in range(count):
+        tpl = templates[idx % len(templates)]
+        published = start - timedelta(minutes=37 * idx)
+        article = dict(tpl, publishedAt=published.strftime("%Y-%m-%dT%H:%M:%SZ"))
+        if tpl["title"] != "[Removed]":
+            if originals and rng.random() < syndication:
+                orig   = rng.choice(originals[-10:])
+                outlet = rng.choice(_OUTLETS)
+                slug   = re.sub(r"\W+", "-", outlet.lower()).strip("-")
+                article.update(
+                    title=rng.choice(("{} | {}", "{1}: {0}", "{} - {}")).format(orig["title"], outlet),
+                    description=orig["description"],
+                    url=f"https://{slug}.example/{idx}",
+                    source={"id": None, "name": outlet},
+                )
+            else:
+                story = " ".join(rng.choice(_STORY_WORDS) for _ in range(24))
+                article["title"]       = f"{tpl['title']} (#{idx})"
+                article["description"] = f"{tpl['description']} {story.capitalize()}."
+                article["url"]         = f"{tpl['url'].split('?')[0]}-{idx}"
+                originals.append(article)
+        articles.append(article)
+    return articles
+
+
+# ──────────────────────────────────────────────
+# 2. Réponses Anthropic
+# ──────────────────────────────────────────────
+
+_BRACKET_ID = re.compile(r"^\[([^\]\n]+)\]$", re.MULTILINE)
+_ASSET_ID   = re.compile(r"^([\w.-]+) \([^)]*\) :", re.MULTILINE)
+_WORDS      = re.compile(r"(\d+)[–-](\d+) mots")
+_SENTENCES  = re.compile(r"(\d+)-(\d+) phrases")
+
+
+def _sized_text(prompt: str, paragraph: str) -> Optional[str]:
+    """Texte de la longueur demandée par le prompt (borne haute, en mots ou
+    en phrases) tiré du paragraphe enregistré ; None sans consigne de longueur."""
+    words = _WORDS.search(prompt)
+    if words:
+        source = paragraph.split()
+        return " ".join(source[i % len(source)] for i in range(int(words.group(2))))
+    sentences = _SENTENCES.search(prompt)
+    if sentences:
+        return " ".join(re.split(r"(?<=[.!?])\s+", paragraph)[:int(sentences.group(2))])
+    return None
+
+
+def _completion_text(prompt: str) -> str:
+    """Texte de réponse adapté à la requête : objet JSON indexé pour les
+    requêtes groupées, paragraphe enregistré sinon."""
+    paragraph = load_fixture("anthropic_message")["content"][0]["text"]
+    sized     = _sized_text(prompt, paragraph)
+    if "JSON" in prompt:
+        ids = _BRACKET_ID.findall(prompt) or _ASSET_ID.findall(prompt)
+        return json.dumps({item_id: f"{sized or paragraph[:180]} [{item_id}]" for item_id in ids},
+                          ensure_ascii=False)
+    return sized or paragraph
+
+
+def _message(body: dict) -> dict:
+    prompt = "".join(
+        msg["content"] if isinstance(msg["content"], str)
+        else "".join(part.get("text", "") for part in msg["content"])
+        for msg in body.get("messages", [])
+    )
+    text = _completion_text(prompt)
+    message = load_fixture("anthropic_message")
+    budget  = body.get("max_tokens")
+    if budget and len(text) // 4 > budget:
+        text = text[:budget * 4]
+        message["stop_reason"] = "max_tokens"
+    message.update(
+        id=f"msg_fake_{random.getrandbits(48):012x}",
+        model=body.get("model", message["model"]),
+        content=[{"type": "text", "text": text}],
+        usage={"input_tokens": len(prompt) // 4, "output_tokens": len(text) // 4},
+    )
+    return message
+
+
+# ──────────────────────────────────────────────
+# 3. Serveur
+# ──────────────────────────────────────────────
+
+class FakeServices:
+    """Serveur local des services simulés, avec injection de fautes.
+
+    `latency`       : délai ajouté à chaque réponse (s)
+    `throttle_rate` : probabilité de répondre 429 (Retry-After: `retry_after`)
+    `error_rate`    : probabilité de répondre 503
+    `faults`        : surcharges par service, ex. {"anthropic": {"latency": 0.2}}
+    `token_latency` : temps de génération Anthropic par jeton produit (s)
+    `news_count`    : nombre d'articles disponibles côté NewsAPI
+    `syndication`   : part de ces articles repris d'un autre (voir synthetic_articles)
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.0, throttle_rate: float = 0.0,
+                 error_rate: float = 0.0, retry_after: float = 0.05, faults: dict = None,
+                 token_latency: float = 0.0, news_count: int = 20, syndication: float = 0.2,
+                 seed: int = 42):
+        defaults = {"latency": latency, "throttle_rate": throttle_rate,
+                    "error_rate": error_rate, "retry_after": retry_after}
+        self.faults     = {name: dict(defaults, **(faults or {}).get(name, {})) for name in SERVICES}
+        self.token_latency = token_latency
+        self.articles   = synthetic_articles(news_count, syndication=syndication, seed=seed)
+        self._topic_articles = {}   # premier terme de la requête → articles
+        self.batches    = {}
+        self.posts      = {}        # posts Beehiiv créés, par identifiant
+        self.stats      = {name: {"requests": 0, "throttled": 0, "failed": 0} for name in SERVICES}
+        self._random    = random.Random(seed)
+        self._lock      = threading.Lock()
+        self.server     = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self._thread    = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> dict:
+        """Variables d'environnement redirigeant les scripts vers le serveur."""
+        return service_env(self.base_url)
+
+    def start(self) -> "FakeServices":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "FakeServices":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ── Injection de fautes ──
+
+    def _inject(self, service: str):
+        """Retourne (statut, corps, en-têtes) d'une faute à simuler, ou None."""
+        plan = self.faults[service]
+        with self._lock:
+            self.stats[service]["requests"] += 1
+            roll = self._random.random()
+        if plan["latency"]:
+            time.sleep(plan["latency"])
+
+        headers = {"Retry-After": f"{plan['retry_after']:g}"}
+        if roll < plan["throttle_rate"]:
+            with self._lock:
+                self.stats[service]["throttled"] += 1
+            return 429, {"type": "error", "error": {"type": "rate_limit_error",
+                                                    "message": "Fake rate limit"}}, headers
+        if roll < plan["throttle_rate"] + plan["error_rate"]:
+            with self._lock:
+                self.stats[service]["failed"] += 1
+            return 503, {"type": "error", "error": {"type": "overloaded_error",
+                                                    "message": "Fake outage"}}, headers
+        return None
+
+    # ── Routage ──
+
+    def route(self, method: str, service: str, path: str, params: dict, body: dict):
+        """Retourne (statut, corps) ; un corps `str` est envoyé tel quel (JSONL)."""
+        if service == "coingecko":
+            if path.endswith("/market_chart/range"):
+                return 200, _range_payload(params)
+            if path == "/coins/markets":
+                return 200, _markets_payload(params)
+            if path.startswith("/coins/"):
+                return 200, load_fixture("coingecko_coin")
+
+        elif service == "cryptocompare" and path == "/data/pricemultifull":
+            return 200, _cryptocompare_payload(params)
+
+        elif service == "kraken" and path == "/0/public/Ticker":
+            return 200, _kraken_payload(params)
+
+        elif service == "newsapi" and path == "/everything":
+            size = int(params.get("pageSize", 20))
+            page = int(params.get("page", 1))
+            since = params.get("from")
+            articles = [a for a in self._news_for(params.get("q", ""))
+                        if not since or a["publishedAt"] >= since]
+            return 200, {"status": "ok", "totalResults": len(articles),
+                         "articles": articles[(page - 1) * size:page * size]}
+
+        elif service == "beehiiv" and "/posts" in path:
+            return self._route_beehiiv(method, path, params, body)
+
+        elif service == "anthropic":
+            return self._route_anthropic(method, path, body)
+
+        return 404, {"error": f"Route inconnue : {method} /{service}{path}"}
+
+    def _news_for(self, query: str) -> list:
+        """Articles d'une requête NewsAPI : ceux de l'ETC, ou pour une autre
+        requête (sites multilingues) les mêmes recentrés sur son premier terme."""
+        term = (re.findall(r"\w+", query) or ["Ethereum"])[0]
+        if term == "Ethereum":
+            return self.articles
+        with self._lock:
+            if term not in self._topic_articles:
+                self._topic_articles[term] = [
+                    dict(article, **{field: re.sub(r"Ethereum Classic|ETC Cooperative", term,
+                                                   article[field] or "")
+                                     for field in ("title", "description")},
+                         url=f"{article['url']}-{term.lower()}")
+                    for article in self.articles
+                ]
+            return self._topic_articles[term]
+
+    def _route_beehiiv(self, method: str, path: str, params: dict, body: dict):
+        """Posts créés (POST), listés du plus récent au plus ancien (GET) et
+        modifiés (PUT /posts/{id}) ; conservés le temps du serveur."""
+        post_id = path.rsplit("/posts", 1)[1].strip("/")
+        if method == "POST" and not post_id:
+            post = load_fixture("beehiiv_post")["data"]
+            post.update(id=f"post_fake_{random.getrandbits(48):012x}",
+                        title=body.get("title", post["title"]), created=int(time.time()))
+            with self._lock:
+                self.posts[post["id"]] = post
+            return 201, {"data": post}
+        if method == "GET" and not post_id:
+            with self._lock:
+                posts = list(reversed(self.posts.values()))
+            return 200, {"data": posts[:int(params.get("limit", 10))], "total_results": len(posts)}
+        if method == "PUT" and post_id in self.posts:
+            with self._lock:
+                self.posts[post_id].update(title=body.get("title", self.posts[post_id]["title"]))
+            return 200, {"data": self.posts[post_id]}
+        return 404, {"errors": [{"message": f"Post inconnu : {post_id}"}]}
+
+    def _route_anthropic(self, method: str, path: str, body: dict):
+        if method == "POST" and path == "/v1/messages":
+            message = _message(body)
+            time.sleep(self.token_latency * message["usage"]["output_tokens"])
+            return 200, message
+
+        if method == "POST" and path == "/v1/messages/batches":
+            batch_id = f"msgbatch_fake_{random.getrandbits(48):012x}"
+            results = [
+                {"custom_id": req["custom_id"],
+                 "result": {"type": "succeeded", "message": _message(req["params"])}}
+                for req in body.get("requests", [])
+            ]
+            with self._lock:
+                self.batches[batch_id] = results
+            return 200, self._batch(batch_id)
+
+        match = re.fullmatch(r"/v1/messages/batches/([\w-]+)(/results|/cancel)?", path)
+        if match and match.group(1) in self.batches:
+            batch_id, action = match.groups()
+            if action == "/results":
+                return 200, "\n".join(json.dumps(line) for line in self.batches[batch_id]) + "\n"
+            return 200, self._batch(batch_id)
+
+        return 404, {"type": "error", "error": {"type": "not_found_error", "message": path}}
+
+    def _batch(self, batch_id: str) -> dict:
+        """Lot terminé dès sa création (les résultats sont calculés à la soumission)."""
+        now = datetime.now(timezone.utc).isoformat()
+        return {
+            "id":                  batch_id,
+            "type":                "message_batch",
+            "processing_status":   "ended",
+            "request_counts":      {"processing": 0, "succeeded": len(self.batches[batch_id]),
+                                    "errored": 0, "canceled": 0, "expired": 0},
+            "created_at":          now,
+            "ended_at":            now,
+            "expires_at":          now,
+            "archived_at":         None,
+            "cancel_initiated_at": None,
+            "results_url":         f"{self.base_url}/anthropic/v1/messages/batches/{batch_id}/results",
+        }
+
+    def _handler(self):
+        services = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"     # keep-alive : les pools de connexions servent
+            disable_nagle_algorithm = True    # en-têtes et corps envoyés sans attendre l'ACK
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _dispatch(self, method: str) -> None:
+                parsed  = urlparse(self.path)
+                service, _, path = parsed.path.lstrip("/").partition("/")
+                params  = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+                length  = int(self.headers.get("Content-Length") or 0)
+                body    = json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+                headers = {}
+                if service not in SERVICES:
+                    status, payload = 404, {"error": f"Service inconnu : {service}"}
+                else:
+                    fault = services._inject(service)
+                    if fault:
+                        status, payload, headers = fault
+                    else:
+                        status, payload = services.route(method, service, "/" + path, params, body)
+
+                data = (payload if isinstance(payload, str) else json.dumps(payload)).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:
+                self._dispatch("GET")
+
+            def do_POST(self) -> None:
+                self._dispatch("POST")
+
+            def do_PUT(self) -> None:
+                self._dispatch("PUT")
+
+        return Handler
+
+
+# ──────────────────────────────────────────────
+# 4. Point d'entrée
+# ──────────────────────────────────────────────
+
+def main() -> None:
+    args = sys.argv[1:]
+    print_env = "--env" in args
+    args = [arg for arg in args if arg != "--env"]
+    port = int(args[0]) if args else 8900
+
+    if print_env:
+        for name, value in service_env(f"http://127.0.0.1:{port}").items():
+            print(f"export {name}={value}")
+        return
+
+    fake = FakeServices(port=port)
+    print(f"🧪 Services factices sur {fake.base_url}")
+    for name, value in fake.env().items():
+        print(f"   {name}={value}")
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake.server.server_close()
+    print("\nTerminé ✓")
+
+
+if __name__ == "__main__":
+    main()
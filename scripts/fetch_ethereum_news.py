@@ -2,129 +2,349 @@
 """
 ETC Tracker — Module d'actualités Ethereum Classic
 ===================================================
-Récupère les dernières actualités ETC via NewsAPI,
-reformule chaque article avec Claude AI, et crée une page de news.
+Récupère les dernières actualités ETC via NewsAPI (une ou plusieurs pages,
+filtrées en flux par news_matcher.py), reformule chaque nouvel article avec
+Claude AI, l'ajoute à l'archive datée content/news/ et met à jour la page
+des dernières actualités.
 
 Variables d'environnement :
   ANTHROPIC_API_KEY      Clé API Anthropic (Secret GitHub)
   NEWSAPI_API_KEY        Clé API NewsAPI   (Secret GitHub)
+
+Usage :
+  python scripts/fetch_ethereum_news.py [--mode batch|concurrent|batch-api]
+                                        [--pages N] [--page-size N] [--profile cpu|memory|all]
 """
 
 import os
 import sys
 import json
-import re
+import argparse
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Optional
 
+import http_client
+import llm_routing
+import news_clusters
+import news_store
+import run_report
+from llm_cache import get_cache
+from news_matcher import get_matcher
+
 
 # ──────────────────────────────────────────────
 # 1. Récupération des actualités NewsAPI
 # ──────────────────────────────────────────────
 
-def fetch_ethereum_news(api_key: str, max_articles: int = 5) -> list:
-    """Récupère les actualités Ethereum Classic depuis NewsAPI.
-    
-    Demande un pool large (20) puis filtre strictement les articles
-    qui mentionnent explicitement 'Ethereum Classic' dans le titre
-    ou la description. Retourne max_articles résultats.
+NEWS_QUERY          = '"Ethereum Classic" OR "ETC Cooperative"'
+NEWS_PAGE_SIZE      = 20      # articles par page (100 au plus pour NewsAPI)
+NEWS_MAX_PAGE_SIZE  = 100
+
+
+def iter_news_pages(api_key: str, since: Optional[str] = None, pages: int = 1,
+                    page_size: int = NEWS_PAGE_SIZE, query: str = NEWS_QUERY,
+                    language: Optional[str] = "en"):
+    """Générateur : articles bruts NewsAPI, page après page (les plus récents
+    d'abord). Une page n'est demandée que lorsque la précédente a été consommée ;
+    s'arrête à la dernière page, après `pages` pages ou à la limite du forfait.
+
+    `query` / `language` : requête et langue NewsAPI (toutes langues si None).
     """
-    url = "https://newsapi.org/v2/everything"
-    # On demande 20 articles pour compenser le filtrage strict
-    params = {
-        "q": "\"Ethereum Classic\"",
-        "sortBy": "publishedAt",
-        "language": "en",
-        "pageSize": 20,
-    }
+    page_size = min(page_size, NEWS_MAX_PAGE_SIZE)
+    url = http_client.url("newsapi", "/everything")
     headers = {"Authorization": api_key}
-
-    try:
-        resp = requests.get(url, params=params, headers=headers, timeout=30)
+    for page in range(1, pages + 1):
+        params = {
+            "q":        query,
+            "sortBy":   "publishedAt",
+            "pageSize": page_size,
+            "page":     page,
+        }
+        if language:
+            params["language"] = language
+        if since:
+            params["from"] = since
+
+        resp = http_client.get(url, endpoint="newsapi", params=params, headers=headers, timeout=30)
+        if page > 1 and resp.status_code == 426:
+            return      # forfait gratuit : 100 premiers résultats seulement
         resp.raise_for_status()
         data = resp.json()
-
         if data.get("status") != "ok":
-            error_msg = data.get("message", "Erreur inconnue")
-            print(f"⚠️  NewsAPI : {error_msg}")
-            return []
+            print(f"⚠️  NewsAPI : {data.get('message', 'Erreur inconnue')}")
+            return
+
+        articles = data.get("articles", [])
+        run_report.count("news.pages")
+        yield from articles
+        if len(articles) < page_size or page * page_size >= data.get("totalResults", 0):
+            return
 
-        raw_articles = data.get("articles", [])
-        print(f"   NewsAPI a renvoyé {len(raw_articles)} article(s) brut(s)")
 
-        # FILTRE STRICT : ne garder que les articles mentionnant
-        # explicitement "ethereum classic" dans le titre ou la description
-        filtered = filter_strict_etc(raw_articles)
-        print(f"   {len(filtered)} article(s) mentionnent réellement 'Ethereum Classic'")
+def fetch_ethereum_news(api_key: str, max_articles: int = 5, since: Optional[str] = None,
+                        pages: int = 1, page_size: int = NEWS_PAGE_SIZE,
+                        index: Optional[dict] = None) -> list:
+    """Récupère les actualités Ethereum Classic depuis NewsAPI.
 
-        return filtered[:max_articles]
+    Les pages sont lues en flux et filtrées au fil de l'eau (voir
+    news_matcher) : seuls les articles retenus sont conservés, et la lecture
+    s'arrête dès que `max_articles` articles sont retenus. Une erreur en
+    cours de pagination garde les articles déjà retenus.
 
+    `since` (ISO 8601, typiquement le dernier `publishedAt` indexé) limite
+    la requête aux articles publiés depuis. Avec `index`, les articles déjà
+    indexés sont écartés au fil de l'eau et ne comptent pas dans
+    `max_articles`.
+    """
+    stats = {}
+    kept  = []
+    articles = iter_news_pages(api_key, since, pages, page_size)
+    matched  = get_matcher().stream(articles, stats=stats)
+    if index is not None:
+        matched = news_store.iter_unseen(matched, index)
+    try:
+        for article in matched:
+            kept.append(article)
+            if len(kept) >= max_articles:
+                break
     except requests.exceptions.HTTPError as exc:
         print(f"❌ Erreur HTTP NewsAPI ({exc.response.status_code}) : {exc}")
-        return []
     except Exception as exc:
         print(f"❌ Erreur lors de la récupération des news : {exc}")
-        return []
 
+    if stats:
+        print(f"   NewsAPI a renvoyé {stats['seen']} article(s) brut(s)")
+        print(f"   {stats['kept']} article(s) mentionnent réellement 'Ethereum Classic' "
+              f"({stats['rejected']} hors sujet, {stats['removed']} supprimé(s))")
+        run_report.count("news.seen", stats["seen"])
+        run_report.count("news.kept", stats["kept"])
+    return kept
 
-def filter_strict_etc(articles: list) -> list:
-    """Filtre strict : ne garde que les articles dont le titre OU
-    la description contient littéralement 'Ethereum Classic' (insensible à la casse).
-    
-    Exclut aussi les articles [Removed] qui sont des placeholders NewsAPI.
-    """
-    pattern = re.compile(r"ethereum\s+classic", re.IGNORECASE)
-    kept = []
-
-    for article in articles:
-        title = article.get("title") or ""
-        description = article.get("description") or ""
-
-        # Exclure les articles supprimes/placeholder
-        if title == "[Removed]" or description == "[Removed]":
-            continue
-
-        # Verifier la mention explicite d'Ethereum Classic
-        if pattern.search(title) or pattern.search(description):
-            kept.append(article)
-        else:
-            print(f"   ✗ Filtré (pas de mention ETC) : {title[:80]}")
 
-    return kept
+def filter_strict_etc(articles) -> list:
+    """Filtre strict : ne garde que les articles dont le titre ou la
+    description cite Ethereum Classic (alias, sigle « ETC » en majuscules,
+    hors expressions exclues comme « ETC Group »). Exclut aussi les articles
+    [Removed] qui sont des placeholders NewsAPI."""
+    return list(get_matcher().stream(articles))
 
 
 # ──────────────────────────────────────────────
 # 2. Reformulation avec Claude
 # ──────────────────────────────────────────────
 
-def reformulate_article(title: str, description: str, api_key: str) -> Optional[str]:
-    """Reformule un article d'actualité avec Claude (résumé court et clair)."""
+REFORMULATION_MODEL = "claude-haiku-4-5-20251001"
+
+# Nombre maximal d'appels Claude simultanés et délai maximal par appel (s)
+REFORMULATION_WORKERS = 32
+REFORMULATION_TIMEOUT = 30.0
+
+# Mode groupé : nombre d'articles par requête (budget par article : voir
+# llm_routing.ROUTES)
+REFORMULATION_BATCH_SIZE = 20
+
+# Longueur demandée ({length}) fixée par la route de l'article
+REFORMULATION_INSTRUCTIONS = (
+    "Tu es un spécialiste des cryptomonnaies. "
+    "Reformule chacun des articles d'actualité ci-dessous en français en {length} "
+    "claires et précises. Concentre-toi sur l'essentiel. "
+    "Ne commence pas par 'Cet article...' ou 'L'actualité...'."
+)
+
+
+def make_anthropic_client(api_key: str, timeout: float = REFORMULATION_TIMEOUT):
+    """Crée le client Anthropic partagé par tous les appels de reformulation."""
     import anthropic
 
-    client = anthropic.Anthropic(api_key=api_key)
-    prompt = (
+    return anthropic.Anthropic(api_key=api_key, timeout=timeout, max_retries=2)
+
+
+def reformulation_entry(title: str, description: str, route: str) -> str:
+    """Titre et description (tronquée selon la route) transmis au modèle."""
+    limit = llm_routing.ROUTES[route]["input_chars"]
+    return f"Titre : {llm_routing.trim(title, 200)}\nContenu : {llm_routing.trim(description, limit)}"
+
+
+def reformulation_prompt(title: str, description: str, route: str = "reformulation.full") -> str:
+    """Prompt de reformulation d'un article (sert aussi de clé de cache)."""
+    return (
         "Tu es un spécialiste des cryptomonnaies. "
-        "Reformule cet article d'actualité en français en 2-3 phrases claires et précises. "
-        "Concentre-toi sur l'essentiel. "
+        f"Reformule cet article d'actualité en français en {llm_routing.ROUTES[route]['length']} "
+        "claires et précises. Concentre-toi sur l'essentiel. "
         "Ne commence pas par 'Cet article...' ou 'L'actualité...'."
         "\n\n"
-        f"Titre : {title}\n"
-        f"Contenu : {description}"
+        f"{reformulation_entry(title, description, route)}"
     )
 
+
+def article_route(article: dict) -> str:
+    """Route de reformulation d'un article NewsAPI (voir llm_routing.py)."""
+    return llm_routing.route_reformulation(article.get("description", ""),
+                                           article.get("content") or "")
+
+
+def reformulate_article(title: str, description: str, api_key: str,
+                        client=None, timeout: float = REFORMULATION_TIMEOUT,
+                        content: str = "") -> Optional[str]:
+    """Reformule un article d'actualité avec Claude (résumé court et clair).
+
+    Article court : 1-2 phrases, budget réduit ; article long (description
+    étendue ou texte source long, d'après `content`) : traitement complet.
+    Les réponses sont mises en cache par empreinte du prompt : un article
+    déjà reformulé n'est pas renvoyé au modèle.
+    """
+    client = client or make_anthropic_client(api_key, timeout)
+    route  = llm_routing.route_reformulation(description, content)
+    prompt = reformulation_prompt(title, description, route)
+
     try:
-        message = client.messages.create(
-            model="claude-haiku-4-5-20251001",
-            max_tokens=300,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        return message.content[0].text.strip()
+        return llm_routing.routed_completion(client, route, prompt, timeout=timeout)
     except Exception as exc:
         print(f"⚠️  Erreur Claude pour '{title[:50]}' : {exc}")
         return None
 
 
+def reformulate_articles(articles: list, api_key: str,
+                         max_workers: int = REFORMULATION_WORKERS,
+                         timeout: float = REFORMULATION_TIMEOUT, client=None) -> dict:
+    """Reformule tous les articles en parallèle avec un client partagé.
+
+    Les appels sont bornés à `max_workers` simultanés et à `timeout` secondes
+    chacun : la durée totale est proche de celle de l'appel le plus lent
+    (par vague de `max_workers`). Un échec n'affecte que son article, qui
+    garde alors sa description d'origine. Retourne {titre: reformulation}.
+    """
+    todo = [
+        (article.get("title", ""), article.get("description", ""), article.get("content") or "")
+        for article in articles
+        if article.get("title") and article.get("description")
+    ]
+    if not todo:
+        return {}
+
+    client = client or make_anthropic_client(api_key, timeout)
+    reformulated = {}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(todo))) as pool:
+        futures = {
+            pool.submit(reformulate_article, title, description, api_key, client, timeout,
+                        content): title
+            for title, description, content in todo
+        }
+        for future in as_completed(futures):
+            title = futures[future]
+            refor = future.result()
+            if refor:
+                reformulated[title] = refor
+                print(f"   ✓ {title[:60]}…")
+
+    failed = len(todo) - len(reformulated)
+    if failed:
+        print(f"   ⚠️  {failed} article(s) non reformulé(s) — description d'origine conservée.")
+    return reformulated
+
+
+def _reformulable(articles: list) -> dict:
+    """{identifiant court: article} pour les articles ayant titre et description."""
+    kept = [a for a in articles if a.get("title") and a.get("description")]
+    return {f"a{idx}": article for idx, article in enumerate(kept, 1)}
+
+
+def _by_route(by_id: dict) -> dict:
+    """{route: [identifiants]} des articles à reformuler."""
+    routes = {}
+    for item_id, article in by_id.items():
+        routes.setdefault(article_route(article), []).append(item_id)
+    return routes
+
+
+def reformulate_batch(articles: list, api_key: str,
+                      batch_size: int = REFORMULATION_BATCH_SIZE,
+                      timeout: float = REFORMULATION_TIMEOUT, client=None) -> dict:
+    """Reformule les articles par requêtes groupées (une requête à sortie JSON
+    pour `batch_size` articles de même route, les lots partant en parallèle).
+
+    Les articles absents d'une réponse (JSON illisible, requête en échec)
+    sont repris un par un via `reformulate_articles`. Retourne {titre: reformulation}.
+    """
+    from llm_batch import structured_batch
+
+    by_id = _reformulable(articles)
+    if not by_id:
+        return {}
+
+    client = client or make_anthropic_client(api_key, timeout * 2)
+    chunks = [(route, ids[i:i + batch_size])
+              for route, ids in sorted(_by_route(by_id).items())
+              for i in range(0, len(ids), batch_size)]
+
+    def run(job: tuple) -> dict:
+        route, chunk = job
+        settings = llm_routing.ROUTES[route]
+        run_report.count(f"llm.route.{route}", len(chunk))
+        try:
+            return structured_batch(
+                client, settings["model"],
+                REFORMULATION_INSTRUCTIONS.format(length=settings["length"]),
+                items={i: reformulation_prompt(by_id[i]["title"], by_id[i]["description"], route)
+                       for i in chunk},
+                entries={i: reformulation_entry(by_id[i]["title"], by_id[i]["description"], route)
+                         for i in chunk},
+                item_max_tokens=settings["max_tokens"], per_item_tokens=settings["item_tokens"],
+                route=f"{route}.batch",
+            )
+        except Exception as exc:
+            print(f"   ⚠️  Requête groupée en échec ({exc}) — reprise article par article.")
+            return {}
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=min(REFORMULATION_WORKERS, len(chunks))) as pool:
+        for done in pool.map(run, chunks):
+            results.update(done)
+
+    reformulated = {by_id[i]["title"]: text for i, text in results.items()}
+    print(f"   {len(reformulated)}/{len(by_id)} article(s) reformulé(s) en {len(chunks)} requête(s) groupée(s)")
+
+    missing = [by_id[i] for i in by_id if i not in results]
+    if missing:
+        print(f"   ↻ {len(missing)} article(s) repris individuellement…")
+        reformulated.update(reformulate_articles(missing, api_key, timeout=timeout, client=client))
+    return reformulated
+
+
+def reformulate_with_batch_api(articles: list, api_key: str, client=None) -> dict:
+    """Reformule les articles via l'API asynchrone Message Batches (moitié prix,
+    résultats en différé, un lot par route) — adaptée aux gros volumes sans
+    contrainte de délai."""
+    from llm_batch import run_message_batch
+
+    by_id = _reformulable(articles)
+    if not by_id:
+        return {}
+
+    client  = client or make_anthropic_client(api_key)
+    results = {}
+    for route, ids in sorted(_by_route(by_id).items()):
+        settings = llm_routing.ROUTES[route]
+        run_report.count(f"llm.route.{route}", len(ids))
+        results.update(run_message_batch(
+            client, settings["model"],
+            {i: reformulation_prompt(by_id[i]["title"], by_id[i]["description"], route) for i in ids},
+            max_tokens=settings["max_tokens"],
+        ))
+    print(f"   {len(results)}/{len(by_id)} article(s) reformulé(s) via l'API Message Batches")
+    return {by_id[i]["title"]: text for i, text in results.items()}
+
+
+REFORMULATION_MODES = {
+    "batch":      reformulate_batch,
+    "concurrent": reformulate_articles,
+    "batch-api":  reformulate_with_batch_api,
+}
+
+
 # ──────────────────────────────────────────────
 # 3. Création de la page des actualités
 # ──────────────────────────────────────────────
@@ -155,10 +375,18 @@ def create_news_markdown(articles: list, reformulated: dict) -> str:
         # Récupère la version reformulée ou l'original
         refor = reformulated.get(title, article.get("description", "Pas de description disponible"))
 
+        # Reprises du même article par d'autres médias
+        also = article.get("also") or []
+        syndicated = ""
+        if also:
+            sources = " · ".join(f"[{copy['name']}]({copy['url']})" for copy in also)
+            syndicated = f"**Également publié par :** {sources}\n\n"
+
         body += (
             f"### {idx}. {title}\n\n"
             f"**Source :** {source} ({pubdate})\n\n"
             f"{refor}\n\n"
+            f"{syndicated}"
             f"[Lire l'article complet →]({url})\n\n"
             f"---\n\n"
         )
@@ -189,57 +417,140 @@ def save_news_article(markdown: str) -> str:
 
 
 # ──────────────────────────────────────────────
-# 4. Point d'entrée
+# 4. Rafraîchissement des actualités
 # ──────────────────────────────────────────────
 
-def main() -> None:
-    print("═══════════════════════════════════════")
-    print("  ETC Tracker — Module d'actualités    ")
-    print("═══════════════════════════════════════")
+def collect_fresh_news(newsapi_key: str, pages: int = 1,
+                       page_size: int = NEWS_PAGE_SIZE) -> tuple:
+    """Récupère les actualités publiées depuis le dernier passage (jusqu'à
+    `pages` pages de `page_size` résultats) et retourne (index, articles
+    jamais vus). Les reprises d'un même article sont marquées
+    (`duplicate_of`, voir news_clusters) : seuls les représentants sont à
+    reformuler."""
+    index = news_store.load_index()
+    since = index.get("last_published_at")
+    print("\n📰 Récupération des actualités ETC (NewsAPI + filtre strict)…")
+    if since:
+        print(f"   Articles publiés depuis {since}")
+    with run_report.stage("fetch"):
+        articles = fetch_ethereum_news(newsapi_key, max_articles=pages * page_size,
+                                       since=since, pages=pages, page_size=page_size,
+                                       index=index)
+
+    # Déduplication avec l'index : seuls les articles jamais vus sont traités
+    fresh = news_store.filter_unseen(articles, index)
+    print(f"   {len(fresh)} nouvelle(s) actualité(s) sur {len(articles)} validée(s)")
+
+    # Reprises d'un même communiqué : un seul résumé par groupe
+    with run_report.stage("cluster"):
+        duplicates = news_clusters.mark_duplicates(index, fresh)
+    if duplicates:
+        print(f"   {duplicates} reprise(s) d'un autre article regroupée(s) — "
+              f"{len(fresh) - duplicates} résumé(s) à produire")
+    run_report.set_meta(articles=len(articles), fresh=len(fresh), duplicates=duplicates)
+    return index, fresh
+
+
+def write_news_pages(index: dict, fresh: list, reformulated: dict) -> None:
+    """Ajoute les nouveaux articles à l'index puis régénère l'archive datée
+    et la page des dernières actualités."""
+    with run_report.stage("write"):
+        news_store.add_articles(index, fresh, reformulated)
+        news_store.save_index(index)
+
+    # Archive datée + page des dernières actualités (reconstruites depuis l'index)
+    print("\n📝 Création des pages d'actualités…")
+    now = datetime.now()
+    with run_report.stage("render"):
+        archive = create_news_markdown(*news_store.seen_on(index, now))
+        latest  = create_news_markdown(*news_store.latest(index, 5))
+    with run_report.stage("write"):
+        news_store.save_archive_page(archive, now)
+        save_news_article(latest)
+
+
+def enough_fresh(fresh: list, min_fresh: int = 1) -> bool:
+    """Vrai si assez de nouveautés justifient de régénérer les pages."""
+    if not fresh:
+        print("ℹ️  Aucune nouvelle actualité Ethereum Classic — pages inchangées.")
+        return False
+    if len(fresh) < min_fresh:
+        print(f"ℹ️  Moins de {min_fresh} nouveautés — pages inchangées (reportées au prochain passage).")
+        return False
+    return True
+
+
+def refresh_news(newsapi_key: str, anthropic_key: str = "", mode: str = "batch",
+                 client=None, min_fresh: int = 1, pages: int = 1,
+                 page_size: int = NEWS_PAGE_SIZE) -> int:
+    """Récupère les actualités publiées depuis le dernier passage, reformule
+    les nouvelles et régénère les pages. Retourne le nombre d'articles
+    ajoutés (0 si moins de `min_fresh` nouveautés : pages inchangées).
+
+    `client` permet de réutiliser un client Anthropic déjà ouvert (démon,
+    pipeline) ; `pages` / `page_size` règlent le volume demandé à NewsAPI.
+    """
+    index, fresh = collect_fresh_news(newsapi_key, pages, page_size)
+    run_report.set_meta(mode=mode)
+    if not enough_fresh(fresh, min_fresh):
+        return 0
 
-    # 4-a. Clés API
-    newsapi_key = os.environ.get("NEWSAPI_API_KEY", "").strip()
-    anthropic_key = os.environ.get("ANTHROPIC_API_KEY", "").strip()
+    # Reformulation avec Claude (nouveaux articles uniquement)
+    reformulated = {}
+    if anthropic_key:
+        print("\n🤖 Reformulation des actualités (Claude)…")
+        with run_report.stage("analysis"):
+            reformulated = REFORMULATION_MODES[mode](news_clusters.representatives(fresh),
+                                                     anthropic_key, client=client)
 
-    if not newsapi_key:
-        print("❌ Variable NEWSAPI_API_KEY manquante — module d'actualités désactivé.")
-        return
+    write_news_pages(index, fresh, reformulated)
+    return len(fresh)
 
-    if not anthropic_key:
-        print("⚠️  Variable ANTHROPIC_API_KEY manquante — utilisation des résumés originaux.")
 
-    # 4-b. Récupération des actualités (avec filtre strict)
-    print("\n📰 Récupération des actualités ETC (NewsAPI + filtre strict)…")
-    articles = fetch_ethereum_news(newsapi_key, max_articles=5)
+# ──────────────────────────────────────────────
+# 5. Point d'entrée
+# ──────────────────────────────────────────────
 
-    if not articles:
-        print("❌ Aucune actualité Ethereum Classic trouvée après filtrage strict.")
-        return
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="ETC Tracker — module d'actualités")
+    parser.add_argument("--mode", choices=sorted(REFORMULATION_MODES), default="batch",
+                        help="reformulation : requêtes groupées (défaut), un appel par "
+                             "article en parallèle, ou API asynchrone Message Batches")
+    parser.add_argument("--pages", type=int, default=1,
+                        help="nombre de pages NewsAPI à parcourir (défaut : 1)")
+    parser.add_argument("--page-size", type=int, default=NEWS_PAGE_SIZE,
+                        help=f"articles par page, {NEWS_MAX_PAGE_SIZE} au plus "
+                             f"(défaut : {NEWS_PAGE_SIZE})")
+    parser.add_argument("--profile", choices=run_report.PROFILE_MODES,
+                        help="joint au rapport d'exécution un profil cProfile (cpu), "
+                             "tracemalloc (memory) ou les deux (all)")
+    return parser.parse_args(argv)
 
-    print(f"   {len(articles)} actualité(s) validée(s) après filtrage")
 
-    # 4-c. Reformulation avec Claude
-    reformulated = {}
-    if anthropic_key:
-        print("\n🤖 Reformulation des actualités (Claude)…")
-        for article in articles:
-            title = article.get("title", "")
-            description = article.get("description", "")
+def main() -> None:
+    args = parse_args()
 
-            if title and description:
-                refor = reformulate_article(title, description, anthropic_key)
-                if refor:
-                    reformulated[title] = refor
-                    print(f"   ✓ {title[:60]}…")
+    with run_report.run("fetch_ethereum_news", args.profile):
+        print("═══════════════════════════════════════")
+        print("  ETC Tracker — Module d'actualités    ")
+        print("═══════════════════════════════════════")
 
-    # 4-d. Création de la page
-    print("\n📝 Création de la page d'actualités…")
-    markdown = create_news_markdown(articles, reformulated)
-    save_news_article(markdown)
+        # Clés API
+        newsapi_key = os.environ.get("NEWSAPI_API_KEY", "").strip()
+        anthropic_key = os.environ.get("ANTHROPIC_API_KEY", "").strip()
 
-    print("\nTerminé ✓")
+        if not newsapi_key:
+            print("❌ Variable NEWSAPI_API_KEY manquante — module d'actualités désactivé.")
+            return
+
+        if not anthropic_key:
+            print("⚠️  Variable ANTHROPIC_API_KEY manquante — utilisation des résumés originaux.")
+
+        if refresh_news(newsapi_key, anthropic_key, args.mode,
+                        pages=args.pages, page_size=args.page_size):
+            print(f"\n{get_cache().summary()}")
+        print("\nTerminé ✓")
 
 
 if __name__ == "__main__":
     main()
-
@@ -2,90 +2,174 @@
 """
 ETC Tracker — Script de génération d'article quotidien
 ======================================================
-Récupère le cours de l'Ethereum Classic (ETC) via l'API CoinGecko,
-génère une analyse avec Claude (Anthropic), publie sur Hugo ET sur Beehiiv.
+Récupère le cours de l'Ethereum Classic (ETC) via l'API CoinGecko (sources de
+secours : voir price_sources.py), génère une analyse avec Claude (Anthropic),
+publie sur Hugo ET sur Beehiiv.
 
 Variables d'environnement :
   ANTHROPIC_API_KEY      Clé API Anthropic (Secret GitHub)
   BEEHIIV_API_KEY        Clé API Beehiiv   (Secret GitHub)
   BEEHIIV_PUBLICATION_ID ID de la publication Beehiiv (Secret GitHub)
+
+Usage :
+  python scripts/generate_article.py                                   Article du jour
+  python scripts/generate_article.py --backfill 2024-01-01 2026-05-01  Reconstruction de l'archive
+                                     [--force] [--ai]
+  python scripts/generate_article.py --assets bitcoin,ethereum         Mode multi-actifs (ou --assets all)
+
+Chaque exécution écrit un rapport de durées et de compteurs dans reports/
+(voir run_report.py) ; `--profile cpu|memory|all` y joint un profil.
 """
 
 import os
 import sys
-import time
-import requests
-from datetime import datetime
+import argparse
+from datetime import date, datetime
+
+import beehiiv_outbox
+import chart_data
+import llm_routing
+import monthly_digest
+import price_history
+import price_sources
+import run_report
+from llm_cache import get_cache
+from post_document import build_document, render
+
+
+# Actif suivi par défaut. Les autres actifs (mode multi-actifs, voir
+# multi_asset.py) utilisent la même structure.
+ETC_ASSET = {
+    "id":      "ethereum-classic",
+    "symbol":  "ETC",
+    "name":    "Ethereum Classic",
+    "slug":    "etc",
+    "section": os.path.join("content", "posts"),
+}
 
 
 # ──────────────────────────────────────────────
-# 1. Récupération des données CoinGecko
+# 1. Récupération des données de marché
 # ──────────────────────────────────────────────
 
 def fetch_etc_data() -> dict:
-    """Récupère les données de marché ETC depuis l'API publique CoinGecko."""
-    url = "https://api.coingecko.com/api/v3/coins/ethereum-classic"
-    params = {
-        "localization":    "false",
-        "tickers":         "false",
-        "market_data":     "true",
-        "community_data":  "false",
-        "developer_data":  "false",
-        "sparkline":       "false",
-    }
-    headers = {"Accept": "application/json"}
-
-    for attempt in range(3):
-        try:
-            resp = requests.get(url, params=params, headers=headers, timeout=30)
-            resp.raise_for_status()
-            data = resp.json()
-            md   = data["market_data"]
-            return {
-                "price_usd":          md["current_price"]["usd"],
-                "price_eur":          md["current_price"]["eur"],
-                "change_24h":         md.get("price_change_percentage_24h")  or 0.0,
-                "change_7d":          md.get("price_change_percentage_7d")   or 0.0,
-                "change_30d":         md.get("price_change_percentage_30d")  or 0.0,
-                "market_cap_usd":     md["market_cap"]["usd"],
-                "volume_24h_usd":     md["total_volume"]["usd"],
-                "ath_usd":            md["ath"]["usd"],
-                "ath_date":           md["ath_date"]["usd"][:10],
-                "circulating_supply": md.get("circulating_supply") or 0,
-                "max_supply":         md.get("max_supply") or 210_700_000,
-            }
-        except requests.exceptions.HTTPError as exc:
-            if resp.status_code == 429:
-                wait = 60 * (attempt + 1)
-                print(f"⏳ Rate limit CoinGecko — attente {wait}s…")
-                time.sleep(wait)
-            else:
-                raise
-        except Exception as exc:
-            if attempt < 2:
-                print(f"⚠️  Tentative {attempt + 1} échouée : {exc} — nouvel essai dans 10s…")
-                time.sleep(10)
-            else:
-                raise
-
-    raise RuntimeError("Impossible de récupérer les données CoinGecko après 3 tentatives.")
+    """Récupère les données de marché ETC : CoinGecko, avec requêtes de
+    couverture vers les sources de secours si CoinGecko tarde ou échoue
+    (voir price_sources.py). Les champs `source_name` / `source_url`
+    désignent la source retenue."""
+    return price_sources.fetch_market_data(ETC_ASSET)
+
+
+# ──────────────────────────────────────────────
+# 1 bis. Indicateurs techniques (historique des cours)
+# ──────────────────────────────────────────────
+
+def compute_market_indicators(etc_data: dict, now: datetime,
+                              path: str = price_history.HISTORY_PATH) -> dict:
+    """Indicateurs techniques du jour, calculés sur l'historique stocké puis
+    mis à jour avec le cours courant. Retourne {} si NumPy est indisponible."""
+    try:
+        from indicators import IndicatorState
+    except ImportError:
+        return {}
+
+    previous = [rec["price_usd"] for rec in price_history.read_range(path=path)
+                if rec["date"] < now.strftime("%Y-%m-%d")]
+    state = IndicatorState(previous, etc_data.get("ath_usd") or 0.0)
+    return state.update(etc_data["price_usd"])
+
+
+def indicators_prompt(ind: dict) -> str:
+    """Lignes d'indicateurs ajoutées au prompt d'analyse (vide si indisponibles)."""
+    labels = (
+        ("sma_7",         "MM 7j         : {:.4f} USD"),
+        ("sma_30",        "MM 30j        : {:.4f} USD"),
+        ("ema_12",        "MME 12j       : {:.4f} USD"),
+        ("ema_26",        "MME 26j       : {:.4f} USD"),
+        ("rsi_14",        "RSI 14j       : {:.1f}"),
+        ("volatility_30", "Volatilité 30j: {:.1f}% (annualisée)"),
+        ("drawdown",      "Depuis l'ATH  : {:+.1f}%"),
+        ("zscore_30",     "Z-score 30j   : {:+.2f}"),
+    )
+    return "".join(f"\n{label.format(ind[key])}" for key, label in labels
+                   if ind.get(key) is not None)
 
 
 # ──────────────────────────────────────────────
 # 2. Analyse avec Claude (Anthropic)
 # ──────────────────────────────────────────────
 
-def generate_ai_analysis(etc_data: dict, api_key: str) -> str:
-    """Génère une analyse de marché avec Claude Haiku (Anthropic)."""
-    import anthropic
+ANALYSIS_MODEL = "claude-haiku-4-5-20251001"
+
+
+# Arrondi des indicateurs dans la clé de cache : moyennes mobiles en position
+# relative au cours (%), autres indicateurs dans leur unité
+SNAPSHOT_INDICATORS = {
+    "sma_7":         "{:+.0f}",
+    "sma_30":        "{:+.0f}",
+    "ema_12":        "{:+.0f}",
+    "ema_26":        "{:+.0f}",
+    "rsi_14":        "{:.0f}",
+    "volatility_30": "{:.0f}",
+    "drawdown":      "{:+.0f}",
+    "zscore_30":     "{:+.1f}",
+}
+
+
+def snapshot_cache_key(etc_data: dict, ind: dict = None, route: str = "analysis.full") -> str:
+    """Clé de cache d'un instantané de marché arrondi : deux relances proches
+    réutilisent l'analyse. Prix à trois chiffres significatifs (0,1 USD vers
+    15 USD, soit 0,3 à 0,7 % du cours), variations au dixième, et chacun des
+    indicateurs transmis par le prompt de la route : moyennes mobiles à 1 %
+    près du cours, RSI, volatilité et baisse depuis l'ATH à l'unité, z-score
+    au dixième."""
+    price = etc_data["price_usd"]
+    keys  = llm_routing.COMPACT_INDICATORS if route == "analysis.compact" else SNAPSHOT_INDICATORS
+    rounded = []
+    for key in keys:
+        value = (ind or {}).get(key)
+        if value is None:
+            rounded.append("-")
+            continue
+        if key.startswith(("sma_", "ema_")):
+            value = (value / price - 1) * 100 if price else 0.0
+        rounded.append(SNAPSHOT_INDICATORS[key].format(value))
+    snapshot = (
+        f"{price:.3g}|{etc_data['change_24h']:.1f}|"
+        f"{etc_data['change_7d']:.1f}|{etc_data['change_30d']:.1f}|"
+        f"{etc_data['market_cap_usd']:.2g}|{etc_data['volume_24h_usd']:.2g}|"
+        f"{etc_data['ath_usd']:.2f}|{'|'.join(rounded)}"
+    )
+    settings = llm_routing.ROUTES[route]
+    return get_cache().key(settings["model"], snapshot, kind="analysis",
+                           max_tokens=settings["max_tokens"], route=route)
+
 
-    client = anthropic.Anthropic(api_key=api_key)
-    prompt = (
+def analysis_prompt(etc_data: dict, ind: dict = None, route: str = None) -> str:
+    """Prompt d'analyse de marché d'un jour. La route (voir llm_routing.py)
+    fixe la longueur demandée ; la route compacte ne transmet que les
+    données essentielles."""
+    route  = route or llm_routing.route_analysis(etc_data, ind)
+    header = (
         "Tu es un analyste de marché spécialisé dans les cryptomonnaies. "
-        "Rédige en français un commentaire de marché factuel et nuancé (150–200 mots) "
+        f"Rédige en français un commentaire de marché factuel et nuancé "
+        f"({llm_routing.ROUTES[route]['length']}) "
         "sur l'Ethereum Classic (ETC) à partir des données ci-dessous. "
         "N'émets aucune recommandation d'investissement. "
         "Ne commence pas ta réponse par 'L'Ethereum Classic'.\n\n"
+    )
+    if route == "analysis.compact":
+        ind = {key: (ind or {}).get(key) for key in llm_routing.COMPACT_INDICATORS}
+        return header + (
+            f"Prix          : {etc_data['price_usd']:.4f} USD\n"
+            f"Variations    : {etc_data['change_24h']:+.2f}% (24h), "
+            f"{etc_data['change_7d']:+.2f}% (7j), {etc_data['change_30d']:+.2f}% (30j)\n"
+            f"Volume 24h    : {etc_data['volume_24h_usd']:,.0f} USD"
+            + (f"\nDepuis l'ATH  : {(etc_data['price_usd'] / etc_data['ath_usd'] - 1) * 100:+.1f}%"
+               if etc_data.get("ath_usd") else "")
+            + indicators_prompt(ind)
+        )
+    return header + (
         f"Prix          : {etc_data['price_usd']:.4f} USD  /  {etc_data['price_eur']:.4f} EUR\n"
         f"Variation 24h : {etc_data['change_24h']:+.2f}%\n"
         f"Variation 7j  : {etc_data['change_7d']:+.2f}%\n"
@@ -93,21 +177,53 @@ def generate_ai_analysis(etc_data: dict, api_key: str) -> str:
         f"Capitalisation: {etc_data['market_cap_usd']:,.0f} USD\n"
         f"Volume 24h    : {etc_data['volume_24h_usd']:,.0f} USD\n"
         f"ATH           : {etc_data['ath_usd']:.2f} USD (le {etc_data['ath_date']})"
+        f"{indicators_prompt(ind or {})}"
     )
 
-    message = client.messages.create(
-        model="claude-haiku-4-5-20251001",
-        max_tokens=450,
-        messages=[{"role": "user", "content": prompt}],
-    )
-    return message.content[0].text.strip()
+
+def generate_ai_analysis(etc_data: dict, api_key: str, ind: dict = None, client=None) -> str:
+    """Génère une analyse de marché avec Claude (Anthropic), avec cache disque.
+    Séance ordinaire : prompt compact et budget réduit ; mouvement inhabituel :
+    traitement complet (voir llm_routing.py).
+
+    `client` permet de réutiliser un client Anthropic déjà ouvert (démon, pipeline).
+    """
+    if client is None:
+        import anthropic
+
+        client = anthropic.Anthropic(api_key=api_key)
+    route   = llm_routing.route_analysis(etc_data, ind)
+    signals = llm_routing.analysis_signals(etc_data, ind)
+    print(f"   Route : {route}" + (f" ({', '.join(signals)})" if signals else ""))
+
+    return llm_routing.routed_completion(client, route, analysis_prompt(etc_data, ind, route),
+                                         cache_key=snapshot_cache_key(etc_data, ind, route))
 
 
 # ──────────────────────────────────────────────
 # 3. Analyse de secours (sans IA)
 # ──────────────────────────────────────────────
 
-def generate_basic_analysis(etc_data: dict) -> str:
+def _technical_note(ind: dict) -> str:
+    """Paragraphe technique de l'analyse basique (moyenne 30j, RSI, volatilité)."""
+    parts = []
+    if ind.get("sma_30") is not None:
+        position = "au-dessus de" if ind["price"] >= ind["sma_30"] else "en dessous de"
+        parts.append(f"le cours évolue {position} sa moyenne mobile 30 jours "
+                     f"({ind['sma_30']:.4f} USD)")
+    if ind.get("rsi_14") is not None:
+        zone = ("zone de surachat" if ind["rsi_14"] > 70
+                else "zone de survente" if ind["rsi_14"] < 30 else "zone neutre")
+        parts.append(f"le RSI 14 jours s'établit à {ind['rsi_14']:.0f} ({zone})")
+    if ind.get("volatility_30") is not None:
+        parts.append(f"la volatilité annualisée sur 30 jours atteint {ind['volatility_30']:.0f}%")
+    if not parts:
+        return ""
+    return "\n\nSur le plan technique, " + ", ".join(parts[:-1]) + \
+           (" et " if len(parts) > 1 else "") + parts[-1] + "."
+
+
+def generate_basic_analysis(etc_data: dict, asset: dict = ETC_ASSET, ind: dict = None) -> str:
     """Génère une analyse basique sans appel API."""
     c = etc_data["change_24h"]
     if   c >  5: trend, note = "forte hausse",     "Le momentum haussier est marqué sur la séance."
@@ -128,7 +244,7 @@ def generate_basic_analysis(etc_data: dict) -> str:
                else f"{etc_data['market_cap_usd']/1e6:.2f} M USD")
 
     return (
-        f"L'ETC affiche une {trend} de {c:+.2f}% sur les dernières 24 heures. "
+        f"L'{asset['symbol']} affiche une {trend} de {c:+.2f}% sur les dernières 24 heures. "
         f"{note}\n\n"
         f"Sur une semaine glissante, la performance s'établit à {etc_data['change_7d']:+.2f}%, "
         f"et à {etc_data['change_30d']:+.2f}% sur le dernier mois. "
@@ -136,6 +252,7 @@ def generate_basic_analysis(etc_data: dict) -> str:
         f"Le cours se situe actuellement à {abs(ath_pct):.1f}% "
         f"{direction} son sommet historique de {etc_data['ath_usd']:.2f} USD "
         f"(atteint le {etc_data['ath_date']})."
+        f"{_technical_note(ind or {})}"
     )
 
 
@@ -143,76 +260,31 @@ def generate_basic_analysis(etc_data: dict) -> str:
 # 4. Création de l'article Hugo (Markdown)
 # ──────────────────────────────────────────────
 
-def fmt_big(n: float) -> str:
-    """Formate un grand nombre en Mrd/M USD."""
-    if n >= 1_000_000_000:
-        return f"{n / 1_000_000_000:.2f} Mrd USD"
-    if n >= 1_000_000:
-        return f"{n / 1_000_000:.2f} M USD"
-    return f"{n:,.0f} USD"
+def article_path(day: datetime, asset: dict = ETC_ASSET) -> str:
+    """Chemin de l'article quotidien pour la date donnée."""
+    return os.path.join(asset["section"], f"{asset['slug']}-{day.strftime('%Y-%m-%d')}.md")
+
+
+def render_hugo_article(etc_data: dict, analysis: str, now: datetime,
+                        asset: dict = ETC_ASSET, doc: dict = None) -> str:
+    """Construit le contenu Markdown (front matter + corps) de l'article du jour `now`."""
+    return render(doc or build_document(etc_data, analysis, now, asset), "markdown")
 
 
-def create_hugo_article(etc_data: dict, analysis: str) -> str:
+def create_hugo_article(etc_data: dict, analysis: str, now: datetime = None,
+                        asset: dict = ETC_ASSET, doc: dict = None) -> str:
     """Génère le fichier Markdown dans content/posts/ et retourne son chemin."""
-    now      = datetime.now()
-    date_str = now.strftime("%Y-%m-%d")
-    slug     = f"etc-{date_str}"
-    filepath = os.path.join("content", "posts", f"{slug}.md")
+    now      = now or datetime.now()
+    filepath = article_path(now, asset)
 
     # Évite les doublons si le workflow tourne deux fois dans la journée
     if os.path.exists(filepath):
         print(f"ℹ️  Article du jour déjà existant ({filepath}) — ignoré.")
         return filepath
 
-    sign  = "+" if etc_data["change_24h"] >= 0 else ""
-    emoji = "📈" if etc_data["change_24h"] >= 0 else "📉"
-
-    # Jour sans zéro initial (Linux : %-d)
-    try:
-        day_fmt = now.strftime("%-d %B %Y")
-    except ValueError:
-        day_fmt = now.strftime("%d %B %Y").lstrip("0")
-
-    frontmatter = (
-        f'---\n'
-        f'title: "ETC {date_str} — {etc_data["price_usd"]:.4f} $ ({sign}{etc_data["change_24h"]:.2f}%)"\n'
-        f'date: {now.strftime("%Y-%m-%dT%H:%M:%S")}+01:00\n'
-        f'draft: false\n'
-        f'description: "Cours Ethereum Classic du {date_str} : '
-        f'{etc_data["price_usd"]:.4f} USD, variation 24h {sign}{etc_data["change_24h"]:.2f}%"\n'
-        f'price_usd: {etc_data["price_usd"]:.4f}\n'
-        f'price_eur: {etc_data["price_eur"]:.4f}\n'
-        f'change_24h: {etc_data["change_24h"]:.2f}\n'
-        f'change_7d: {etc_data["change_7d"]:.2f}\n'
-        f'change_30d: {etc_data["change_30d"]:.2f}\n'
-        f'market_cap: "{fmt_big(etc_data["market_cap_usd"])}"\n'
-        f'volume_24h: "{fmt_big(etc_data["volume_24h_usd"])}"\n'
-        f'---\n\n'
-    )
-
-    body = (
-        f"## Cours du {day_fmt} {emoji}\n\n"
-        f"| Indicateur | Valeur |\n"
-        f"|---|---|\n"
-        f"| **Prix USD** | {etc_data['price_usd']:.4f} $ |\n"
-        f"| **Prix EUR** | {etc_data['price_eur']:.4f} € |\n"
-        f"| **Variation 24h** | {sign}{etc_data['change_24h']:.2f}% |\n"
-        f"| **Variation 7 jours** | {etc_data['change_7d']:+.2f}% |\n"
-        f"| **Variation 30 jours** | {etc_data['change_30d']:+.2f}% |\n"
-        f"| **Capitalisation** | {fmt_big(etc_data['market_cap_usd'])} |\n"
-        f"| **Volume 24h** | {fmt_big(etc_data['volume_24h_usd'])} |\n"
-        f"| **Plus haut historique** | {etc_data['ath_usd']:.2f} $ |\n\n"
-        f"## Analyse du jour\n\n"
-        f"{analysis}\n\n"
-        f"---\n\n"
-        f"*Données : [CoinGecko](https://www.coingecko.com) (API publique). "
-        f"Analyse générée automatiquement par Claude AI (Anthropic). "
-        f"Ce site est fourni à titre informatif uniquement — pas de conseil en investissement.*\n"
-    )
-
-    os.makedirs(os.path.join("content", "posts"), exist_ok=True)
+    os.makedirs(asset["section"], exist_ok=True)
     with open(filepath, "w", encoding="utf-8") as fh:
-        fh.write(frontmatter + body)
+        fh.write(render_hugo_article(etc_data, analysis, now, asset, doc))
 
     print(f"✅ Article créé : {filepath}")
     return filepath
@@ -222,132 +294,188 @@ def create_hugo_article(etc_data: dict, analysis: str) -> str:
 # 5. Publication sur Beehiiv
 # ──────────────────────────────────────────────
 
-def publish_to_beehiiv(etc_data: dict, analysis: str, api_key: str, pub_id: str) -> None:
-    """Publie l'article du jour sur Beehiiv via l'API REST."""
-    now      = datetime.now()
-    date_str = now.strftime("%Y-%m-%d")
-    sign     = "+" if etc_data["change_24h"] >= 0 else ""
-    emoji    = "📈" if etc_data["change_24h"] >= 0 else "📉"
-
-    try:
-        day_fmt = now.strftime("%-d %B %Y")
-    except ValueError:
-        day_fmt = now.strftime("%d %B %Y").lstrip("0")
-
-    title = (
-        f"ETC {date_str} — {etc_data['price_usd']:.4f} $ "
-        f"({sign}{etc_data['change_24h']:.2f}%) {emoji}"
-    )
-    subtitle = (
-        f"Cours Ethereum Classic du {date_str} : "
-        f"{etc_data['price_usd']:.4f} USD, variation 24h {sign}{etc_data['change_24h']:.2f}%"
-    )
-
-    # Analyse : remplace les sauts de ligne en balises <p>
-    analysis_html = "".join(
-        f"<p>{para.strip()}</p>"
-        for para in analysis.split("\n\n")
-        if para.strip()
-    )
-
-    content_html = f"""
-<h2>Cours du {day_fmt} {emoji}</h2>
-<table>
-  <thead><tr><th>Indicateur</th><th>Valeur</th></tr></thead>
-  <tbody>
-    <tr><td><strong>Prix USD</strong></td><td>{etc_data['price_usd']:.4f} $</td></tr>
-    <tr><td><strong>Prix EUR</strong></td><td>{etc_data['price_eur']:.4f} €</td></tr>
-    <tr><td><strong>Variation 24h</strong></td><td>{sign}{etc_data['change_24h']:.2f}%</td></tr>
-    <tr><td><strong>Variation 7 jours</strong></td><td>{etc_data['change_7d']:+.2f}%</td></tr>
-    <tr><td><strong>Variation 30 jours</strong></td><td>{etc_data['change_30d']:+.2f}%</td></tr>
-    <tr><td><strong>Capitalisation</strong></td><td>{fmt_big(etc_data['market_cap_usd'])}</td></tr>
-    <tr><td><strong>Volume 24h</strong></td><td>{fmt_big(etc_data['volume_24h_usd'])}</td></tr>
-    <tr><td><strong>Plus haut historique</strong></td><td>{etc_data['ath_usd']:.2f} $</td></tr>
-  </tbody>
-</table>
-
-<h2>Analyse du jour</h2>
-{analysis_html}
-
-<hr>
-<p><em>Données : <a href="https://www.coingecko.com">CoinGecko</a> (API publique).
-Analyse générée automatiquement par Claude AI (Anthropic).
-Ce contenu est fourni à titre informatif uniquement — pas de conseil en investissement.</em></p>
-"""
-
-    url     = f"https://api.beehiiv.com/v2/publications/{pub_id}/posts"
-    headers = {
-        "Content-Type":  "application/json",
-        "Authorization": f"Bearer {api_key}",
-    }
-    payload = {
-        "title":           title,
-        "subtitle":        subtitle,
-        "content_html":    content_html,
+def beehiiv_payload(doc: dict) -> dict:
+    """Corps de la requête de création (ou de mise à jour) du post Beehiiv."""
+    return {
+        "title":           f"{doc['title']} {doc['emoji']}",
+        "subtitle":        doc["description"],
+        "content_html":    render(doc, "beehiiv_html"),
         "status":          "confirmed",   # publié immédiatement
         "send_at":         None,          # envoi immédiat
     }
 
-    resp = requests.post(url, json=payload, headers=headers, timeout=30)
 
-    if resp.status_code in (200, 201):
-        data = resp.json().get("data", {})
-        post_id  = data.get("id", "—")
-        web_url  = data.get("web_url") or data.get("url") or "—"
-        print(f"✅ Beehiiv — Article publié (id={post_id})")
-        print(f"   URL : {web_url}")
-    else:
-        print(f"⚠️  Beehiiv — Erreur {resp.status_code} : {resp.text[:300]}")
+def publish_to_beehiiv(etc_data: dict, analysis: str, api_key: str, pub_id: str,
+                       asset: dict = ETC_ASSET, doc: dict = None, key: str = None,
+                       outbox=None) -> dict:
+    """Publie l'article sur Beehiiv via la file d'envoi (beehiiv_outbox.py) :
+    mise en file sous `key` (par défaut `<slug>-<date>`), puis livraison de
+    tout ce qui est dû. Un contenu déjà livré à l'identique n'est pas renvoyé ;
+    un échec est reporté au passage suivant au lieu d'être perdu."""
+    doc = doc or build_document(etc_data, analysis, datetime.now(), asset)
+    key = key or f"{asset['slug']}-{doc['date']}"
+    return beehiiv_outbox.publish(key, beehiiv_payload(doc), api_key, pub_id, outbox)
 
 
 # ──────────────────────────────────────────────
-# 6. Point d'entrée
+# 6. Étapes du run quotidien
 # ──────────────────────────────────────────────
+# Partagées par `main()` et par le pipeline (pipeline.py), qui les
+# exécute en graphe de dépendances.
 
-def main() -> None:
-    print("═══════════════════════════════════════")
-    print("  ETC Tracker — Génération quotidienne ")
-    print("═══════════════════════════════════════")
-
-    # 6-a. Données de marché
-    print("\n📡 Récupération des données CoinGecko…")
-    etc_data = fetch_etc_data()
+def report_market(etc_data: dict) -> None:
+    run_report.set_meta(price_usd=etc_data["price_usd"], change_24h=etc_data["change_24h"])
     print(
         f"   Prix : {etc_data['price_usd']:.4f} USD  |  "
         f"Variation 24h : {etc_data['change_24h']:+.2f}%"
     )
 
-    # 6-b. Analyse
-    api_key = os.environ.get("ANTHROPIC_API_KEY", "").strip()
-    if api_key:
-        print("\n🤖 Génération de l'analyse IA (Claude)…")
-        try:
-            analysis = generate_ai_analysis(etc_data, api_key)
-            print("   Analyse générée avec succès.")
-        except Exception as exc:
-            print(f"   ⚠️  Erreur API Anthropic ({exc}) — utilisation de l'analyse basique.")
-            analysis = generate_basic_analysis(etc_data)
-    else:
+
+def daily_analysis(etc_data: dict, now: datetime, api_key: str, client=None) -> str:
+    """Indicateurs techniques puis analyse Claude ; analyse basique si la clé
+    est absente ou si l'appel échoue."""
+    with run_report.stage("indicators"):
+        ind = compute_market_indicators(etc_data, now)
+    if ind.get("rsi_14") is not None:
+        print(f"   RSI 14j : {ind['rsi_14']:.1f}  |  Depuis l'ATH : {ind['drawdown']:+.1f}%")
+
+    if not api_key:
         print("\n⚠️  Variable ANTHROPIC_API_KEY absente — analyse basique utilisée.")
-        analysis = generate_basic_analysis(etc_data)
+        run_report.set_meta(analysis="basic")
+        return generate_basic_analysis(etc_data, ind=ind)
 
-    # 6-c. Création de l'article Hugo
+    print("\n🤖 Génération de l'analyse IA (Claude)…")
+    try:
+        with run_report.stage("analysis"):
+            analysis = generate_ai_analysis(etc_data, api_key, ind, client=client)
+        print("   Analyse générée avec succès.")
+        run_report.set_meta(analysis="ai")
+        return analysis
+    except Exception as exc:
+        print(f"   ⚠️  Erreur API Anthropic ({exc}) — utilisation de l'analyse basique.")
+        run_report.set_meta(analysis="basic", analysis_error=str(exc))
+        return generate_basic_analysis(etc_data, ind=ind)
+
+
+def write_daily_article(etc_data: dict, analysis: str, now: datetime, doc: dict = None) -> dict:
+    """Écrit l'article Hugo, l'historique et les séries du graphique.
+    Retourne le document de l'article (réutilisé pour Beehiiv)."""
     print("\n📝 Création de l'article Hugo…")
-    create_hugo_article(etc_data, analysis)
-
-    # 6-d. Publication Beehiiv (optionnelle)
+    with run_report.stage("render"):
+        doc = doc or build_document(etc_data, analysis, now, ETC_ASSET)
+        create_hugo_article(etc_data, analysis, now, doc=doc)
+
+    # Historique des cours (source de vérité du graphique)
+    with run_report.stage("write"):
+        price_history.append_day(now, etc_data)
+        print(f"   Historique mis à jour : {price_history.HISTORY_PATH}")
+        print(f"   Séries du graphique : {chart_data.write_chart_data()}")
+    return doc
+
+
+def compact_archive(now: datetime) -> dict:
+    """Regroupe les articles des mois clos en synthèses mensuelles (voir
+    monthly_digest.py)."""
+    with run_report.stage("digest"):
+        stats = monthly_digest.compact(now.date())
+    if stats["months"]:
+        print(f"\n🗜️  Synthèses mensuelles : {', '.join(stats['months'])} "
+              f"({stats['days']} article(s) archivé(s))")
+        run_report.count("digest.days", stats["days"])
+    return stats
+
+
+def publish_daily(etc_data: dict, analysis: str, doc: dict) -> None:
+    """Publie l'article sur Beehiiv si les variables sont définies. Un échec
+    de livraison reste en file (reporté au prochain run) sans interrompre
+    celui-ci."""
     beehiiv_key = os.environ.get("BEEHIIV_API_KEY", "").strip()
     beehiiv_pub = os.environ.get("BEEHIIV_PUBLICATION_ID", "").strip()
-    if beehiiv_key and beehiiv_pub:
-        print("\n🐝 Publication sur Beehiiv…")
-        try:
-            publish_to_beehiiv(etc_data, analysis, beehiiv_key, beehiiv_pub)
-        except Exception as exc:
-            print(f"   ⚠️  Erreur Beehiiv ({exc}) — publication ignorée.")
-    else:
+    if not (beehiiv_key and beehiiv_pub):
         print("\n⚠️  Variables Beehiiv absentes — publication Beehiiv ignorée.")
+        return
+
+    print("\n🐝 Publication sur Beehiiv…")
+    try:
+        with run_report.stage("publish"):
+            stats = publish_to_beehiiv(etc_data, analysis, beehiiv_key, beehiiv_pub, doc=doc)
+        run_report.set_meta(beehiiv=stats)
+    except Exception as exc:
+        print(f"   ⚠️  Erreur Beehiiv ({exc}) — publication ignorée.")
+        run_report.set_meta(publish_error=str(exc))
+
 
-    print("\nTerminé ✓")
+# ──────────────────────────────────────────────
+# 7. Point d'entrée
+# ──────────────────────────────────────────────
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="ETC Tracker — génération d'articles")
+    parser.add_argument("--backfill", nargs=2, metavar=("DEBUT", "FIN"), type=date.fromisoformat,
+                        help="reconstruit les articles manquants entre deux dates (YYYY-MM-DD)")
+    parser.add_argument("--assets", metavar="IDS",
+                        help="mode multi-actifs : identifiants CoinGecko séparés par des virgules, ou 'all'")
+    parser.add_argument("--force", action="store_true",
+                        help="avec --backfill : régénère aussi les articles existants")
+    parser.add_argument("--ai", action="store_true",
+                        help="avec --backfill : analyses Claude via l'API asynchrone Message Batches")
+    parser.add_argument("--profile", choices=run_report.PROFILE_MODES,
+                        help="joint au rapport d'exécution un profil cProfile (cpu), "
+                             "tracemalloc (memory) ou les deux (all)")
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    args = parse_args()
+    script = "backfill" if args.backfill else "multi_asset" if args.assets else "generate_article"
+
+    with run_report.run(script, args.profile):
+        if args.backfill:
+            print("═══════════════════════════════════════")
+            print("  ETC Tracker — Reconstruction archive ")
+            print("═══════════════════════════════════════")
+            from backfill import run_backfill
+            api_key = os.environ.get("ANTHROPIC_API_KEY", "").strip() if args.ai else ""
+            run_backfill(*args.backfill, force=args.force, api_key=api_key)
+            print("\nTerminé ✓")
+            return
+
+        if args.assets:
+            print("═══════════════════════════════════════")
+            print("  ETC Tracker — Génération multi-actifs")
+            print("═══════════════════════════════════════")
+            from multi_asset import ASSETS, run_multi_asset
+            ids = list(ASSETS) if args.assets == "all" else [i.strip() for i in args.assets.split(",") if i.strip()]
+            run_multi_asset(ids, os.environ.get("ANTHROPIC_API_KEY", "").strip())
+            print(f"\n{get_cache().summary()}")
+            print("\nTerminé ✓")
+            return
+
+        print("═══════════════════════════════════════")
+        print("  ETC Tracker — Génération quotidienne ")
+        print("═══════════════════════════════════════")
+
+        # 6-a. Données de marché
+        print("\n📡 Récupération des données de marché…")
+        with run_report.stage("fetch"):
+            etc_data = fetch_etc_data()
+        report_market(etc_data)
+
+        # 6-b. Indicateurs techniques puis analyse
+        now = datetime.now()
+        analysis = daily_analysis(etc_data, now, os.environ.get("ANTHROPIC_API_KEY", "").strip())
+
+        # 6-c. Article Hugo et historique des cours
+        doc = write_daily_article(etc_data, analysis, now)
+
+        # 6-d. Synthèses mensuelles des mois clos
+        compact_archive(now)
+
+        # 6-e. Publication Beehiiv (optionnelle)
+        publish_daily(etc_data, analysis, doc)
+
+        print(f"\n{get_cache().summary()}")
+        print("\nTerminé ✓")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Client HTTP partagé
+=================================
+Point d'accès unique aux API externes (CoinGecko, CryptoCompare, Kraken,
+NewsAPI, Beehiiv) :
+
+  - une session `requests` par service, avec pool de connexions (keep-alive) ;
+  - nouvelle tentative avec backoff exponentiel et gigue, qui respecte
+    l'en-tête `Retry-After` (plafonné pour ne jamais bloquer le job) ;
+  - requêtes conditionnelles ETag / If-Modified-Since (réponse 304 → réponse
+    précédente réutilisée) ;
+  - budget de débit par service (seau à jetons) ;
+  - URL de base par service surchargeable par variable d'environnement
+    (COINGECKO_BASE_URL, CRYPTOCOMPARE_BASE_URL, KRAKEN_BASE_URL,
+    NEWSAPI_BASE_URL, BEEHIIV_BASE_URL), par exemple
+    vers les services factices de fake_services.py.
+"""
+
+import os
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import run_report
+
+
+# Budget de débit par service : jetons par seconde et rafale maximale
+ENDPOINTS = {
+    "coingecko":     {"rate": 0.5, "burst": 5},   # API publique : ~30 appels/min
+    "cryptocompare": {"rate": 1.0, "burst": 5},
+    "kraken":        {"rate": 1.0, "burst": 5},
+    "newsapi":       {"rate": 1.0, "burst": 5},
+    "beehiiv":       {"rate": 2.0, "burst": 5},
+    "default":       {"rate": 5.0, "burst": 10},
+}
+
+# URL de base par service (surchargeable : <SERVICE>_BASE_URL)
+BASE_URLS = {
+    "coingecko":     "https://api.coingecko.com/api/v3",
+    "cryptocompare": "https://min-api.cryptocompare.com",
+    "kraken":        "https://api.kraken.com",
+    "newsapi":       "https://newsapi.org/v2",
+    "beehiiv":       "https://api.beehiiv.com/v2",
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_ATTEMPTS   = 4
+BASE_DELAY     = 1.0    # s — délai du premier nouvel essai (avant gigue)
+MAX_DELAY      = 30.0   # s — plafond d'attente, y compris pour Retry-After
+POOL_SIZE      = 32
+
+
+# ──────────────────────────────────────────────
+# 1. Budget de débit (seau à jetons)
+# ──────────────────────────────────────────────
+
+class RateBudget:
+    """Seau à jetons : `rate` requêtes/s en régime permanent, `burst` d'avance."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate    = rate
+        self.burst   = burst
+        self.tokens  = float(burst)
+        self.updated = time.monotonic()
+        self._lock   = threading.Lock()
+
+    def acquire(self) -> float:
+        """Consomme un jeton, en attendant si nécessaire. Retourne l'attente (s)."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens  = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+# ──────────────────────────────────────────────
+# 2. Sessions et état partagé
+# ──────────────────────────────────────────────
+
+_sessions   = {}
+_budgets    = {}
+_validators = {}   # clé de requête → (etag, last_modified, réponse)
+_lock       = threading.Lock()
+
+
+def url(endpoint: str, path: str) -> str:
+    """URL complète de `path` sur le service (ex. url("newsapi", "/everything"))."""
+    base = os.environ.get(f"{endpoint.upper()}_BASE_URL") or BASE_URLS[endpoint]
+    return base.rstrip("/") + path
+
+
+def get_session(endpoint: str = "default") -> requests.Session:
+    """Retourne la session (keep-alive, pool de connexions) du service."""
+    with _lock:
+        session = _sessions.get(endpoint)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[endpoint] = session
+        return session
+
+
+def _budget(endpoint: str) -> RateBudget:
+    with _lock:
+        budget = _budgets.get(endpoint)
+        if budget is None:
+            config = ENDPOINTS.get(endpoint, ENDPOINTS["default"])
+            budget = _budgets[endpoint] = RateBudget(config["rate"], config["burst"])
+        return budget
+
+
+def close() -> None:
+    """Ferme toutes les sessions ouvertes."""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+# ──────────────────────────────────────────────
+# 3. Nouvelles tentatives
+# ──────────────────────────────────────────────
+
+def _retry_after(resp: requests.Response):
+    """Délai demandé par l'en-tête Retry-After (secondes ou date HTTP), ou None."""
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, resp: requests.Response = None,
+                  base: float = BASE_DELAY, cap: float = MAX_DELAY) -> float:
+    """Délai avant le nouvel essai n° `attempt` (0 = premier) : Retry-After si
+    présent, sinon backoff exponentiel à gigue complète. Toujours ≤ `cap`."""
+    if resp is not None:
+        requested = _retry_after(resp)
+        if requested is not None:
+            return min(cap, requested)
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+# ──────────────────────────────────────────────
+# 4. Requêtes
+# ──────────────────────────────────────────────
+
+def _request_key(method: str, url: str, params) -> tuple:
+    return (method, url, tuple(sorted((params or {}).items())))
+
+
+def request(method: str, url: str, endpoint: str = "default", conditional: bool = False,
+            max_attempts: int = MAX_ATTEMPTS, **kwargs) -> requests.Response:
+    """Envoie une requête via la session du service, avec budget de débit et
+    nouvelles tentatives. Retourne la dernière réponse obtenue (l'appelant
+    décide de `raise_for_status`).
+
+    Les méthodes non idempotentes (POST…) ne sont réessayées que sur 429 et
+    sur échec de connexion, pour ne jamais rejouer une requête déjà traitée.
+    `conditional=True` (GET uniquement) envoie If-None-Match/If-Modified-Since
+    et renvoie la réponse précédente en cas de 304.
+    """
+    method     = method.upper()
+    idempotent = method in ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
+    retry_on   = RETRY_STATUSES if idempotent else {429}
+    session    = get_session(endpoint)
+    budget     = _budget(endpoint)
+
+    key = _request_key(method, url, kwargs.get("params")) if conditional and method == "GET" else None
+    cached = None       # (etag, last_modified, réponse) envoyés avec cette requête
+    if key is not None:
+        with _lock:
+            cached = _validators.get(key)
+    if cached is not None:
+        etag, last_modified, _ = cached
+        headers = dict(kwargs.get("headers") or {})
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        kwargs["headers"] = headers
+
+    for attempt in range(max_attempts):
+        budget.acquire()
+        run_report.count(f"http.{endpoint}.requests")
+        if attempt:
+            run_report.count(f"http.{endpoint}.retries")
+        try:
+            resp = session.request(method, url, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as exc:
+            run_report.count(f"http.{endpoint}.errors")
+            retryable = idempotent or isinstance(exc, requests.exceptions.ConnectTimeout)
+            if not retryable or attempt == max_attempts - 1:
+                raise
+            delay = backoff_delay(attempt)
+            print(f"⚠️  {endpoint} : {exc.__class__.__name__} — nouvel essai dans {delay:.1f}s…")
+            time.sleep(delay)
+            continue
+
+        if resp.status_code == 304 and cached is not None:
+            run_report.count(f"http.{endpoint}.not_modified")
+            return cached[2]
+
+        if resp.status_code in retry_on and attempt < max_attempts - 1:
+            delay = backoff_delay(attempt, resp)
+            print(f"⏳ {endpoint} : HTTP {resp.status_code} — nouvel essai dans {delay:.1f}s…")
+            time.sleep(delay)
+            continue
+
+        if key is not None and resp.ok:
+            etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+            if etag or last_modified:
+                with _lock:
+                    _validators[key] = (etag, last_modified, resp)
+        return resp
+
+
+def get(url: str, endpoint: str = "default", **kwargs) -> requests.Response:
+    return request("GET", url, endpoint=endpoint, **kwargs)
+
+
+def post(url: str, endpoint: str = "default", **kwargs) -> requests.Response:
+    return request("POST", url, endpoint=endpoint, **kwargs)
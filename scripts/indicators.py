@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Indicateurs techniques (NumPy)
+============================================
+Calcule en une passe vectorisée, sur toute la série de cours quotidiens :
+moyennes mobiles simples et exponentielles, RSI (Wilder), volatilité
+annualisée, baisse depuis le plus haut historique et z-score glissant.
+
+`IndicatorState` reprend l'état final d'un calcul complet et le met à jour
+en O(fenêtre) quand un jour est ajouté, sans recalculer la série.
+"""
+
+from collections import deque
+
+import numpy as np
+
+
+SMA_WINDOWS = (7, 30)
+EMA_SPANS   = (12, 26)
+RSI_PERIOD  = 14
+VOL_WINDOW  = 30
+Z_WINDOW    = 30
+
+# Taille des blocs du calcul vectorisé des moyennes exponentielles : borne
+# les puissances (1 - α)^k pour rester loin du dépassement flottant.
+_EMA_BLOCK = 256
+
+
+# ──────────────────────────────────────────────
+# 1. Primitives vectorisées
+# ──────────────────────────────────────────────
+
+def _rolling_mean_std(x: np.ndarray, window: int) -> tuple:
+    """Moyenne et écart-type glissants (NaN tant que la fenêtre est incomplète)."""
+    mean = np.full(x.shape, np.nan)
+    std  = np.full(x.shape, np.nan)
+    if len(x) < window:
+        return mean, std
+
+    csum  = np.concatenate(([0.0], np.cumsum(x)))
+    csum2 = np.concatenate(([0.0], np.cumsum(x * x)))
+    s1 = csum[window:] - csum[:-window]
+    s2 = csum2[window:] - csum2[:-window]
+    mean[window - 1:] = s1 / window
+    var = np.maximum(s2 / window - (s1 / window) ** 2, 0.0)
+    std[window - 1:] = np.sqrt(var * window / max(window - 1, 1))
+    return mean, std
+
+
+def _ema(x: np.ndarray, alpha: float, seed: float = None) -> np.ndarray:
+    """Moyenne exponentielle y[t] = α·x[t] + (1-α)·y[t-1], calculée par blocs
+    sous forme fermée (aucune boucle Python par élément)."""
+    out = np.empty(len(x))
+    if not len(x):
+        return out
+
+    decay = 1.0 - alpha
+    prev  = x[0] if seed is None else seed
+    start = 1 if seed is None else 0
+    out[0] = prev
+
+    powers = decay ** np.arange(1, _EMA_BLOCK + 1)
+    for lo in range(start, len(x), _EMA_BLOCK):
+        block = x[lo:lo + _EMA_BLOCK]
+        n = len(block)
+        p = powers[:n]
+        # y[k] = decay^(k+1)·prev + α·Σ_{j≤k} decay^(k-j)·x[j]
+        out[lo:lo + n] = p * prev + alpha * p * np.cumsum(block / p)
+        prev = out[lo + n - 1]
+    return out
+
+
+# ──────────────────────────────────────────────
+# 2. Calcul complet
+# ──────────────────────────────────────────────
+
+def compute_indicators(prices, ath_usd: float = 0.0) -> dict:
+    """Calcule tous les indicateurs sur la série `prices` (du plus ancien au
+    plus récent). Retourne un dict de tableaux NumPy de même longueur.
+
+    `ath_usd` permet de tenir compte d'un plus haut antérieur à la série.
+    """
+    p = np.asarray(prices, dtype=float)
+    ind = {"price": p}
+
+    for window in SMA_WINDOWS:
+        ind[f"sma_{window}"] = _rolling_mean_std(p, window)[0]
+    for span in EMA_SPANS:
+        ind[f"ema_{span}"] = _ema(p, 2.0 / (span + 1))
+
+    # RSI de Wilder : moyennes exponentielles (α = 1/n) des hausses et baisses
+    delta  = np.diff(p, prepend=p[:1])
+    gains  = _ema(np.clip(delta, 0, None), 1.0 / RSI_PERIOD)
+    losses = _ema(np.clip(-delta, 0, None), 1.0 / RSI_PERIOD)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(losses > 0, 100 - 100 / (1 + gains / losses), 100.0)
+    rsi[:RSI_PERIOD] = np.nan
+    ind[f"rsi_{RSI_PERIOD}"] = rsi
+
+    # Volatilité annualisée des rendements logarithmiques quotidiens
+    log_ret = np.diff(np.log(p), prepend=np.nan) if len(p) else p
+    vol = np.full(p.shape, np.nan)
+    if len(p) > VOL_WINDOW:
+        vol[1:] = _rolling_mean_std(log_ret[1:], VOL_WINDOW)[1] * np.sqrt(365) * 100
+    ind[f"volatility_{VOL_WINDOW}"] = vol
+
+    running_max = np.maximum.accumulate(np.maximum(p, ath_usd)) if len(p) else p
+    ind["drawdown"] = (p / running_max - 1) * 100
+
+    mean, std = _rolling_mean_std(p, Z_WINDOW)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ind[f"zscore_{Z_WINDOW}"] = np.where(std > 0, (p - mean) / std, 0.0)
+
+    return ind
+
+
+def latest(ind: dict) -> dict:
+    """Dernière valeur de chaque indicateur (None si indisponible)."""
+    values = {}
+    for name, series in ind.items():
+        value = float(series[-1]) if len(series) else float("nan")
+        values[name] = None if np.isnan(value) else value
+    return values
+
+
+# ──────────────────────────────────────────────
+# 3. Mise à jour incrémentale
+# ──────────────────────────────────────────────
+
+class IndicatorState:
+    """État minimal permettant d'ajouter un jour sans recalculer la série."""
+
+    def __init__(self, prices, ath_usd: float = 0.0):
+        p = np.asarray(prices, dtype=float)
+        ind = compute_indicators(p, ath_usd)
+        keep = max(max(SMA_WINDOWS), VOL_WINDOW + 1, Z_WINDOW)
+
+        self.tail     = deque(p[-keep:].tolist(), maxlen=keep)
+        self.count    = len(p)
+        self.ema      = {span: float(ind[f"ema_{span}"][-1]) for span in EMA_SPANS} if len(p) else {}
+        self.peak     = float(np.max(np.maximum(p, ath_usd))) if len(p) else ath_usd
+        delta         = np.diff(p, prepend=p[:1])
+        self.avg_gain = float(_ema(np.clip(delta, 0, None), 1.0 / RSI_PERIOD)[-1]) if len(p) else 0.0
+        self.avg_loss = float(_ema(np.clip(-delta, 0, None), 1.0 / RSI_PERIOD)[-1]) if len(p) else 0.0
+        self.values   = latest(ind) if len(p) else {}
+
+    def update(self, price: float) -> dict:
+        """Ajoute le cours du jour et retourne les dernières valeurs des indicateurs."""
+        price = float(price)
+        prev  = self.tail[-1] if self.tail else price
+        self.tail.append(price)
+        self.count += 1
+        tail = np.asarray(self.tail)
+
+        values = {"price": price}
+        for window in SMA_WINDOWS:
+            values[f"sma_{window}"] = float(tail[-window:].mean()) if len(tail) >= window else None
+        for span in EMA_SPANS:
+            alpha = 2.0 / (span + 1)
+            self.ema[span] = alpha * price + (1 - alpha) * self.ema.get(span, price)
+            values[f"ema_{span}"] = self.ema[span]
+
+        alpha = 1.0 / RSI_PERIOD
+        self.avg_gain = alpha * max(price - prev, 0.0) + (1 - alpha) * self.avg_gain
+        self.avg_loss = alpha * max(prev - price, 0.0) + (1 - alpha) * self.avg_loss
+        rsi = 100 - 100 / (1 + self.avg_gain / self.avg_loss) if self.avg_loss > 0 else 100.0
+        values[f"rsi_{RSI_PERIOD}"] = rsi if self.count > RSI_PERIOD else None
+
+        if len(tail) > VOL_WINDOW:
+            log_ret = np.diff(np.log(tail[-(VOL_WINDOW + 1):]))
+            values[f"volatility_{VOL_WINDOW}"] = float(log_ret.std(ddof=1) * np.sqrt(365) * 100)
+        else:
+            values[f"volatility_{VOL_WINDOW}"] = None
+
+        self.peak = max(self.peak, price)
+        values["drawdown"] = (price / self.peak - 1) * 100
+
+        if len(tail) >= Z_WINDOW:
+            window = tail[-Z_WINDOW:]
+            std = window.std(ddof=1)
+            values[f"zscore_{Z_WINDOW}"] = float((price - window.mean()) / std) if std > 0 else 0.0
+        else:
+            values[f"zscore_{Z_WINDOW}"] = None
+
+        self.values = values
+        return values
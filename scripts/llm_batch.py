@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Appels Claude groupés
+===================================
+Deux façons de traiter N éléments sans N allers-retours synchrones :
+
+  - `structured_batch` : une seule requête qui traite tous les éléments et
+    répond par un objet JSON indexé par identifiant ;
+  - `run_message_batch` : l'API asynchrone Message Batches d'Anthropic
+    (moitié prix, résultats en différé), adaptée aux reconstructions d'archive.
+
+Dans les deux cas, chaque résultat est aussi enregistré dans le cache LLM
+sous la clé de la requête individuelle équivalente, pour que les exécutions
+suivantes (groupées ou non) le retrouvent.
+"""
+
+import json
+import time
+
+import run_report
+from llm_cache import LLMCache, cached_completion, get_cache
+
+
+BATCH_POLL_INTERVAL = 30      # s entre deux consultations de l'état du lot
+BATCH_MAX_WAIT      = 3600    # s avant abandon (les lots aboutissent en général en < 1 h)
+
+
+def extract_json_object(text: str) -> dict:
+    """Extrait le premier objet JSON d'une réponse (tolère un bloc ```json … ```).
+    Retourne {clé: texte} pour les valeurs textuelles, ou {} si illisible."""
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end < start:
+        return {}
+    try:
+        parsed = json.loads(text[start:end + 1])
+    except ValueError:
+        return {}
+    if not isinstance(parsed, dict):
+        return {}
+    return {str(key): value.strip() for key, value in parsed.items()
+            if isinstance(value, str) and value.strip()}
+
+
+def _split_cached(items: dict, model: str, max_tokens: int, cache: LLMCache) -> tuple:
+    """Sépare les éléments {id: prompt individuel} déjà en cache des autres."""
+    done, todo = {}, {}
+    for item_id, prompt in items.items():
+        text = cache.get(cache.key(model, prompt, max_tokens=max_tokens))
+        if text is not None:
+            done[item_id] = text
+        else:
+            todo[item_id] = prompt
+    return done, todo
+
+
+# ──────────────────────────────────────────────
+# 1. Requête unique à sortie JSON
+# ──────────────────────────────────────────────
+
+def structured_batch(client, model: str, instructions: str, items: dict, entries: dict,
+                     item_max_tokens: int, per_item_tokens: int, cache: LLMCache = None,
+                     **kwargs) -> dict:
+    """Traite tous les éléments en une requête à sortie JSON.
+
+    `items`   : {id: prompt individuel équivalent} (clés de cache)
+    `entries` : {id: texte de l'élément inséré dans la requête groupée}
+
+    Retourne {id: texte} pour les éléments obtenus (cache ou réponse) ; les
+    éléments absents de la réponse sont à traiter individuellement par
+    l'appelant.
+    """
+    cache = cache or get_cache()
+    done, todo = _split_cached(items, model, item_max_tokens, cache)
+    if not todo:
+        return done
+
+    prompt = (
+        f"{instructions}\n\n"
+        "Réponds uniquement par un objet JSON dont les clés sont les identifiants "
+        "entre crochets et les valeurs les textes demandés.\n\n"
+        + "\n\n".join(f"[{item_id}]\n{entries[item_id]}" for item_id in todo)
+    )
+    max_tokens = min(16_000, 200 + per_item_tokens * len(todo))
+    parsed = extract_json_object(cached_completion(client, model, prompt, max_tokens,
+                                                   cache=cache, **kwargs))
+
+    for item_id, text in parsed.items():
+        if item_id in todo:
+            cache.put(cache.key(model, todo[item_id], max_tokens=item_max_tokens), text, model)
+            done[item_id] = text
+    return done
+
+
+# ──────────────────────────────────────────────
+# 2. API asynchrone Message Batches
+# ──────────────────────────────────────────────
+
+def run_message_batch(client, model: str, items: dict, max_tokens: int,
+                      cache: LLMCache = None, poll_interval: float = BATCH_POLL_INTERVAL,
+                      max_wait: float = BATCH_MAX_WAIT) -> dict:
+    """Soumet {id: prompt} à l'API Message Batches, attend la fin du lot et
+    retourne {id: texte} pour les requêtes réussies (cache compris)."""
+    cache = cache or get_cache()
+    done, todo = _split_cached(items, model, max_tokens, cache)
+    if not todo:
+        return done
+
+    batch = client.messages.batches.create(requests=[
+        {
+            "custom_id": item_id,
+            "params": {
+                "model":      model,
+                "max_tokens": max_tokens,
+                "messages":   [{"role": "user", "content": prompt}],
+            },
+        }
+        for item_id, prompt in todo.items()
+    ])
+    print(f"   Lot {batch.id} soumis ({len(todo)} requête(s))…")
+    run_report.count("llm.batch_requests", len(todo))
+
+    deadline = time.monotonic() + max_wait
+    while batch.processing_status != "ended":
+        if time.monotonic() > deadline:
+            print(f"   ⚠️  Lot {batch.id} non terminé après {max_wait:.0f}s — abandon.")
+            client.messages.batches.cancel(batch.id)
+            return done
+        time.sleep(poll_interval)
+        batch = client.messages.batches.retrieve(batch.id)
+
+    for result in client.messages.batches.results(batch.id):
+        if result.result.type != "succeeded" or result.custom_id not in todo:
+            continue
+        run_report.record_usage(getattr(result.result.message, "usage", None), prefix="llm.batch")
+        text = result.result.message.content[0].text.strip()
+        cache.put(cache.key(model, todo[result.custom_id], max_tokens=max_tokens), text, model)
+        done[result.custom_id] = text
+    return done
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Cache disque des réponses Claude
+==============================================
+Cache adressé par contenu : la clé est l'empreinte SHA-256 du modèle, des
+paramètres et du prompt. Chaque entrée est un petit fichier JSON ; les
+entrées expirent après un TTL et les moins récemment utilisées sont
+supprimées dès que le cache dépasse sa taille maximale.
+
+Variables d'environnement (optionnelles) :
+  LLM_CACHE_DIR        Répertoire du cache (défaut : .cache/llm)
+  LLM_CACHE_TTL        Durée de vie d'une entrée en secondes (défaut : 7 jours)
+  LLM_CACHE_MAX_BYTES  Taille maximale du cache en octets (défaut : 50 Mo)
+  LLM_CACHE_DISABLED   "1" pour désactiver le cache
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Optional
+
+import run_report
+
+
+CACHE_DIR       = os.environ.get("LLM_CACHE_DIR", os.path.join(".cache", "llm"))
+CACHE_TTL       = int(os.environ.get("LLM_CACHE_TTL", 7 * 24 * 3600))
+CACHE_MAX_BYTES = int(os.environ.get("LLM_CACHE_MAX_BYTES", 50 * 1024 * 1024))
+
+
+class LLMCache:
+    """Cache disque des complétions, avec TTL et éviction LRU bornée en taille.
+
+    Le « dernier accès » d'une entrée est sa date de modification, rafraîchie
+    à chaque lecture réussie. Sûr entre threads d'un même processus.
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, ttl: int = CACHE_TTL,
+                 max_bytes: int = CACHE_MAX_BYTES, enabled: bool = True):
+        self.directory = directory
+        self.ttl       = ttl
+        self.max_bytes = max_bytes
+        self.enabled   = enabled
+        self.hits      = 0
+        self.misses    = 0
+        self.evictions = 0
+        self._lock     = threading.Lock()
+        self._size     = None   # taille totale, calculée au premier besoin
+
+    # ── Clés ──
+
+    @staticmethod
+    def key(model: str, prompt: str, **params) -> str:
+        """Empreinte du modèle, des paramètres d'appel et du prompt."""
+        payload = json.dumps({"model": model, "prompt": prompt, "params": params},
+                             sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    # ── Lecture / écriture ──
+
+    def get(self, key: str) -> Optional[str]:
+        """Retourne le texte en cache pour `key`, ou None (absent ou expiré)."""
+        if not self.enabled:
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as fh:
+                entry = json.load(fh)
+        except (OSError, ValueError):
+            self._count("misses")
+            return None
+
+        if time.time() - entry.get("created_at", 0) > self.ttl:
+            self._remove(path)
+            self._count("misses")
+            return None
+
+        try:
+            os.utime(path)   # rafraîchit l'ordre LRU
+        except OSError:
+            pass
+        self._count("hits")
+        return entry.get("text")
+
+    def put(self, key: str, text: str, model: str = "") -> None:
+        """Enregistre `text` sous `key` puis applique l'éviction si nécessaire."""
+        if not self.enabled or not text:
+            return
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = json.dumps({"created_at": time.time(), "model": model, "text": text},
+                          ensure_ascii=False).encode("utf-8")
+
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            fh.write(data)
+        previous = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._size is not None:
+                self._size += len(data) - previous
+        self.evict()
+
+    # ── Éviction ──
+
+    def _entries(self) -> list:
+        """Liste (dernier accès, taille, chemin) de toutes les entrées."""
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self) -> int:
+        """Supprime les entrées expirées puis les moins récemment utilisées
+        jusqu'à repasser sous `max_bytes`. Retourne le nombre d'entrées supprimées."""
+        with self._lock:
+            if self._size is not None and self._size <= self.max_bytes:
+                return 0
+
+            entries = sorted(self._entries())
+            total   = sum(size for _, size, _ in entries)
+            cutoff  = time.time() - self.ttl
+            removed = 0
+
+            for mtime, size, path in entries:
+                if total <= self.max_bytes and mtime >= cutoff:
+                    break
+                self._remove(path)
+                total   -= size
+                removed += 1
+
+            self._size = total
+            self.evictions += removed
+            return removed
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    # ── Compteurs ──
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def summary(self) -> str:
+        """Ligne de résumé affichée en fin d'exécution."""
+        if not self.enabled:
+            return "💾 Cache LLM désactivé"
+        return (f"💾 Cache LLM : {self.hits} hit(s), {self.misses} miss(es), "
+                f"{self.evictions} éviction(s)")
+
+
+_default_cache = None
+
+
+def get_cache() -> LLMCache:
+    """Retourne le cache partagé du processus (créé au premier appel)."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = LLMCache(enabled=os.environ.get("LLM_CACHE_DISABLED") != "1")
+    return _default_cache
+
+
+def cached_completion(client, model: str, prompt: str, max_tokens: int,
+                      cache: LLMCache = None, cache_key: str = None, route: str = None,
+                      **kwargs) -> str:
+    """Appelle `client.messages.create` sauf si la réponse est déjà en cache.
+
+    `cache_key` permet de fournir une clé normalisée (par ex. un instantané
+    de marché arrondi) à la place de l'empreinte du prompt exact. L'appel
+    envoyé est consigné (latence, jetons) sous `route`, à défaut le modèle.
+    """
+    cache = cache or get_cache()
+    key   = cache_key or cache.key(model, prompt, max_tokens=max_tokens)
+
+    text = cache.get(key)
+    if text is not None:
+        run_report.count("llm.cache_hits")
+        return text
+
+    start   = time.perf_counter()
+    message = client.messages.create(
+        model=model,
+        max_tokens=max_tokens,
+        messages=[{"role": "user", "content": prompt}],
+        **kwargs,
+    )
+    run_report.count("llm.calls")
+    run_report.record_usage(getattr(message, "usage", None))
+    run_report.record_call(route or model, model, time.perf_counter() - start,
+                           getattr(message, "usage", None), max_tokens,
+                           getattr(message, "stop_reason", None))
+    text = message.content[0].text.strip()
+    cache.put(key, text, model)
+    return text
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Routage des appels Claude
+=======================================
+Choisit pour chaque élément le modèle, le budget de sortie et la taille du
+prompt, au lieu d'un appel identique pour tous :
+
+  - analyse de marché : une séance ordinaire reçoit un prompt compact
+    (données essentielles, commentaire de 100–130 mots) ; un mouvement
+    inhabituel (forte variation, RSI extrême, z-score élevé, cours proche
+    de l'ATH) reçoit le prompt complet ;
+  - reformulation : un article court est résumé en 1-2 phrases à partir
+    d'une description tronquée ; un article long (description étendue ou
+    texte source annoncé long par NewsAPI) garde le traitement complet.
+
+Les routes (`ROUTES`) regroupent les réglages de chaque traitement. Chaque
+appel effectivement envoyé est consigné dans le rapport d'exécution avec sa
+route, sa latence et ses jetons (run_report.record_call), ce qui permet
+d'ajuster seuils et budgets :
+
+  python scripts/run_report.py routes [JOURS]
+
+Variable d'environnement (optionnelle) :
+  LLM_ROUTING   "0" pour envoyer tous les éléments sur la route complète
+"""
+
+import os
+import re
+
+import run_report
+from llm_cache import cached_completion
+
+
+ROUTING_ENABLED = os.environ.get("LLM_ROUTING", "1") != "0"
+
+FAST_MODEL = "claude-haiku-4-5-20251001"
+
+# model / max_tokens : appel individuel ; item_tokens : budget par élément
+# d'une requête groupée ; input_chars : longueur maximale de la description
+# transmise ; length : longueur de réponse demandée dans le prompt
+ROUTES = {
+    "analysis.compact":      {"model": FAST_MODEL, "max_tokens": 300, "length": "100–130 mots"},
+    "analysis.full":         {"model": FAST_MODEL, "max_tokens": 450, "length": "150–200 mots"},
+    "reformulation.compact": {"model": FAST_MODEL, "max_tokens": 160, "item_tokens": 150,
+                              "input_chars": 240,  "length": "1-2 phrases"},
+    "reformulation.full":    {"model": FAST_MODEL, "max_tokens": 300, "item_tokens": 250,
+                              "input_chars": 1000, "length": "2-3 phrases"},
+}
+
+# Analyse : seuils au-delà desquels la séance est jugée inhabituelle
+UNUSUAL_CHANGES = {"change_24h": 5.0, "change_7d": 15.0, "change_30d": 30.0}   # |%|
+RSI_BOUNDS      = (30, 70)
+ZSCORE_LIMIT    = 2.0
+ATH_PROXIMITY   = 0.9      # cours ≥ 90 % de l'ATH
+
+# Indicateurs conservés dans le prompt compact
+COMPACT_INDICATORS = ("sma_30", "rsi_14")
+
+# Reformulation : article long si la description ou le texte source
+# (longueur annoncée par NewsAPI, « … [+1820 chars] ») dépasse ces seuils
+LONG_DESCRIPTION_CHARS = 300
+LONG_STORY_CHARS       = 2000
+
+_REMAINING_CHARS = re.compile(r"\[\+(\d+) chars\]\s*$")
+
+
+# ──────────────────────────────────────────────
+# 1. Politique
+# ──────────────────────────────────────────────
+
+def analysis_signals(etc_data: dict, ind: dict = None) -> list:
+    """Raisons de traiter la séance comme inhabituelle (liste vide sinon)."""
+    ind = ind or {}
+    signals = [f"{field} {etc_data[field]:+.1f}%" for field, limit in UNUSUAL_CHANGES.items()
+               if abs(etc_data.get(field) or 0) >= limit]
+    rsi = ind.get("rsi_14")
+    if rsi is not None and not RSI_BOUNDS[0] <= rsi <= RSI_BOUNDS[1]:
+        signals.append(f"RSI {rsi:.0f}")
+    zscore = ind.get("zscore_30")
+    if zscore is not None and abs(zscore) >= ZSCORE_LIMIT:
+        signals.append(f"z-score {zscore:+.1f}")
+    if etc_data.get("ath_usd") and etc_data["price_usd"] >= ATH_PROXIMITY * etc_data["ath_usd"]:
+        signals.append("proche de l'ATH")
+    return signals
+
+
+def route_analysis(etc_data: dict, ind: dict = None) -> str:
+    """Route de l'analyse de marché d'une séance."""
+    if not ROUTING_ENABLED or analysis_signals(etc_data, ind):
+        return "analysis.full"
+    return "analysis.compact"
+
+
+def story_length(description: str, content: str = "") -> int:
+    """Longueur estimée de l'article source : texte tronqué de NewsAPI plus
+    la longueur restante annoncée, à défaut la description."""
+    match = _REMAINING_CHARS.search(content or "")
+    if match:
+        return match.start() + int(match.group(1))
+    return len(description or "")
+
+
+def route_reformulation(description: str, content: str = "") -> str:
+    """Route de la reformulation d'un article d'actualité."""
+    if (not ROUTING_ENABLED or len(description or "") > LONG_DESCRIPTION_CHARS
+            or story_length(description, content) > LONG_STORY_CHARS):
+        return "reformulation.full"
+    return "reformulation.compact"
+
+
+def trim(text: str, limit: int) -> str:
+    """Tronque `text` à `limit` caractères, sur une fin de mot."""
+    text = " ".join((text or "").split())
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0].rstrip(",;:") + "…"
+
+
+# ──────────────────────────────────────────────
+# 2. Appels
+# ──────────────────────────────────────────────
+
+def routed_completion(client, route: str, prompt: str, cache_key: str = None, **kwargs) -> str:
+    """`cached_completion` avec le modèle et le budget de la route ; l'appel
+    est consigné sous le nom de la route."""
+    settings = ROUTES[route]
+    run_report.count(f"llm.route.{route}")
+    return cached_completion(client, settings["model"], prompt, settings["max_tokens"],
+                             cache_key=cache_key, route=route, **kwargs)
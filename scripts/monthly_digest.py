@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Synthèses mensuelles (compaction de l'archive)
+============================================================
+Regroupe les articles quotidiens des mois clos en une page de synthèse par
+mois (content/posts/etc-AAAA-MM.md) : statistiques du mois, tableau des
+cours quotidiens et résumé court de chaque analyse. Les anciennes URL
+quotidiennes redirigent vers la synthèse (`aliases` Hugo) et les articles
+d'origine sont déplacés dans archive/posts/AAAA-MM/, hors du répertoire de
+contenu Hugo : ni rendus ni déployés, mais conservés pour price_history
+(`rebuild`) et le backfill.
+
+Un mois est compacté lorsqu'il est clos depuis plus de `KEEP_DAYS` jours et
+ne contient aucun des `KEEP_POSTS` derniers articles (ceux de la page
+d'accueil) : le nombre de pages rendues croît avec les mois, non avec les
+jours. Un jour ajouté à un mois déjà compacté (backfill) est fusionné dans
+sa synthèse au passage suivant.
+
+Usage :
+  python scripts/monthly_digest.py                Compacte les mois clos
+  python scripts/monthly_digest.py --dry-run      Affiche les mois à compacter
+  python scripts/monthly_digest.py --rebuild      Régénère toutes les synthèses depuis l'archive
+"""
+
+import os
+import re
+import json
+import argparse
+import calendar
+from datetime import date, timedelta
+
+import price_history
+from post_document import fmt_big
+
+
+POSTS_DIR   = os.path.join("content", "posts")
+ARCHIVE_DIR = os.path.join("archive", "posts")
+SLUG        = "etc"
+
+KEEP_DAYS     = 30       # jours récents toujours publiés en articles individuels
+KEEP_POSTS    = 10       # derniers articles jamais compactés (page d'accueil)
+SUMMARY_CHARS = 280      # longueur visée du résumé d'une analyse
+
+MONTHS_FR = ("janvier", "février", "mars", "avril", "mai", "juin", "juillet",
+             "août", "septembre", "octobre", "novembre", "décembre")
+
+_DAILY         = re.compile(rf"{SLUG}-(\d{{4}}-\d{{2}}-\d{{2}})\.md")
+_FRONT_MATTER  = re.compile(r"\A---\n(.*?)\n---\n?", re.DOTALL)
+_ANALYSIS      = re.compile(r"^## Analyse du jour\n(.*?)(?:^---$|\Z)", re.DOTALL | re.MULTILINE)
+_SENTENCE_END  = re.compile(r"(?<=[.!?…])\s+")
+
+
+# ──────────────────────────────────────────────
+# 1. Articles quotidiens
+# ──────────────────────────────────────────────
+
+def daily_posts(directory: str) -> dict:
+    """{AAAA-MM-JJ: chemin} des articles quotidiens de `directory`."""
+    posts = {}
+    if os.path.isdir(directory):
+        for name in sorted(os.listdir(directory)):
+            match = _DAILY.fullmatch(name)
+            if match:
+                posts[match.group(1)] = os.path.join(directory, name)
+    return posts
+
+
+def archived_days(archive_dir: str = ARCHIVE_DIR) -> dict:
+    """{AAAA-MM-JJ: chemin} de tous les articles archivés."""
+    days = {}
+    if os.path.isdir(archive_dir):
+        for month in sorted(os.listdir(archive_dir)):
+            days.update(daily_posts(os.path.join(archive_dir, month)))
+    return days
+
+
+def archived_path(day: date, archive_dir: str = ARCHIVE_DIR) -> str:
+    """Chemin de l'article archivé du jour `day`."""
+    return os.path.join(archive_dir, day.strftime("%Y-%m"), f"{SLUG}-{day.isoformat()}.md")
+
+
+def summarize_analysis(text: str) -> str:
+    """Premier paragraphe de l'analyse du jour, réduit à ses premières phrases
+    (`SUMMARY_CHARS` caractères environ)."""
+    match = _ANALYSIS.search(text)
+    lines = (match.group(1) if match else "").strip().split("\n\n")
+    paragraph = next((" ".join(p.split()) for p in lines if p.strip() and not p.startswith("#")), "")
+
+    summary = ""
+    for sentence in _SENTENCE_END.split(paragraph):
+        if summary and len(summary) + len(sentence) > SUMMARY_CHARS:
+            break
+        summary = f"{summary} {sentence}".strip()
+    return summary
+
+
+def read_day(day: str, path: str) -> dict:
+    """Valeurs de marché, date de publication et résumé d'un article ({} si
+    son front matter est incomplet)."""
+    etc_data = price_history.parse_post_front_matter(path)
+    if not etc_data:
+        return {}
+    with open(path, encoding="utf-8") as fh:
+        text = fh.read()
+    published = f"{day}T09:00:00+01:00"
+    for line in _FRONT_MATTER.match(text).group(1).splitlines():
+        key, _, value = line.partition(":")
+        if key.strip() == "date" and value.strip():
+            published = value.strip()
+    return dict(etc_data, day=day, published=published, summary=summarize_analysis(text))
+
+
+# ──────────────────────────────────────────────
+# 2. Page de synthèse
+# ──────────────────────────────────────────────
+
+_DIGEST = """\
+---
+title: "{title}"
+date: {published}
+draft: false
+digest: true
+month: "{month}"
+description: "{description}"
+price_open: {open:.4f}
+price_close: {close:.4f}
+change_month: {change:.2f}
+price_high: {high:.4f}
+price_low: {low:.4f}
+days: {count}
+aliases: {aliases}
+---
+
+## {label_cap} en bref
+
+| Indicateur | Valeur |
+|---|---|
+{stats}
+
+## Cours quotidiens
+
+| Date | Prix USD | Prix EUR | 24h | 7 jours | 30 jours | Volume 24h |
+|---|---|---|---|---|---|---|
+{rows}
+
+## Analyses du mois
+
+{summaries}
+
+---
+
+*Synthèse des {count} articles quotidiens de {label}. Données : CoinGecko (API publique) \
+ou sources de secours. Analyses générées automatiquement par Claude AI (Anthropic). \
+Ce site est fourni à titre informatif uniquement — pas de conseil en investissement.*
+"""
+
+
+def _day_label(day: str) -> str:
+    d = date.fromisoformat(day)
+    return f"{d.day}{'er' if d.day == 1 else ''} {MONTHS_FR[d.month - 1]} {d.year}"
+
+
+def render_digest(month: str, days: list) -> str:
+    """Markdown (front matter + corps) de la synthèse du mois `month`
+    (`days` : valeurs de `read_day`, dans l'ordre chronologique)."""
+    year, number = (int(part) for part in month.split("-"))
+    label  = f"{MONTHS_FR[number - 1]} {year}"
+    first, last = days[0], days[-1]
+    high   = max(days, key=lambda d: d["price_usd"])
+    low    = min(days, key=lambda d: d["price_usd"])
+    best   = max(days, key=lambda d: d["change_24h"])
+    worst  = min(days, key=lambda d: d["change_24h"])
+    change = (last["price_usd"] / first["price_usd"] - 1) * 100 if first["price_usd"] else 0.0
+    ups    = sum(1 for d in days if d["change_24h"] >= 0)
+
+    stats = (
+        ("Ouverture",             f"{first['price_usd']:.4f} $ ({_day_label(first['day'])})"),
+        ("Clôture",               f"{last['price_usd']:.4f} $ ({_day_label(last['day'])})"),
+        ("Variation du mois",     f"{change:+.2f}%"),
+        ("Plus haut",             f"{high['price_usd']:.4f} $ ({_day_label(high['day'])})"),
+        ("Plus bas",              f"{low['price_usd']:.4f} $ ({_day_label(low['day'])})"),
+        ("Plus forte hausse 24h", f"{best['change_24h']:+.2f}% ({_day_label(best['day'])})"),
+        ("Plus forte baisse 24h", f"{worst['change_24h']:+.2f}% ({_day_label(worst['day'])})"),
+        ("Séances haussières",    f"{ups} / {len(days)}"),
+        ("Volume 24h moyen",      fmt_big(sum(d["volume_24h_usd"] for d in days) / len(days))),
+        ("Capitalisation",        fmt_big(last["market_cap_usd"])),
+    )
+    rows = (
+        f"| {d['day']} | {d['price_usd']:.4f} $ | {d['price_eur']:.4f} € | {d['change_24h']:+.2f}% "
+        f"| {d['change_7d']:+.2f}% | {d['change_30d']:+.2f}% | {fmt_big(d['volume_24h_usd'])} |"
+        for d in days
+    )
+    summaries = (
+        f"### {_day_label(d['day'])} {'📈' if d['change_24h'] >= 0 else '📉'}\n\n"
+        f"{d['summary'] or 'Analyse non disponible.'}"
+        for d in days
+    )
+
+    return _DIGEST.format(
+        title=f"ETC — synthèse de {label}",
+        published=last["published"],
+        month=month,
+        description=(f"Ethereum Classic en {label} : de {first['price_usd']:.4f} à "
+                     f"{last['price_usd']:.4f} USD ({change:+.2f}%), plus haut "
+                     f"{high['price_usd']:.4f} USD, plus bas {low['price_usd']:.4f} USD"),
+        open=first["price_usd"], close=last["price_usd"], change=change,
+        high=high["price_usd"], low=low["price_usd"], count=len(days),
+        aliases=json.dumps([f"/posts/{SLUG}-{d['day']}/" for d in days]),
+        label=label, label_cap=label.capitalize(),
+        stats="\n".join(f"| **{name}** | {value} |" for name, value in stats),
+        rows="\n".join(rows),
+        summaries="\n\n".join(summaries),
+    )
+
+
+def digest_path(month: str, posts_dir: str = POSTS_DIR) -> str:
+    return os.path.join(posts_dir, f"{SLUG}-{month}.md")
+
+
+# ──────────────────────────────────────────────
+# 3. Compaction
+# ──────────────────────────────────────────────
+
+def closed_months(days: list, today: date, keep_days: int = KEEP_DAYS,
+                  keep_posts: int = KEEP_POSTS) -> list:
+    """Mois (AAAA-MM) des jours `days` à compacter : clos depuis plus de
+    `keep_days` jours et sans aucun des `keep_posts` derniers articles."""
+    cutoff = today - timedelta(days=keep_days)
+    recent = {day[:7] for day in sorted(days)[-keep_posts:]} if keep_posts else set()
+    months = []
+    for month in sorted({day[:7] for day in days} - recent):
+        year, number = (int(part) for part in month.split("-"))
+        if date(year, number, calendar.monthrange(year, number)[1]) < cutoff:
+            months.append(month)
+    return months
+
+
+def compact_month(month: str, posts: dict, posts_dir: str = POSTS_DIR,
+                  archive_dir: str = ARCHIVE_DIR) -> int:
+    """Écrit la synthèse de `month` à partir des jours déjà archivés et des
+    articles `posts` ({jour: chemin}, prioritaires), puis archive ceux qu'elle
+    reprend. Un article illisible (front matter absent ou incomplet) reste
+    dans `posts_dir` : sans alias dans la synthèse, son URL disparaîtrait.
+    Retourne le nombre d'articles archivés."""
+    target = os.path.join(archive_dir, month)
+    days   = dict(daily_posts(target), **posts)
+    values = [v for v in (read_day(day, path) for day, path in sorted(days.items())) if v]
+    if not values:
+        return 0
+
+    path = digest_path(month, posts_dir)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        fh.write(render_digest(month, values))
+    os.replace(tmp_path, path)
+
+    kept = {v["day"] for v in values}
+    os.makedirs(target, exist_ok=True)
+    for day, source in posts.items():
+        if day in kept:
+            os.replace(source, os.path.join(target, os.path.basename(source)))
+    return len(kept & set(posts))
+
+
+def compact(today: date = None, keep_days: int = KEEP_DAYS, keep_posts: int = KEEP_POSTS,
+            dry_run: bool = False, posts_dir: str = POSTS_DIR,
+            archive_dir: str = ARCHIVE_DIR) -> dict:
+    """Compacte les mois clos. Retourne {"months": [AAAA-MM], "days": jours archivés}."""
+    posts  = daily_posts(posts_dir)
+    months = closed_months(list(posts), today or date.today(), keep_days, keep_posts)
+    moved  = 0
+    for month in months:
+        month_posts = {day: path for day, path in posts.items() if day.startswith(month)}
+        if dry_run:
+            moved += len(month_posts)
+        else:
+            moved += compact_month(month, month_posts, posts_dir, archive_dir)
+    return {"months": months, "days": moved}
+
+
+def rebuild(posts_dir: str = POSTS_DIR, archive_dir: str = ARCHIVE_DIR) -> list:
+    """Régénère la synthèse de chaque mois archivé. Retourne les mois traités."""
+    months = sorted({day[:7] for day in archived_days(archive_dir)})
+    for month in months:
+        compact_month(month, {}, posts_dir, archive_dir)
+    return months
+
+
+# ──────────────────────────────────────────────
+# 4. Point d'entrée
+# ──────────────────────────────────────────────
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ETC Tracker — synthèses mensuelles")
+    parser.add_argument("--dry-run", action="store_true", help="affiche les mois à compacter")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="régénère toutes les synthèses depuis archive/posts/")
+    parser.add_argument("--keep-days", type=int, default=KEEP_DAYS,
+                        help=f"jours récents gardés en articles individuels (défaut : {KEEP_DAYS})")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        months = rebuild()
+        print(f"✅ {len(months)} synthèse(s) régénérée(s) depuis {ARCHIVE_DIR}")
+        print("\nTerminé ✓")
+        return
+
+    stats = compact(keep_days=args.keep_days, dry_run=args.dry_run)
+    if not stats["months"]:
+        print(f"ℹ️  Aucun mois clos à compacter (articles des {args.keep_days} derniers jours conservés).")
+    elif args.dry_run:
+        print(f"ℹ️  {len(stats['months'])} mois à compacter ({stats['days']} article(s)) : "
+              f"{', '.join(stats['months'])}")
+    else:
+        print(f"✅ {len(stats['months'])} mois compacté(s), {stats['days']} article(s) "
+              f"archivé(s) dans {ARCHIVE_DIR}")
+    print("\nTerminé ✓")
+
+
+if __name__ == "__main__":
+    main()
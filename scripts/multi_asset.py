@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Suivi multi-actifs
+================================
+Généralise la génération quotidienne à plusieurs cryptomonnaies :
+
+  - les données de marché de tous les actifs sont récupérées en deux requêtes
+    (endpoint `coins/markets`, une par devise) quel que soit leur nombre ;
+  - les analyses de tous les actifs sont produites par un seul appel Claude
+    (réponse JSON indexée par identifiant), avec repli sur l'analyse basique ;
+  - articles, historiques et séries de graphique sont écrits en parallèle.
+
+L'ETC conserve son emplacement historique (content/posts/) ; les autres
+actifs sont publiés dans content/markets/<slug>/.
+
+Usage :
+  python scripts/generate_article.py --assets bitcoin,ethereum,ethereum-classic
+  python scripts/generate_article.py --assets all
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import chart_data
+import http_client
+import price_history
+import run_report
+from llm_batch import extract_json_object
+from llm_cache import cached_completion
+from generate_article import (
+    ANALYSIS_MODEL,
+    ETC_ASSET,
+    create_hugo_article,
+    generate_basic_analysis,
+)
+
+
+COINGECKO_MARKETS_PATH = "/coins/markets"
+MARKETS_SECTION        = os.path.join("content", "markets")
+
+# L'endpoint markets accepte jusqu'à 250 identifiants par page
+MARKETS_PAGE_SIZE = 250
+
+
+def _asset(coin_id: str, symbol: str, name: str) -> dict:
+    slug = symbol.lower()
+    return {
+        "id":      coin_id,
+        "symbol":  symbol,
+        "name":    name,
+        "slug":    slug,
+        "section": os.path.join(MARKETS_SECTION, slug),
+    }
+
+
+# Actifs connus (identifiant CoinGecko → métadonnées d'affichage)
+ASSETS = {asset["id"]: asset for asset in (
+    ETC_ASSET,
+    _asset("bitcoin",            "BTC",   "Bitcoin"),
+    _asset("ethereum",           "ETH",   "Ethereum"),
+    _asset("tether",             "USDT",  "Tether"),
+    _asset("binancecoin",        "BNB",   "BNB"),
+    _asset("solana",             "SOL",   "Solana"),
+    _asset("ripple",             "XRP",   "XRP"),
+    _asset("cardano",            "ADA",   "Cardano"),
+    _asset("dogecoin",           "DOGE",  "Dogecoin"),
+    _asset("tron",               "TRX",   "TRON"),
+    _asset("avalanche-2",        "AVAX",  "Avalanche"),
+    _asset("polkadot",           "DOT",   "Polkadot"),
+    _asset("chainlink",          "LINK",  "Chainlink"),
+    _asset("litecoin",           "LTC",   "Litecoin"),
+    _asset("bitcoin-cash",       "BCH",   "Bitcoin Cash"),
+    _asset("stellar",            "XLM",   "Stellar"),
+    _asset("cosmos",             "ATOM",  "Cosmos"),
+    _asset("monero",             "XMR",   "Monero"),
+    _asset("near",               "NEAR",  "NEAR Protocol"),
+    _asset("uniswap",            "UNI",   "Uniswap"),
+    _asset("aptos",              "APT",   "Aptos"),
+    _asset("filecoin",           "FIL",   "Filecoin"),
+    _asset("algorand",           "ALGO",  "Algorand"),
+    _asset("vechain",            "VET",   "VeChain"),
+    _asset("hedera-hashgraph",   "HBAR",  "Hedera"),
+    _asset("internet-computer",  "ICP",   "Internet Computer"),
+    _asset("tezos",              "XTZ",   "Tezos"),
+    _asset("zcash",              "ZEC",   "Zcash"),
+    _asset("dash",               "DASH",  "Dash"),
+)}
+
+
+# ──────────────────────────────────────────────
+# 1. Données de marché groupées
+# ──────────────────────────────────────────────
+
+def _fetch_markets(vs_currency: str, ids: list) -> dict:
+    """Une requête `coins/markets` par page de 250 identifiants → {id: ligne}."""
+    rows = {}
+    for start in range(0, len(ids), MARKETS_PAGE_SIZE):
+        params = {
+            "vs_currency":             vs_currency,
+            "ids":                     ",".join(ids[start:start + MARKETS_PAGE_SIZE]),
+            "per_page":                MARKETS_PAGE_SIZE,
+            "price_change_percentage": "24h,7d,30d",
+            "sparkline":               "false",
+        }
+        resp = http_client.get(http_client.url("coingecko", COINGECKO_MARKETS_PATH), endpoint="coingecko",
+                               params=params, headers={"Accept": "application/json"}, timeout=30)
+        resp.raise_for_status()
+        rows.update((row["id"], row) for row in resp.json())
+    return rows
+
+
+def fetch_markets_data(ids: list) -> dict:
+    """Retourne {id: etc_data} pour tous les actifs, au format de `fetch_etc_data`."""
+    usd = _fetch_markets("usd", ids)
+    eur = _fetch_markets("eur", ids)
+
+    data = {}
+    for coin_id in ids:
+        row = usd.get(coin_id)
+        if not row or row.get("current_price") is None:
+            print(f"   ⚠️  {coin_id} : absent de la réponse CoinGecko — ignoré.")
+            continue
+        data[coin_id] = {
+            "price_usd":          row["current_price"],
+            "price_eur":          (eur.get(coin_id) or {}).get("current_price") or 0.0,
+            "change_24h":         row.get("price_change_percentage_24h_in_currency") or 0.0,
+            "change_7d":          row.get("price_change_percentage_7d_in_currency")  or 0.0,
+            "change_30d":         row.get("price_change_percentage_30d_in_currency") or 0.0,
+            "market_cap_usd":     row.get("market_cap") or 0.0,
+            "volume_24h_usd":     row.get("total_volume") or 0.0,
+            "ath_usd":            row.get("ath") or row["current_price"],
+            "ath_date":           (row.get("ath_date") or "")[:10],
+            "circulating_supply": row.get("circulating_supply") or 0,
+            "max_supply":         row.get("max_supply") or 0,
+        }
+    return data
+
+
+# ──────────────────────────────────────────────
+# 2. Analyse groupée (un seul appel Claude)
+# ──────────────────────────────────────────────
+
+def _batch_prompt(market: dict) -> str:
+    lines = [
+        f"{coin_id} ({ASSETS[coin_id]['name']}, {ASSETS[coin_id]['symbol']}) : "
+        f"prix {d['price_usd']:.4f} USD, 24h {d['change_24h']:+.2f}%, "
+        f"7j {d['change_7d']:+.2f}%, 30j {d['change_30d']:+.2f}%, "
+        f"capitalisation {d['market_cap_usd']:,.0f} USD, volume 24h {d['volume_24h_usd']:,.0f} USD, "
+        f"ATH {d['ath_usd']:.2f} USD (le {d['ath_date']})"
+        for coin_id, d in sorted(market.items())
+    ]
+    return (
+        "Tu es un analyste de marché spécialisé dans les cryptomonnaies. "
+        "Pour chaque actif ci-dessous, rédige en français un commentaire de marché "
+        "factuel et nuancé (80–120 mots). N'émets aucune recommandation d'investissement. "
+        "Réponds uniquement par un objet JSON dont les clés sont les identifiants "
+        "(avant la parenthèse) et les valeurs les commentaires.\n\n"
+        + "\n".join(lines)
+    )
+
+
+def generate_batch_analyses(market: dict, api_key: str) -> dict:
+    """Analyse tous les actifs en un appel Claude. Les actifs manquants ou
+    illisibles dans la réponse reçoivent l'analyse basique."""
+    analyses = {}
+    if api_key and market:
+        import anthropic
+
+        client = anthropic.Anthropic(api_key=api_key)
+        max_tokens = min(16_000, 400 + 350 * len(market))
+        try:
+            text = cached_completion(client, ANALYSIS_MODEL, _batch_prompt(market), max_tokens)
+            analyses = extract_json_object(text)
+            print(f"   {len(analyses)}/{len(market)} analyse(s) IA reçue(s) en un appel")
+        except Exception as exc:
+            print(f"   ⚠️  Erreur API Anthropic ({exc}) — analyses basiques utilisées.")
+
+    return {
+        coin_id: analyses.get(coin_id) or generate_basic_analysis(etc_data, ASSETS[coin_id])
+        for coin_id, etc_data in market.items()
+    }
+
+
+# ──────────────────────────────────────────────
+# 3. Rendu et écriture en parallèle
+# ──────────────────────────────────────────────
+
+def _ensure_section(asset: dict) -> None:
+    """Crée les pages de section Hugo d'un actif (content/markets/<slug>/_index.md)."""
+    index_path = os.path.join(asset["section"], "_index.md")
+    if asset["section"] == ETC_ASSET["section"] or os.path.exists(index_path):
+        return
+    os.makedirs(asset["section"], exist_ok=True)
+
+    root_index = os.path.join(MARKETS_SECTION, "_index.md")
+    if not os.path.exists(root_index):
+        with open(root_index, "w", encoding="utf-8") as fh:
+            fh.write('---\ntitle: "Marchés"\ndescription: "Suivi quotidien des cryptomonnaies"\n---\n')
+
+    with open(index_path, "w", encoding="utf-8") as fh:
+        fh.write(
+            f'---\n'
+            f'title: "Cours {asset["name"]} ({asset["symbol"]})"\n'
+            f'description: "Historique du cours {asset["name"]}"\n'
+            f'chart_data: "{chart_data.chart_url(asset["slug"])}"\n'
+            f'---\n'
+        )
+
+
+def _publish_asset(asset: dict, etc_data: dict, analysis: str, now: datetime) -> str:
+    """Écrit l'article, l'historique et l'export de graphique d'un actif."""
+    _ensure_section(asset)
+    filepath = create_hugo_article(etc_data, analysis, now, asset)
+    history  = price_history.history_path(asset["slug"])
+    price_history.append_day(now, etc_data, history)
+    chart_data.write_chart_data(history, chart_data.chart_path(asset["slug"]))
+    return filepath
+
+
+def run_multi_asset(ids: list, api_key: str = "", workers: int = 8) -> list:
+    """Génère les articles du jour pour tous les actifs `ids`. Retourne les chemins écrits."""
+    unknown = [coin_id for coin_id in ids if coin_id not in ASSETS]
+    if unknown:
+        raise ValueError(f"Actif(s) inconnu(s) : {', '.join(unknown)} (voir multi_asset.ASSETS)")
+
+    print(f"\n📡 Récupération groupée CoinGecko ({len(ids)} actif(s))…")
+    with run_report.stage("fetch"):
+        market = fetch_markets_data(ids)
+    run_report.set_meta(assets=len(market))
+
+    print("\n🤖 Analyse groupée…")
+    with run_report.stage("analysis"):
+        analyses = generate_batch_analyses(market, api_key)
+
+    print("\n📝 Création des articles…")
+    now = datetime.now()
+    with run_report.stage("write"), ThreadPoolExecutor(max_workers=workers) as pool:
+        paths = list(pool.map(
+            lambda coin_id: _publish_asset(ASSETS[coin_id], market[coin_id], analyses[coin_id], now),
+            sorted(market),
+        ))
+    return paths
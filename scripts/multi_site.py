@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Sites multilingues
+================================
+Étend la génération aux autres sites Hugo du dépôt (`mounjaro/`,
+`france-formosa/`), publiés chacun en plusieurs langues (content/fr|en|zh).
+Chaque site déclare dans `SITES` sa requête NewsAPI, ses sujets (voir
+news_matcher.py), sa section et ses langues.
+
+Le coût croît avec le nombre de textes publiés, non avec sites × langues ×
+générations complètes :
+
+  - une lecture NewsAPI par site ; sessions HTTP (http_client) et client
+    Anthropic partagés par tous les sites ;
+  - un texte source par article (titre + résumé), rédigé une fois dans la
+    langue source (`SOURCE_LANGUAGE`), une requête groupée par site ;
+  - une requête de traduction groupée par langue cible pour les articles de
+    tous les sites, à partir des textes sources.
+
+Un article porte le même nom de fichier dans chaque langue : Hugo relie les
+versions comme traductions l'une de l'autre. Le site ETC (racine du dépôt,
+monolingue) reste produit par generate_article.py.
+
+Usage :
+  python scripts/pipeline.py --sites all
+  python scripts/pipeline.py --sites mounjaro --news-pages 2
+"""
+
+import os
+import re
+import json
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+
+import news_clusters
+import news_store
+import run_report
+from fetch_ethereum_news import NEWS_PAGE_SIZE, REFORMULATION_MODEL, iter_news_pages
+from llm_batch import structured_batch
+from news_matcher import KeywordMatcher
+
+
+SOURCE_LANGUAGE        = "fr"
+SITE_MAX_ARTICLES      = 10     # articles publiés par site et par run
+SITE_ITEM_TOKENS       = 400    # budget de sortie par texte (titre + résumé)
+TRANSLATION_BATCH_SIZE = 20     # textes par requête de traduction
+TRANSLATION_WORKERS    = 8
+
+# Langues de publication : nom dans les consignes du modèle, libellés des pages
+LANGUAGES = {
+    "fr": {"name": "français",
+           "read": "Lire l'article original",
+           "note": "Résumé rédigé automatiquement par Claude AI (Anthropic) à partir de la source citée."},
+    "en": {"name": "anglais",
+           "read": "Read the original article",
+           "note": "Summary written automatically by Claude AI (Anthropic) from the cited source."},
+    "zh": {"name": "chinois traditionnel (Taïwan)",
+           "read": "閱讀原文",
+           "note": "本摘要由 Claude AI（Anthropic）根據所引來源自動撰寫。"},
+}
+
+SITES = {
+    "mounjaro": {
+        "root":      "mounjaro",
+        "languages": ("fr", "en", "zh"),
+        "section":   "articles",
+        "query":     "Mounjaro OR tirzepatide OR Zepbound",
+        "language":  None,          # sources en toutes langues
+        "required":  "tirzepatide",
+        "topics": {
+            "tirzepatide": {"aliases": ("mounjaro", "tirzepatide", "tirzépatide", "zepbound")},
+            "glp-1":       {"aliases": ("glp-1", "glp1", "semaglutide", "sémaglutide",
+                                        "ozempic", "wegovy")},
+            "regulation":  {"aliases": ("fda", "ema", "approval", "approved", "autorisation",
+                                        "remboursement", "reimbursement")},
+            "research":    {"aliases": ("trial", "study", "étude", "essai clinique")},
+        },
+        "persona":   "Tu es un journaliste santé rigoureux, spécialiste du diabète et de l'obésité.",
+    },
+    "france-formosa": {
+        "root":      "france-formosa",
+        "languages": ("fr", "en", "zh"),
+        "section":   "veille",
+        "query":     "Taiwan AND (France OR French)",
+        "language":  None,
+        "required":  "taiwan",
+        "topics": {
+            "taiwan":  {"aliases": ("taiwan", "taïwan", "taiwanese", "taïwanais", "taïwanaise",
+                                    "taipei", "formosa")},
+            "france":  {"aliases": ("france", "french", "français", "française", "paris")},
+            "culture": {"aliases": ("culture", "cultural", "culturel", "culturelle", "festival",
+                                    "exhibition", "exposition", "cinema", "cinéma")},
+        },
+        "persona":   "Tu es un analyste des relations franco-taïwanaises (diplomatie, culture, économie).",
+        # Section créée à la première publication (absente des sites d'origine)
+        "section_pages": {
+            "fr": ("Veille", "L'actualité des relations franco-taïwanaises"),
+            "en": ("Press watch", "News on France–Taiwan relations"),
+            "zh": ("媒體觀察", "法台關係新聞"),
+        },
+    },
+}
+
+SOURCE_INSTRUCTIONS = (
+    "Pour chaque article d'actualité ci-dessous, écris en français un titre court "
+    "sur la première ligne, puis, après une ligne vide, un résumé factuel de 3-4 phrases. "
+    "N'ajoute aucun fait absent de l'article et aucun conseil."
+)
+
+TRANSLATION_INSTRUCTIONS = (
+    "Traduis chacun des textes ci-dessous en {language}. Garde la même forme : titre "
+    "sur la première ligne, ligne vide, puis le résumé. Conserve les noms propres "
+    "(médicaments, personnes, institutions) sans équivalent usuel."
+)
+
+
+def site_names(spec: str) -> list:
+    """Sites désignés par `spec` (noms séparés par des virgules, ou 'all')."""
+    names = list(SITES) if spec == "all" else [n.strip() for n in spec.split(",") if n.strip()]
+    unknown = [name for name in names if name not in SITES]
+    if unknown:
+        raise ValueError(f"Site(s) inconnu(s) : {', '.join(unknown)} (voir multi_site.SITES)")
+    return names
+
+
+def index_path(name: str) -> str:
+    """Index des actualités déjà publiées par le site `name`."""
+    return os.path.join("history", f"{name}-news-index.json")
+
+
+# ──────────────────────────────────────────────
+# 1. Actualités de chaque site
+# ──────────────────────────────────────────────
+
+def fetch_site_news(name: str, newsapi_key: str, pages: int = 1,
+                    page_size: int = NEWS_PAGE_SIZE,
+                    max_articles: int = SITE_MAX_ARTICLES) -> tuple:
+    """(index, articles jamais vus) du site `name`, reprises marquées
+    (`duplicate_of`, voir news_clusters)."""
+    site  = SITES[name]
+    index = news_store.load_index(index_path(name))
+    stats, kept = {}, []
+    articles = iter_news_pages(newsapi_key, index.get("last_published_at"), pages, page_size,
+                               query=site["query"], language=site["language"])
+    matched  = KeywordMatcher(site["topics"]).stream(articles, site["required"], stats)
+    try:
+        for article in news_store.iter_unseen(matched, index):
+            kept.append(article)
+            if len(kept) >= max_articles:
+                break
+    except Exception as exc:
+        print(f"❌ {name} : erreur NewsAPI ({exc})")
+
+    fresh = news_store.filter_unseen(kept, index)
+    with run_report.stage("cluster"):
+        duplicates = news_clusters.mark_duplicates(index, fresh)
+    print(f"   {name} : {stats.get('seen', 0)} article(s) brut(s), {len(fresh)} nouveau(x)"
+          + (f" dont {duplicates} reprise(s)" if duplicates else ""))
+    run_report.count(f"sites.{name}.fresh", len(fresh))
+    return index, fresh
+
+
+# ──────────────────────────────────────────────
+# 2. Textes sources puis traductions (requêtes groupées)
+# ──────────────────────────────────────────────
+
+def source_prompt(site: dict, article: dict) -> str:
+    """Prompt individuel équivalent du texte source d'un article (clé de cache)."""
+    return (
+        f"{site['persona']} {SOURCE_INSTRUCTIONS}\n\n"
+        f"Titre : {article['title']}\nContenu : {article['description']}"
+    )
+
+
+def summarize_site(name: str, collected: tuple, client) -> dict:
+    """Textes sources des représentants de chaque groupe d'articles, en une
+    requête groupée : {clé d'article: "titre\\n\\nrésumé"}."""
+    _, fresh = collected
+    site  = SITES[name]
+    by_id = {f"a{idx}": article for idx, article in enumerate(
+        (a for a in news_clusters.representatives(fresh) if a.get("title") and a.get("description")),
+        1)}
+    if not by_id or client is None:
+        return {}
+
+    try:
+        with run_report.stage("analysis"):
+            texts = structured_batch(
+                client, REFORMULATION_MODEL, f"{site['persona']} {SOURCE_INSTRUCTIONS}",
+                items={i: source_prompt(site, a) for i, a in by_id.items()},
+                entries={i: f"Titre : {a['title']}\nContenu : {a['description']}"
+                         for i, a in by_id.items()},
+                item_max_tokens=SITE_ITEM_TOKENS, per_item_tokens=SITE_ITEM_TOKENS,
+            )
+    except Exception as exc:
+        print(f"   ⚠️  {name} : requête groupée en échec ({exc}) — articles reportés.")
+        return {}
+    print(f"   {name} : {len(texts)}/{len(by_id)} texte(s) source(s) rédigé(s)")
+    return {news_store.article_key(by_id[i]): text for i, text in texts.items()}
+
+
+def translation_prompt(lang: str, text: str) -> str:
+    """Prompt individuel équivalent d'une traduction (clé de cache)."""
+    return f"{TRANSLATION_INSTRUCTIONS.format(language=LANGUAGES[lang]['name'])}\n\n{text}"
+
+
+def translate_sites(names: list, client, *sources: dict) -> dict:
+    """Traduit les textes sources de tous les sites vers chaque langue cible :
+    une requête groupée par langue (et par lot de `TRANSLATION_BATCH_SIZE`
+    textes), lots et langues en parallèle. `sources` : textes sources de
+    chaque site de `names`, dans le même ordre.
+
+    Retourne {langue: {"<site>.<clé>": texte traduit}}.
+    """
+    jobs = {}       # langue → {identifiant: texte source}
+    for name, texts in zip(names, sources):
+        for lang in SITES[name]["languages"]:
+            if lang != SOURCE_LANGUAGE:
+                jobs.setdefault(lang, {}).update(
+                    (f"{name}.{key}", text) for key, text in texts.items())
+
+    chunks = []
+    for lang, texts in jobs.items():
+        ids = list(texts)
+        chunks += [(lang, ids[i:i + TRANSLATION_BATCH_SIZE])
+                   for i in range(0, len(ids), TRANSLATION_BATCH_SIZE)]
+    if not chunks or client is None:
+        return {}
+
+    def run(job: tuple) -> tuple:
+        lang, ids = job
+        try:
+            return lang, structured_batch(
+                client, REFORMULATION_MODEL,
+                TRANSLATION_INSTRUCTIONS.format(language=LANGUAGES[lang]["name"]),
+                items={i: translation_prompt(lang, jobs[lang][i]) for i in ids},
+                entries={i: jobs[lang][i] for i in ids},
+                item_max_tokens=SITE_ITEM_TOKENS, per_item_tokens=SITE_ITEM_TOKENS,
+            )
+        except Exception as exc:
+            print(f"   ⚠️  Traduction ({lang}) en échec ({exc}) — langue ignorée pour ce lot.")
+            return lang, {}
+
+    translations = {}
+    with run_report.stage("translation"), \
+            ThreadPoolExecutor(max_workers=min(TRANSLATION_WORKERS, len(chunks))) as pool:
+        for lang, done in pool.map(run, chunks):
+            translations.setdefault(lang, {}).update(done)
+
+    total = sum(len(texts) for texts in jobs.values())
+    print(f"\n🌐 {sum(map(len, translations.values()))}/{total} traduction(s) "
+          f"en {len(chunks)} requête(s) groupée(s) ({', '.join(sorted(jobs))})")
+    run_report.count("sites.translations", sum(map(len, translations.values())))
+    return translations
+
+
+# ──────────────────────────────────────────────
+# 3. Articles Hugo de chaque langue
+# ──────────────────────────────────────────────
+
+_ARTICLE = """\
+---
+title: {title}
+date: {date}
+draft: false
+description: {description}
+source: {source}
+source_url: {url}
+tags: {tags}
+---
+
+{body}
+
+[{read} →]({url_raw})
+
+*{note}*
+"""
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|(?<=[。！？])")
+
+
+def slugify(text: str, length: int = 60) -> str:
+    """Nom de fichier ASCII d'un titre (comme les articles déjà publiés)."""
+    ascii_text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "-", ascii_text.lower()).strip("-")[:length]
+
+
+def article_filename(article: dict) -> str:
+    """`AAAA-MM-JJ-<titre>-<clé>.md` : la clé d'index départage deux titres
+    dont les 60 premiers caractères coïncident."""
+    return (f"{(article.get('publishedAt') or '')[:10]}-{slugify(article['title'])}-"
+            f"{news_store.article_key(article)[:6]}.md")
+
+
+def split_text(text: str, fallback_title: str) -> tuple:
+    """(titre, corps) d'un texte « titre, ligne vide, résumé »."""
+    title, _, body = text.strip().partition("\n")
+    if not body.strip():
+        return fallback_title, text.strip()
+    return title.strip().strip("#*\" ").strip(), body.strip()
+
+
+def render_site_article(article: dict, text: str, lang: str) -> str:
+    """Markdown (front matter + corps) d'un article dans la langue `lang`."""
+    title, body = split_text(text, article["title"])
+    source = (article.get("source") or {}).get("name", "")
+    dump   = partial(json.dumps, ensure_ascii=False)
+    return _ARTICLE.format(
+        title=dump(title),
+        date=article.get("publishedAt") or datetime.now().strftime("%Y-%m-%dT%H:%M:%S"),
+        description=dump(_SENTENCE_END.split(body, 1)[0]),
+        source=dump(source),
+        url=dump(article.get("url", "")),
+        url_raw=article.get("url", ""),
+        tags=dump(article.get("topics", [])),
+        body=body,
+        **LANGUAGES[lang],
+    )
+
+
+def _ensure_section(site: dict, lang: str) -> str:
+    """Crée au besoin la section de la langue `lang` et retourne son chemin."""
+    section = os.path.join(site["root"], "content", lang, site["section"])
+    index   = os.path.join(section, "_index.md")
+    os.makedirs(section, exist_ok=True)
+    if lang in site.get("section_pages", {}) and not os.path.exists(index):
+        title, subtitle = site["section_pages"][lang]
+        with open(index, "w", encoding="utf-8") as fh:
+            fh.write(f'---\ntitle: "{title}"\nsubtitle: "{subtitle}"\n---\n')
+    return section
+
+
+def write_site_articles(name: str, now: datetime, collected: tuple, sources: dict,
+                        translations: dict) -> int:
+    """Écrit les articles du site dans chaque langue puis met à jour son index.
+
+    Un article sans texte source reste hors de l'index (repris au prochain
+    passage) ; une traduction manquante n'omet que la langue concernée.
+    Retourne le nombre de fichiers écrits.
+    """
+    index, fresh = collected
+    site = SITES[name]
+    sections = {lang: _ensure_section(site, lang) for lang in site["languages"]}
+    published, written, missing = [], 0, 0
+
+    with run_report.stage("write"):
+        for article in news_clusters.representatives(fresh):
+            key = news_store.article_key(article)
+            if key not in sources:
+                continue
+            published.append(article)
+            for lang in site["languages"]:
+                text = (sources[key] if lang == SOURCE_LANGUAGE
+                        else translations.get(lang, {}).get(f"{name}.{key}"))
+                if not text:
+                    missing += 1
+                    continue
+                path = os.path.join(sections[lang], article_filename(article))
+                if os.path.exists(path):
+                    continue
+                with open(path, "w", encoding="utf-8") as fh:
+                    fh.write(render_site_article(article, text, lang))
+                written += 1
+
+        # Index : articles publiés et reprises (d'un article publié ou déjà indexé)
+        done = {news_store.article_key(a) for a in published}
+        news_store.add_articles(
+            index, [a for a in fresh if news_store.article_key(a) in done
+                    or a.get("duplicate_of") in done or a.get("duplicate_of") in index["articles"]],
+            {a["title"]: sources[news_store.article_key(a)] for a in published},
+        )
+        news_store.save_index(index, index_path(name))
+
+    print(f"✅ {name} : {len(published)} article(s), {written} fichier(s) "
+          f"en {len(site['languages'])} langue(s)"
+          + (f" — {missing} traduction(s) manquante(s)" if missing else ""))
+    run_report.count(f"sites.{name}.files", written)
+    return written
+
+
+# ──────────────────────────────────────────────
+# 4. Étapes du pipeline
+# ──────────────────────────────────────────────
+
+def add_site_tasks(pipeline, names: list, newsapi_key: str, client, now: datetime,
+                   pages: int = 1, page_size: int = NEWS_PAGE_SIZE) -> None:
+    """Ajoute au graphe de pipeline.py les étapes des sites `names` :
+
+      <site>.news ──▶ <site>.source ──┐
+                                      ├──▶ translation ──▶ <site>.pages
+      (un couple par site) ───────────┘
+
+    Les lectures NewsAPI et les textes sources des sites s'exécutent en
+    parallèle ; la traduction les regroupe tous, langue par langue.
+    """
+    for name in names:
+        pipeline.add(f"{name}.news", partial(fetch_site_news, name, newsapi_key, pages, page_size))
+        pipeline.add(f"{name}.source", partial(summarize_site, name, client=client),
+                     (f"{name}.news",))
+    pipeline.add("translation", partial(translate_sites, names, client),
+                 tuple(f"{name}.source" for name in names))
+    for name in names:
+        pipeline.add(f"{name}.pages", partial(write_site_articles, name, now),
+                     (f"{name}.news", f"{name}.source", "translation"))
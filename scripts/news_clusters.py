@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Regroupement des actualités syndiquées
+====================================================
+Un même communiqué est repris par plusieurs médias sous des titres à peine
+différents. Les articles quasi identiques (titre + description) sont
+regroupés avant la reformulation : un seul résumé est demandé par groupe,
+les autres sources sont listées sous ce résumé.
+
+Méthode : signature MinHash des bigrammes de mots de chaque article, puis
+LSH par bandes (`BANDS` bandes de `NUM_PERM // BANDS` valeurs). Seuls les
+articles qui partagent une bande sont comparés, et la similarité estimée
+sur les signatures confirme le rapprochement ; les groupes sont les
+composantes connexes (union-find). Le coût est linéaire en nombre
+d'articles, sans comparaison deux à deux.
+
+Les nouveaux articles sont aussi rapprochés des articles indexés depuis
+`SYNDICATION_DAYS` jours : une reprise tardive rejoint le groupe existant
+au lieu d'être résumée à nouveau.
+
+Sans NumPy, le regroupement est désactivé : chaque article est résumé.
+"""
+
+import re
+import zlib
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+import news_store
+
+try:
+    import numpy as np
+except ImportError:     # regroupement désactivé (voir mark_duplicates)
+    np = None
+
+
+NUM_PERM          = 128     # valeurs par signature (écart type de l'estimation ≈ 0,04)
+BANDS             = 32      # 32 bandes de 4 valeurs : seuil LSH ≈ (1/32)^(1/4) ≈ 0,42
+SIMILARITY        = 0.5     # similarité de Jaccard estimée minimale
+SYNDICATION_DAYS  = 7       # fenêtre de rapprochement avec les articles déjà indexés
+MINHASH_SEED      = 1_337
+CHUNK_SHINGLES    = 4_096   # bigrammes hachés par bloc (matrice NUM_PERM × bloc : 4 Mo)
+
+_MASK  = 0xFFFF_FFFF
+_MIX   = 0x9E37_79B1                    # combinaison des empreintes de deux mots
+_WORDS = re.compile(r"\w+")
+
+
+# ──────────────────────────────────────────────
+# 1. Signatures MinHash
+# ──────────────────────────────────────────────
+
+def article_text(article: dict) -> str:
+    return f"{article.get('title') or ''} {article.get('description') or ''}"
+
+
+@lru_cache(maxsize=1 << 16)
+def _word_hash(word: str) -> int:
+    return zlib.crc32(word.encode("utf-8"))
+
+
+def shingle_hashes(text: str) -> "np.ndarray":
+    """Empreintes 32 bits des bigrammes de mots du texte (du mot seul pour
+    un texte d'un mot). Les doublons sont sans effet sur un minimum."""
+    words = np.fromiter(map(_word_hash, _WORDS.findall(text.lower())), dtype=np.uint64)
+    if len(words) < 2:
+        return words
+    return (words[:-1] * np.uint64(_MIX) + words[1:]) & np.uint64(_MASK)
+
+
+class MinHasher:
+    """`NUM_PERM` fonctions de hachage a·x + b (mod 2^64, a impair) tirées une
+    fois pour toutes (graine fixe : signatures identiques d'une exécution à
+    l'autre)."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = MINHASH_SEED):
+        rng = np.random.default_rng(seed)
+        self._a = (rng.integers(0, 1 << 63, num_perm, dtype=np.uint64) * 2 + 1)[:, None]
+        self._b = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)[:, None]
+
+    def signatures(self, texts: list, chunk: int = CHUNK_SHINGLES) -> list:
+        """Signature de chaque texte (None s'il ne contient aucun mot), calculées
+        par opérations vectorielles sur des blocs d'environ `chunk` bigrammes :
+        la mémoire reste bornée quelle que soit la taille du lot."""
+        shingles = [shingle_hashes(text) for text in texts]
+        result   = [None] * len(texts)
+        block, size = [], 0
+        for i, sh in enumerate(shingles):
+            if not len(sh):
+                continue
+            block.append(i)
+            size += len(sh)
+            if size >= chunk:
+                self._sign_block(shingles, block, result)
+                block, size = [], 0
+        if block:
+            self._sign_block(shingles, block, result)
+        return result
+
+    def _sign_block(self, shingles: list, block: list, result: list) -> None:
+        values = np.concatenate([shingles[i] for i in block])
+        starts = np.cumsum([0] + [len(shingles[i]) for i in block[:-1]])
+        rows   = np.minimum.reduceat(self._a * values + self._b, starts, axis=1).T.copy()
+        for row, i in zip(rows, block):
+            result[i] = row
+
+
+def similarity(sig_a: "np.ndarray", sig_b: "np.ndarray") -> float:
+    """Similarité de Jaccard estimée : part des valeurs égales."""
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+_default_hasher = None
+
+
+def get_hasher() -> MinHasher:
+    global _default_hasher
+    if _default_hasher is None:
+        _default_hasher = MinHasher()
+    return _default_hasher
+
+
+# ──────────────────────────────────────────────
+# 2. Regroupement (LSH + union-find)
+# ──────────────────────────────────────────────
+
+def cluster(texts: list, threshold: float = SIMILARITY, bands: int = BANDS) -> list:
+    """Groupes de textes quasi identiques : liste de listes d'indices
+    (singletons compris), dans l'ordre des textes.
+
+    Dans chaque alvéole LSH, chaque texte n'est comparé qu'au premier
+    arrivé : O(n × bandes) comparaisons au plus.
+    """
+    hasher = get_hasher()
+    sigs   = hasher.signatures(texts)
+    parent = list(range(len(texts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    rows = NUM_PERM // bands
+    for band in range(bands):
+        buckets = {}
+        for i, sig in enumerate(sigs):
+            if sig is None:
+                continue
+            first = buckets.setdefault(sig[band * rows:(band + 1) * rows].tobytes(), i)
+            if first == i:
+                continue
+            root_first, root_i = find(first), find(i)
+            if root_first != root_i and similarity(sigs[first], sig) >= threshold:
+                parent[max(root_first, root_i)] = min(root_first, root_i)
+
+    groups = {}
+    for i in range(len(texts)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+# ──────────────────────────────────────────────
+# 3. Articles syndiqués
+# ──────────────────────────────────────────────
+
+def _representative(members: list) -> dict:
+    """Article résumé pour le groupe : la description la plus complète,
+    puis la publication la plus ancienne (le communiqué d'origine)."""
+    return min(members, key=lambda a: (-len(a.get("description") or ""),
+                                       a.get("publishedAt") or ""))
+
+
+def mark_duplicates(index: dict, fresh: list, days: int = SYNDICATION_DAYS,
+                    now: datetime = None) -> int:
+    """Marque (`article["duplicate_of"]` = clé d'index du représentant) les
+    articles de `fresh` qui reprennent un autre article du lot ou un article
+    indexé depuis `days` jours. Retourne le nombre d'articles marqués (0 si
+    NumPy est indisponible)."""
+    if np is None:
+        return 0
+    since = ((now or datetime.now()) - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%S")
+    known = news_store.originals(index, since)
+    texts = [article_text(entry) for _, entry in known] + [article_text(a) for a in fresh]
+
+    marked = 0
+    for group in cluster(texts):
+        if len(group) < 2:
+            continue
+        members = [fresh[i - len(known)] for i in group if i >= len(known)]
+        if group[0] < len(known):
+            rep_key = known[group[0]][0]
+        else:
+            rep = _representative(members)
+            rep_key = news_store.article_key(rep)
+            members = [a for a in members if a is not rep]
+        for article in members:
+            article["duplicate_of"] = rep_key
+        marked += len(members)
+    return marked
+
+
+def representatives(articles: list) -> list:
+    """Articles à résumer : ceux qui ne reprennent pas un autre article."""
+    return [article for article in articles if not article.get("duplicate_of")]
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Filtrage des actualités par mots-clés
+===================================================
+Reconnaît en un seul passage, sur le titre et la description d'un article,
+tous les alias et termes d'exclusion de plusieurs sujets (automate
+d'Aho-Corasick sur les mots du texte) : le coût par article est linéaire en
+son nombre de mots, quel que soit le nombre de motifs.
+
+Chaque sujet de `NEWS_TOPICS` déclare :
+
+  - `aliases` : expressions reconnues sans tenir compte de la casse ;
+  - `exact`   : sigles reconnus tels quels (« ETC », pas « etc. ») ;
+  - `exclude` : expressions qui annulent les alias qu'elles recouvrent
+                (« ETC Group », émetteur d'ETP sans lien avec le réseau).
+
+Textes et motifs sont découpés en mots par la même expression (`_WORDS`) :
+un motif ne peut donc commencer ou finir qu'en limite de mot. Un article
+retenu reçoit la liste des sujets trouvés (`article["topics"]`).
+"""
+
+import re
+
+
+# Sujet obligatoire pour publier un article ; les autres servent d'étiquettes.
+REQUIRED_TOPIC = "etc"
+
+NEWS_TOPICS = {
+    "etc": {
+        "aliases": ("ethereum classic", "etc cooperative", "etc labs", "etchash",
+                    "mordor testnet"),
+        "exact":   ("ETC", "$ETC", "ETCG"),
+        "exclude": ("etc group", "electronic toll collection"),
+    },
+    "mining": {
+        "aliases": ("hashrate", "hash rate", "miner", "miners", "mining", "asic", "asics"),
+    },
+    "security": {
+        "aliases": ("51% attack", "double spend", "double-spend", "reorg", "reorganization",
+                    "exploit", "hack", "hacked"),
+    },
+    "development": {
+        "aliases": ("hard fork", "upgrade", "testnet", "client release", "roadmap", "ecip"),
+    },
+    "markets": {
+        "aliases": ("etf", "etp", "listing", "lists", "delisting", "delists", "trading pair",
+                    "trading pairs", "exchange"),
+    },
+}
+
+# Mots (avec $ et % attachés : « $ETC », « 51% ») et ponctuation isolée
+_WORDS = re.compile(r"[\w$%]+|[^\w\s]")
+
+
+# ──────────────────────────────────────────────
+# 1. Automate d'Aho-Corasick
+# ──────────────────────────────────────────────
+
+class Automaton:
+    """Automate multi-motifs sur des séquences de symboles (ici des mots) :
+    `find(seq)` énumère (début, fin, valeur) de toutes les occurrences,
+    chevauchantes comprises, en un passage."""
+
+    def __init__(self, patterns):
+        self._goto = [{}]       # état → {symbole: état}
+        self._fail = [0]
+        self._out  = [[]]       # état → [(longueur, valeur)]
+
+        for word, value in patterns:
+            state = 0
+            for ch in word:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((len(word), value))
+
+        # Liens d'échec en largeur (les états de profondeur 1 échouent vers la
+        # racine) ; chaque état hérite des sorties de son état d'échec
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, seq):
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for end, ch in enumerate(seq, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, value in out[state]:
+                yield end - length, end, value
+
+
+# ──────────────────────────────────────────────
+# 2. Sujets
+# ──────────────────────────────────────────────
+
+def words(text: str) -> list:
+    """Découpage commun aux textes et aux motifs."""
+    return _WORDS.findall(text)
+
+
+class KeywordMatcher:
+    """Sujets d'un texte : un automate pour les alias et exclusions (texte
+    en minuscules), un pour les sigles exacts ; un passage chacun."""
+
+    def __init__(self, topics: dict = None):
+        topics = topics or NEWS_TOPICS
+        folded, exact = [], []
+        for topic, spec in topics.items():
+            folded += [(words(alias.lower()), (topic, False)) for alias in spec.get("aliases", ())]
+            folded += [(words(term.lower()), (topic, True)) for term in spec.get("exclude", ())]
+            exact  += [(words(alias), (topic, False)) for alias in spec.get("exact", ())]
+        self._folded = Automaton(folded)
+        self._exact  = Automaton(exact)
+
+    def topics(self, text: str) -> set:
+        """Sujets dont un alias apparaît dans `text` hors d'une expression exclue."""
+        tokens = words(text)
+        hits, masks = [], []
+        for matches in (self._folded.find([t.lower() for t in tokens]), self._exact.find(tokens)):
+            for start, end, (topic, excluded) in matches:
+                (masks if excluded else hits).append((start, end, topic))
+
+        return {topic for start, end, topic in hits
+                if not any(m_start < end and start < m_end for m_start, m_end, _ in masks)}
+
+    def match_article(self, article: dict) -> set:
+        title = article.get("title") or ""
+        description = article.get("description") or ""
+        return self.topics(f"{title} | {description}")
+
+    def stream(self, articles, required: str = REQUIRED_TOPIC, stats: dict = None):
+        """Filtre un flux d'articles (itérable, page après page) sans le
+        matérialiser : produit les articles du sujet `required`, complétés de
+        `topics`. `stats` reçoit les compteurs seen / removed / rejected / kept."""
+        stats = stats if stats is not None else {}
+        for key in ("seen", "removed", "rejected", "kept"):
+            stats.setdefault(key, 0)
+
+        for article in articles:
+            stats["seen"] += 1
+            # Articles supprimés / placeholders NewsAPI
+            if article.get("title") == "[Removed]" or article.get("description") == "[Removed]":
+                stats["removed"] += 1
+                continue
+            found = self.match_article(article)
+            if required not in found:
+                stats["rejected"] += 1
+                continue
+            stats["kept"] += 1
+            yield dict(article, topics=sorted(found))
+
+
+_default_matcher = None
+
+
+def get_matcher() -> KeywordMatcher:
+    """Matcher partagé, construit une fois par processus sur `NEWS_TOPICS`."""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = KeywordMatcher()
+    return _default_matcher
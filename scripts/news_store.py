@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Index persistant des actualités
+=============================================
+Conserve entre les exécutions chaque actualité déjà traitée (et son résumé),
+indexée par URL normalisée et par empreinte de titre. Seuls les articles
+jamais vus sont envoyés à la reformulation ; les nouveaux sont ajoutés à
+l'archive datée `content/news/YYYY-MM-DD.md`.
+
+Une reprise d'un autre article (voir news_clusters.py) est indexée avec
+`duplicate_of` (clé du représentant) : elle n'a pas de résumé propre et
+n'apparaît que comme source supplémentaire sous son représentant.
+"""
+
+import os
+import re
+import json
+import hashlib
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+INDEX_PATH   = os.path.join("history", "news-index.json")
+ARCHIVE_DIR  = os.path.join("content", "news")
+
+# Paramètres de suivi retirés lors de la normalisation des URL
+_TRACKING_PARAMS = re.compile(r"^(utm_\w+|fbclid|gclid|mc_cid|mc_eid|ref|cmpid)$", re.IGNORECASE)
+
+
+# ──────────────────────────────────────────────
+# 1. Clés de déduplication
+# ──────────────────────────────────────────────
+
+def normalize_url(url: str) -> str:
+    """Normalise une URL : schéma/hôte en minuscules, sans www, sans fragment,
+    sans paramètres de suivi ni slash final."""
+    parts = urlsplit((url or "").strip())
+    host  = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query) if not _TRACKING_PARAMS.match(k)
+    ))
+    return urlunsplit(("https", host, parts.path.rstrip("/"), query, ""))
+
+
+def title_hash(title: str) -> str:
+    """Empreinte d'un titre normalisé (casse, ponctuation et espaces ignorés)."""
+    words = re.findall(r"\w+", (title or "").lower())
+    return hashlib.sha1(" ".join(words).encode("utf-8")).hexdigest()[:16]
+
+
+def article_key(article: dict) -> str:
+    """Clé d'un article dans l'index (empreinte de l'URL normalisée)."""
+    return hashlib.sha1(normalize_url(article.get("url", "")).encode("utf-8")).hexdigest()[:16]
+
+
+# ──────────────────────────────────────────────
+# 2. Lecture / écriture de l'index
+# ──────────────────────────────────────────────
+
+def load_index(path: str = INDEX_PATH) -> dict:
+    """Charge l'index ({"last_published_at", "articles"}) ou un index vide.
+
+    `last_published_at` (publication la plus récente indexée) sert de borne
+    `from` à la requête NewsAPI suivante, même après une lecture tronquée."""
+    if not os.path.exists(path):
+        return {"last_published_at": None, "articles": {}}
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def save_index(index: dict, path: str = INDEX_PATH) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(index, fh, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def iter_unseen(articles, index: dict):
+    """Générateur : articles absents de l'index (ni même URL, ni même titre),
+    en dédupliquant aussi au sein du flux."""
+    seen_keys   = set(index["articles"])
+    seen_titles = {entry["title_hash"] for entry in index["articles"].values()}
+
+    for article in articles:
+        key, thash = article_key(article), title_hash(article.get("title"))
+        if key in seen_keys or thash in seen_titles:
+            continue
+        seen_keys.add(key)
+        seen_titles.add(thash)
+        yield article
+
+
+def filter_unseen(articles: list, index: dict) -> list:
+    """Retourne les articles absents de l'index (voir `iter_unseen`)."""
+    return list(iter_unseen(articles, index))
+
+
+def add_articles(index: dict, articles: list, summaries: dict) -> None:
+    """Ajoute les articles (et leur résumé éventuel, indexé par titre) à l'index."""
+    now = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+    for article in articles:
+        title = article.get("title", "")
+        entry = index["articles"][article_key(article)] = {
+            "title":       title,
+            "title_hash":  title_hash(title),
+            "url":         article.get("url", ""),
+            "source":      (article.get("source") or {}).get("name", ""),
+            "publishedAt": article.get("publishedAt", ""),
+            "description": article.get("description", ""),
+            "summary":     summaries.get(title),
+            "first_seen":  now,
+        }
+        if article.get("duplicate_of"):
+            entry["duplicate_of"] = article["duplicate_of"]
+        published = article.get("publishedAt") or ""
+        if published > (index.get("last_published_at") or ""):
+            index["last_published_at"] = published
+
+
+def originals(index: dict, since: str = "") -> list:
+    """[(clé, entrée)] des articles qui ne reprennent pas un autre article,
+    découverts depuis `since` (ISO 8601), du plus ancien au plus récent."""
+    items = [(key, entry) for key, entry in index["articles"].items()
+             if not entry.get("duplicate_of") and entry["first_seen"] >= since]
+    return sorted(items, key=lambda item: item[1]["first_seen"])
+
+
+def _as_newsapi(index: dict, items: list) -> tuple:
+    """Convertit des entrées d'index [(clé, entrée)] au format NewsAPI + dict
+    {titre: résumé}. Les reprises de chaque entrée sont listées dans `also`."""
+    copies = {}
+    for entry in index["articles"].values():
+        if entry.get("duplicate_of"):
+            copies.setdefault(entry["duplicate_of"], []).append(entry)
+
+    articles = [
+        {
+            "title":       entry["title"],
+            "url":         entry["url"],
+            "source":      {"name": entry["source"]},
+            "publishedAt": entry["publishedAt"],
+            "description": entry["description"],
+            "also":        [{"name": copy["source"], "url": copy["url"]}
+                            for copy in sorted(copies.get(key, ()),
+                                               key=lambda copy: copy.get("publishedAt", ""))],
+        }
+        for key, entry in items
+    ]
+    summaries = {entry["title"]: entry["summary"] for _, entry in items if entry.get("summary")}
+    return articles, summaries
+
+
+def latest(index: dict, n: int = 5) -> tuple:
+    """Retourne les `n` actualités les plus récentes de l'index (articles, résumés)."""
+    items = sorted(originals(index), key=lambda item: item[1].get("publishedAt", ""), reverse=True)
+    return _as_newsapi(index, items[:n])
+
+
+def seen_on(index: dict, day: datetime) -> tuple:
+    """Retourne les actualités découvertes le jour `day` (articles, résumés)."""
+    prefix = day.strftime("%Y-%m-%d")
+    items  = sorted(
+        (item for item in originals(index, prefix) if item[1]["first_seen"].startswith(prefix)),
+        key=lambda item: item[1].get("publishedAt", ""), reverse=True,
+    )
+    return _as_newsapi(index, items)
+
+
+# ──────────────────────────────────────────────
+# 3. Archive datée
+# ──────────────────────────────────────────────
+
+def save_archive_page(markdown: str, day: datetime = None) -> str:
+    """Enregistre la page des actualités découvertes le jour `day` dans content/news/.
+
+    La page est régénérée depuis l'index (`seen_on`) : une relance le même
+    jour complète la page au lieu d'écraser les articles déjà archivés.
+    """
+    day = day or datetime.now()
+    filepath = os.path.join(ARCHIVE_DIR, f"{day.strftime('%Y-%m-%d')}.md")
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    with open(filepath, "w", encoding="utf-8") as fh:
+        fh.write(markdown)
+
+    print(f"✅ Archive d'actualités créée : {filepath}")
+    return filepath
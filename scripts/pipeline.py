@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Pipeline quotidien
+================================
+Point d'entrée unique du workflow : article du jour et actualités dans un
+seul processus, exécutés comme un petit graphe de dépendances. Chaque étape
+démarre dès que celles dont elle dépend sont terminées :
+
+  market ──▶ analysis ──▶ document ──┬──▶ hugo ──▶ digest ──┐
+                                     └──▶ beehiiv          ├──▶ search
+  news ────▶ reformulation ──▶ news_pages ─────────────────┘
+
+Le cours et les actualités sont récupérés en parallèle, l'analyse et la
+reformulation partagent un même client Anthropic, l'écriture Hugo et la
+publication Beehiiv se font côte à côte : la durée totale est celle du
+chemin critique, non la somme des étapes.
+
+Avec `--sites`, le même graphe produit aussi les articles multilingues des
+autres sites du dépôt (voir multi_site.py), avec les mêmes sessions HTTP et
+le même client Anthropic :
+
+  <site>.news ──▶ <site>.source ──▶ translation ──▶ <site>.pages
+
+Le code de sortie n'est non nul que si l'article du jour n'a pas été écrit
+(échec de `CRITICAL_STEPS`) : un échec des actualités, de la synthèse, de la
+recherche ou d'un site multilingue est consigné dans le rapport d'exécution
+sans empêcher le workflow de committer et de déployer l'article.
+
+Variables d'environnement : celles de generate_article.py et de
+fetch_ethereum_news.py (ANTHROPIC_API_KEY, NEWSAPI_API_KEY, BEEHIIV_*).
+
+Usage :
+  python scripts/pipeline.py [--mode batch|concurrent|batch-api] [--news-pages N]
+                             [--page-size N] [--sites all|NOMS]
+                             [--profile cpu|memory|all]
+"""
+
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+import multi_site
+import run_report
+import search_index
+from fetch_ethereum_news import (
+    NEWS_PAGE_SIZE,
+    REFORMULATION_MODES,
+    collect_fresh_news,
+    enough_fresh,
+    make_anthropic_client,
+    write_news_pages,
+)
+from generate_article import (
+    ETC_ASSET,
+    compact_archive,
+    daily_analysis,
+    fetch_etc_data,
+    publish_daily,
+    report_market,
+    write_daily_article,
+)
+from llm_cache import get_cache
+from news_clusters import representatives
+from post_document import build_document
+
+
+PIPELINE_WORKERS = 4     # étapes indépendantes exécutées simultanément
+
+# Étapes sans lesquelles l'article du jour n'est pas écrit : leur échec (ou
+# leur abandon, faute de dépendance) fait échouer le workflow
+CRITICAL_STEPS   = ("market", "hugo")
+
+
+# ──────────────────────────────────────────────
+# 1. Graphe de dépendances
+# ──────────────────────────────────────────────
+
+class Pipeline:
+    """Étapes nommées et leurs dépendances. Une étape reçoit en arguments les
+    résultats de ses dépendances (dans l'ordre déclaré). Si une étape échoue,
+    celles qui en dépendent sont ignorées ; les autres continuent."""
+
+    def __init__(self, max_workers: int = PIPELINE_WORKERS):
+        self.max_workers = max_workers
+        self.tasks       = {}       # nom → (fonction, dépendances)
+        self.results     = {}
+        self.failed      = {}       # nom → exception
+        self.skipped     = []
+        self.timings     = {}       # nom → (début, fin) en s depuis le lancement
+
+    def add(self, name: str, fn, deps: tuple = ()) -> None:
+        unknown = [dep for dep in deps if dep not in self.tasks]
+        if unknown:
+            raise ValueError(f"Étape {name} : dépendance(s) inconnue(s) {unknown}")
+        self.tasks[name] = (fn, tuple(deps))
+
+    def _timed(self, name: str, origin: float):
+        fn, deps = self.tasks[name]
+        start = time.perf_counter() - origin
+        try:
+            return fn(*(self.results[dep] for dep in deps))
+        finally:
+            self.timings[name] = (start, time.perf_counter() - origin)
+
+    def run(self) -> dict:
+        """Exécute le graphe et retourne {étape: résultat} des étapes réussies."""
+        origin  = time.perf_counter()
+        pending = dict(self.tasks)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                for name, (_, deps) in list(pending.items()):
+                    if any(dep in self.failed or dep in self.skipped for dep in deps):
+                        self.skipped.append(name)
+                        del pending[name]
+                    elif all(dep in self.results for dep in deps):
+                        running[pool.submit(self._timed, name, origin)] = name
+                        del pending[name]
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        self.results[name] = future.result()
+                    except Exception as exc:
+                        self.failed[name] = exc
+                        print(f"❌ Étape {name} en échec : {exc}")
+        return self.results
+
+    def critical_path(self) -> float:
+        """Durée du plus long enchaînement de dépendances (s)."""
+        longest = {}
+        for name, (_, deps) in self.tasks.items():   # ordre d'ajout = ordre topologique
+            if name in self.timings:
+                start, end = self.timings[name]
+                longest[name] = (end - start) + max((longest.get(dep, 0.0) for dep in deps),
+                                                    default=0.0)
+        return max(longest.values(), default=0.0)
+
+    def summary(self) -> dict:
+        return {
+            "tasks":           {name: {"start_s": round(start, 3), "end_s": round(end, 3)}
+                                for name, (start, end) in self.timings.items()},
+            "sum_s":           round(sum(end - start for start, end in self.timings.values()), 3),
+            "critical_path_s": round(self.critical_path(), 3),
+            "failed":          sorted(self.failed),
+            "skipped":         self.skipped,
+        }
+
+
+# ──────────────────────────────────────────────
+# 2. Run quotidien
+# ──────────────────────────────────────────────
+
+def build_daily_pipeline(mode: str = "batch", now: datetime = None, pages: int = 1,
+                         page_size: int = NEWS_PAGE_SIZE, sites: list = ()) -> Pipeline:
+    """Graphe du run quotidien (article du jour + actualités sur `pages` pages
+    NewsAPI), étendu aux sites multilingues `sites` (voir multi_site.py)."""
+    now           = now or datetime.now()
+    anthropic_key = os.environ.get("ANTHROPIC_API_KEY", "").strip()
+    newsapi_key   = os.environ.get("NEWSAPI_API_KEY", "").strip()
+    # Client Anthropic unique : analyse de marché et reformulation
+    client        = make_anthropic_client(anthropic_key) if anthropic_key else None
+
+    def market():
+        print("\n📡 Récupération des données de marché…")
+        with run_report.stage("fetch"):
+            etc_data = fetch_etc_data()
+        report_market(etc_data)
+        return etc_data
+
+    def analysis(etc_data):
+        return daily_analysis(etc_data, now, anthropic_key, client=client)
+
+    def document(etc_data, text):
+        return build_document(etc_data, text, now, ETC_ASSET)
+
+    def hugo(etc_data, text, doc):
+        return write_daily_article(etc_data, text, now, doc=doc)
+
+    def beehiiv(etc_data, text, doc):
+        publish_daily(etc_data, text, doc)
+
+    def digest(_):
+        return compact_archive(now)
+
+    def news():
+        if not newsapi_key:
+            print("\n❌ Variable NEWSAPI_API_KEY manquante — module d'actualités désactivé.")
+            return None, []
+        return collect_fresh_news(newsapi_key, pages, page_size)
+
+    def reformulation(collected):
+        _, fresh = collected
+        if not (enough_fresh(fresh) and anthropic_key):
+            return {}
+        print("\n🤖 Reformulation des actualités (Claude)…")
+        with run_report.stage("analysis"):
+            return REFORMULATION_MODES[mode](representatives(fresh), anthropic_key,
+                                             client=client)
+
+    def news_pages(collected, reformulated):
+        index, fresh = collected
+        if fresh:
+            write_news_pages(index, fresh, reformulated)
+        return len(fresh)
+
+    def search(*_):
+        with run_report.stage("search"):
+            stats = search_index.update_index()
+        print(f"\n🔎 Index de recherche ({stats['mode']}) : {stats['added']} document(s) indexé(s), "
+              f"{stats['shards']} fragment(s) écrit(s)")
+        return stats
+
+    pipeline = Pipeline(PIPELINE_WORKERS + len(sites))
+    pipeline.add("market",        market)
+    pipeline.add("news",          news)
+    pipeline.add("analysis",      analysis,      ("market",))
+    pipeline.add("reformulation", reformulation, ("news",))
+    pipeline.add("document",      document,      ("market", "analysis"))
+    pipeline.add("hugo",          hugo,          ("market", "analysis", "document"))
+    pipeline.add("beehiiv",       beehiiv,       ("market", "analysis", "document"))
+    pipeline.add("digest",        digest,        ("hugo",))
+    pipeline.add("news_pages",    news_pages,    ("news", "reformulation"))
+    pipeline.add("search",        search,        ("digest", "news_pages"))
+
+    if sites and not (newsapi_key and client):
+        print("\n⚠️  Clés NEWSAPI_API_KEY / ANTHROPIC_API_KEY requises — sites multilingues ignorés.")
+    elif sites:
+        multi_site.add_site_tasks(pipeline, sites, newsapi_key, client, now, pages, page_size)
+    return pipeline
+
+
+# ──────────────────────────────────────────────
+# 3. Point d'entrée
+# ──────────────────────────────────────────────
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="ETC Tracker — pipeline quotidien")
+    parser.add_argument("--mode", choices=sorted(REFORMULATION_MODES), default="batch",
+                        help="reformulation des actualités (voir fetch_ethereum_news.py)")
+    parser.add_argument("--news-pages", type=int, default=1,
+                        help="nombre de pages NewsAPI à parcourir (défaut : 1)")
+    parser.add_argument("--page-size", type=int, default=NEWS_PAGE_SIZE,
+                        help=f"articles par page NewsAPI (défaut : {NEWS_PAGE_SIZE})")
+    parser.add_argument("--sites", metavar="NOMS", type=multi_site.site_names, default=[],
+                        help="sites multilingues à produire aussi (noms séparés par des "
+                             f"virgules, ou 'all' : {', '.join(multi_site.SITES)})")
+    parser.add_argument("--profile", choices=run_report.PROFILE_MODES,
+                        help="joint au rapport d'exécution un profil cProfile (cpu), "
+                             "tracemalloc (memory) ou les deux (all)")
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    args = parse_args()
+
+    with run_report.run("pipeline", args.profile):
+        print("═══════════════════════════════════════")
+        print("  ETC Tracker — Pipeline quotidien     ")
+        print("═══════════════════════════════════════")
+
+        pipeline = build_daily_pipeline(args.mode, pages=args.news_pages,
+                                        page_size=args.page_size, sites=args.sites)
+        pipeline.run()
+        summary = pipeline.summary()
+        run_report.set_meta(pipeline=summary, mode=args.mode)
+
+        print(f"\n⏱️  Chemin critique {summary['critical_path_s']:.2f} s  |  "
+              f"somme des étapes {summary['sum_s']:.2f} s")
+        print(f"\n{get_cache().summary()}")
+        if pipeline.failed:
+            run_report.count("pipeline.failed", len(pipeline.failed))
+            run_report.count("pipeline.skipped", len(pipeline.skipped))
+            print(f"\n⚠️  Étape(s) en échec : {', '.join(summary['failed'])}"
+                  + (f" — ignorée(s) : {', '.join(pipeline.skipped)}" if pipeline.skipped else ""))
+        missing = [name for name in CRITICAL_STEPS
+                   if name in pipeline.failed or name in pipeline.skipped]
+        if missing:
+            print(f"\n❌ Article du jour non écrit ({', '.join(missing)})")
+            sys.exit(1)
+        print("\nTerminé ✓")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Modèle de document des articles
+=============================================
+Un article quotidien est construit une seule fois sous forme de document
+(dict de champs déjà formatés : titre, signe, emoji, date lisible, tableau
+des indicateurs, paragraphes d'analyse), puis sérialisé par des gabarits
+précompilés vers chaque sortie :
+
+  - `markdown`     : front matter + corps de l'article Hugo ;
+  - `beehiiv_html` : contenu HTML de la newsletter Beehiiv.
+
+Une nouvelle sortie s'ajoute en enregistrant un gabarit dans `TEMPLATES`.
+"""
+
+import html
+from datetime import datetime
+
+
+def fmt_big(n: float) -> str:
+    """Formate un grand nombre en Mrd/M USD."""
+    if n >= 1_000_000_000:
+        return f"{n / 1_000_000_000:.2f} Mrd USD"
+    if n >= 1_000_000:
+        return f"{n / 1_000_000:.2f} M USD"
+    return f"{n:,.0f} USD"
+
+
+def _day_fmt(now: datetime) -> str:
+    """Jour sans zéro initial (Linux : %-d)."""
+    try:
+        return now.strftime("%-d %B %Y")
+    except ValueError:
+        return now.strftime("%d %B %Y").lstrip("0")
+
+
+# ──────────────────────────────────────────────
+# 1. Construction du document
+# ──────────────────────────────────────────────
+
+def build_document(etc_data: dict, analysis: str, now: datetime, asset: dict) -> dict:
+    """Construit le document d'un article : tous les champs affichés, formatés une fois."""
+    up       = etc_data["change_24h"] >= 0
+    sign     = "+" if up else ""
+    date_str = now.strftime("%Y-%m-%d")
+    price    = f"{etc_data['price_usd']:.4f}"
+    change   = f"{sign}{etc_data['change_24h']:.2f}"
+
+    return {
+        "symbol":      asset["symbol"],
+        "name":        asset["name"],
+        "date":        date_str,
+        "timestamp":   now.strftime("%Y-%m-%dT%H:%M:%S"),
+        "day_fmt":     _day_fmt(now),
+        "emoji":       "📈" if up else "📉",
+        "title":       f"{asset['symbol']} {date_str} — {price} $ ({change}%)",
+        "description": f"Cours {asset['name']} du {date_str} : {price} USD, variation 24h {change}%",
+
+        # Valeurs brutes du front matter (relues par price_history)
+        "price_usd":   price,
+        "price_eur":   f"{etc_data['price_eur']:.4f}",
+        "change_24h":  f"{etc_data['change_24h']:.2f}",
+        "change_7d":   f"{etc_data['change_7d']:.2f}",
+        "change_30d":  f"{etc_data['change_30d']:.2f}",
+        "market_cap":  fmt_big(etc_data["market_cap_usd"]),
+        "volume_24h":  fmt_big(etc_data["volume_24h_usd"]),
+
+        "metrics": (
+            ("Prix USD",             f"{price} $"),
+            ("Prix EUR",             f"{etc_data['price_eur']:.4f} €"),
+            ("Variation 24h",        f"{change}%"),
+            ("Variation 7 jours",    f"{etc_data['change_7d']:+.2f}%"),
+            ("Variation 30 jours",   f"{etc_data['change_30d']:+.2f}%"),
+            ("Capitalisation",       fmt_big(etc_data["market_cap_usd"])),
+            ("Volume 24h",           fmt_big(etc_data["volume_24h_usd"])),
+            ("Plus haut historique", f"{etc_data['ath_usd']:.2f} $"),
+        ),
+        "source_name": etc_data.get("source_name", "CoinGecko"),
+        "source_url":  etc_data.get("source_url", "https://www.coingecko.com"),
+        "analysis":    analysis,
+        "paragraphs":  tuple(para.strip() for para in analysis.split("\n\n") if para.strip()),
+    }
+
+
+# ──────────────────────────────────────────────
+# 2. Gabarits
+# ──────────────────────────────────────────────
+
+_MARKDOWN = """\
+---
+title: "{title}"
+date: {timestamp}+01:00
+draft: false
+description: "{description}"
+price_usd: {price_usd}
+price_eur: {price_eur}
+change_24h: {change_24h}
+change_7d: {change_7d}
+change_30d: {change_30d}
+market_cap: "{market_cap}"
+volume_24h: "{volume_24h}"
+---
+
+## Cours du {day_fmt} {emoji}
+
+| Indicateur | Valeur |
+|---|---|
+{rows}
+
+## Analyse du jour
+
+{analysis}
+
+---
+
+*Données : [{source_name}]({source_url}) (API publique). \
+Analyse générée automatiquement par Claude AI (Anthropic). \
+Ce site est fourni à titre informatif uniquement — pas de conseil en investissement.*
+"""
+
+_BEEHIIV_HTML = """
+<h2>Cours du {day_fmt} {emoji}</h2>
+<table>
+  <thead><tr><th>Indicateur</th><th>Valeur</th></tr></thead>
+  <tbody>
+{rows}
+  </tbody>
+</table>
+
+<h2>Analyse du jour</h2>
+{analysis}
+
+<hr>
+<p><em>Données : <a href="{source_url}">{source_name}</a> (API publique).
+Analyse générée automatiquement par Claude AI (Anthropic).
+Ce contenu est fourni à titre informatif uniquement — pas de conseil en investissement.</em></p>
+"""
+
+
+def _markdown(doc: dict, page=_MARKDOWN.format_map, row="| **{}** | {} |".format) -> str:
+    return page(dict(doc, rows="\n".join(row(*metric) for metric in doc["metrics"])))
+
+
+def _beehiiv_html(doc: dict, page=_BEEHIIV_HTML.format_map,
+                  row="    <tr><td><strong>{}</strong></td><td>{}</td></tr>".format,
+                  para="<p>{}</p>".format, escape=html.escape) -> str:
+    return page(dict(
+        doc,
+        rows="\n".join(row(escape(label), escape(value)) for label, value in doc["metrics"]),
+        analysis="".join(para(escape(text)) for text in doc["paragraphs"]),
+    ))
+
+
+# Sorties disponibles : nom → fonction (document → texte). Les gabarits et
+# formateurs de ligne sont liés une fois à la définition des fonctions.
+TEMPLATES = {
+    "markdown":     _markdown,
+    "beehiiv_html": _beehiiv_html,
+}
+
+
+def render(doc: dict, output: str) -> str:
+    """Sérialise le document vers la sortie `output` (voir TEMPLATES)."""
+    return TEMPLATES[output](doc)
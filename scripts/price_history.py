@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Historique des cours (stockage colonnaire)
+========================================================
+Stocke l'historique quotidien du cours ETC dans un fichier binaire à
+enregistrements de taille fixe (un enregistrement par jour, trié par date).
+C'est la source de vérité pour l'historique : les scripts le lisent via
+`read_range` / `latest`, et le graphique Hugo lit les séries précalculées
+par `chart_data` (static/data/etc-chart.json).
+
+Usage :
+  python scripts/price_history.py rebuild   Reconstruit l'historique depuis content/posts/
+"""
+
+import os
+import re
+import sys
+import mmap
+import struct
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+
+
+def history_path(slug: str) -> str:
+    """Fichier d'historique d'un actif (ex. 'etc' → history/etc-daily.bin)."""
+    return os.path.join("history", f"{slug}-daily.bin")
+
+
+HISTORY_PATH = history_path("etc")
+
+# En-tête : signature + version du format
+MAGIC  = b"ETCHIST1"
+
+# Champs numériques stockés, dans l'ordre de l'enregistrement
+FIELDS = (
+    "price_usd",
+    "price_eur",
+    "change_24h",
+    "change_7d",
+    "change_30d",
+    "market_cap_usd",
+    "volume_24h_usd",
+)
+
+# Enregistrement : ordinal du jour (uint32) + 7 flottants double précision
+RECORD = struct.Struct("<I" + "d" * len(FIELDS))
+
+
+# ──────────────────────────────────────────────
+# 1. Encodage / décodage
+# ──────────────────────────────────────────────
+
+def _to_date(day) -> date:
+    """Accepte une date, un datetime ou une chaîne 'YYYY-MM-DD'."""
+    if isinstance(day, datetime):
+        return day.date()
+    if isinstance(day, date):
+        return day
+    return date.fromisoformat(str(day)[:10])
+
+
+def _pack(day, etc_data: dict) -> bytes:
+    """Encode un jour de données de marché en enregistrement binaire."""
+    values = [float(etc_data.get(field) or 0.0) for field in FIELDS]
+    return RECORD.pack(_to_date(day).toordinal(), *values)
+
+
+def _unpack(buf, offset: int) -> dict:
+    """Décode l'enregistrement situé à `offset`."""
+    ordinal, *values = RECORD.unpack_from(buf, offset)
+    record = {"date": date.fromordinal(ordinal).isoformat()}
+    record.update(zip(FIELDS, values))
+    return record
+
+
+class _Ordinals:
+    """Vue séquentielle sur les ordinaux de jour (pour la recherche dichotomique)."""
+
+    def __init__(self, buf, count: int):
+        self.buf   = buf
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, idx: int) -> int:
+        return struct.unpack_from("<I", self.buf, len(MAGIC) + idx * RECORD.size)[0]
+
+
+# ──────────────────────────────────────────────
+# 2. Lecture
+# ──────────────────────────────────────────────
+
+def _read_slice(path: str, select) -> list:
+    """Ouvre l'historique en mémoire partagée et décode les enregistrements
+    dont les indices sont renvoyés par `select(ordinals)`."""
+    if not os.path.exists(path) or os.path.getsize(path) <= len(MAGIC):
+        return []
+
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        if buf[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Fichier d'historique invalide : {path}")
+        count = (len(buf) - len(MAGIC)) // RECORD.size
+        start, stop = select(_Ordinals(buf, count))
+        return [_unpack(buf, len(MAGIC) + idx * RECORD.size) for idx in range(start, stop)]
+
+
+def read_range(start=None, end=None, path: str = HISTORY_PATH) -> list:
+    """Retourne les jours compris entre `start` et `end` (inclus), triés par date.
+
+    Chaque élément est un dict {"date": "YYYY-MM-DD", "price_usd": …, …}.
+    Une borne à None signifie « sans limite ».
+    """
+    def select(ordinals):
+        lo = bisect_left(ordinals, _to_date(start).toordinal()) if start else 0
+        hi = bisect_right(ordinals, _to_date(end).toordinal()) if end else len(ordinals)
+        return lo, max(lo, hi)
+
+    return _read_slice(path, select)
+
+
+def latest(n: int = 1, path: str = HISTORY_PATH) -> list:
+    """Retourne les `n` derniers jours de l'historique, du plus ancien au plus récent."""
+    return _read_slice(path, lambda ordinals: (max(0, len(ordinals) - n), len(ordinals)))
+
+
+# ──────────────────────────────────────────────
+# 3. Écriture
+# ──────────────────────────────────────────────
+
+def append_day(day, etc_data: dict, path: str = HISTORY_PATH) -> None:
+    """Ajoute (ou remplace) le jour `day` à la fin de l'historique.
+
+    Le fichier est en ajout seul : seul le dernier jour peut être réécrit
+    (relance du workflow le même jour). Un jour antérieur au dernier
+    enregistré nécessite `write_days`.
+    """
+    record = _pack(day, etc_data)
+    ordinal = _to_date(day).toordinal()
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if not os.path.exists(path) or os.path.getsize(path) < len(MAGIC):
+        with open(path, "wb") as fh:
+            fh.write(MAGIC + record)
+        return
+
+    with open(path, "r+b") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size - len(MAGIC) >= RECORD.size:
+            fh.seek(size - RECORD.size)
+            last = struct.unpack("<I", fh.read(4))[0]
+            if ordinal < last:
+                raise ValueError(
+                    f"{_to_date(day)} est antérieur au dernier jour enregistré "
+                    f"({date.fromordinal(last)}) — utiliser write_days()."
+                )
+            if ordinal == last:
+                fh.seek(size - RECORD.size)
+                fh.write(record)
+                return
+        fh.seek(size)
+        fh.write(record)
+
+
+def write_days(days: dict, path: str = HISTORY_PATH) -> int:
+    """Fusionne un lot de jours {date: etc_data} dans l'historique et réécrit
+    le fichier en une passe. Retourne le nombre total de jours stockés."""
+    merged = {rec["date"]: rec for rec in read_range(path=path)}
+    for day, etc_data in days.items():
+        merged[_to_date(day).isoformat()] = etc_data
+
+    payload = b"".join(_pack(day, merged[day]) for day in sorted(merged))
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as fh:
+        fh.write(MAGIC + payload)
+    os.replace(tmp_path, path)
+    return len(merged)
+
+
+# ──────────────────────────────────────────────
+# 4. Migration depuis les articles existants
+# ──────────────────────────────────────────────
+
+_FRONT_MATTER = re.compile(r"\A---\n(.*?)\n---", re.DOTALL)
+_BIG_NUMBER   = re.compile(r"([\d.,]+)\s*(Mrd|M)?\s*USD")
+
+
+def _parse_big(text: str) -> float:
+    """Inverse de `fmt_big` : '1.33 Mrd USD' → 1.33e9."""
+    match = _BIG_NUMBER.search(text or "")
+    if not match:
+        return 0.0
+    value = float(match.group(1).replace(",", ""))
+    return value * {"Mrd": 1e9, "M": 1e6}.get(match.group(2), 1)
+
+
+def parse_post_front_matter(filepath: str) -> dict:
+    """Lit le front matter d'un article quotidien et le convertit en etc_data partiel."""
+    with open(filepath, encoding="utf-8") as fh:
+        match = _FRONT_MATTER.match(fh.read())
+    if not match:
+        return {}
+
+    meta = {}
+    for line in match.group(1).splitlines():
+        key, sep, value = line.partition(":")
+        if sep:
+            meta[key.strip()] = value.strip().strip('"')
+
+    if "price_usd" not in meta:
+        return {}
+    return {
+        "price_usd":      float(meta["price_usd"]),
+        "price_eur":      float(meta.get("price_eur") or 0),
+        "change_24h":     float(meta.get("change_24h") or 0),
+        "change_7d":      float(meta.get("change_7d") or 0),
+        "change_30d":     float(meta.get("change_30d") or 0),
+        "market_cap_usd": _parse_big(meta.get("market_cap", "")),
+        "volume_24h_usd": _parse_big(meta.get("volume_24h", "")),
+    }
+
+
+def rebuild_from_posts(posts_dir: str = os.path.join("content", "posts"),
+                       path: str = HISTORY_PATH) -> int:
+    """Reconstruit l'historique à partir du front matter des articles existants,
+    y compris ceux des mois compactés (archive/posts/, voir monthly_digest.py)."""
+    from monthly_digest import archived_days, daily_posts
+
+    days = {}
+    for day, filepath in sorted(dict(archived_days(), **daily_posts(posts_dir)).items()):
+        etc_data = parse_post_front_matter(filepath)
+        if etc_data:
+            days[day] = etc_data
+    return write_days(days, path)
+
+
+# ──────────────────────────────────────────────
+# 5. Point d'entrée
+# ──────────────────────────────────────────────
+
+def main() -> None:
+    command = sys.argv[1] if len(sys.argv) > 1 else "rebuild"
+
+    if command == "rebuild":
+        from chart_data import write_chart_data
+
+        count = rebuild_from_posts()
+        print(f"✅ Historique reconstruit : {count} jour(s) dans {HISTORY_PATH}")
+        print(f"✅ Séries du graphique : {write_chart_data()}")
+    else:
+        print(f"❌ Commande inconnue : {command} (attendu : rebuild)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Sources de prix
+=============================
+Données de marché d'un actif, au format de `fetch_etc_data`, à partir de
+plusieurs fournisseurs interchangeables : CoinGecko (principal),
+CryptoCompare et Kraken (secours).
+
+Politique « première réponse valide », avec requêtes de couverture :
+
+  - la requête principale part seule, sans nouvel essai ni attente
+    Retry-After ; si elle n'a pas répondu au bout du centile
+    `HEDGE_PERCENTILE` de ses latences récentes, la source suivante est
+    interrogée en parallèle (immédiatement si la principale échoue : 429,
+    5xx, réseau, réponse incohérente) ;
+  - la première réponse valide est retenue : prix positif, à moins de
+    `SANITY_BAND` du dernier cours de l'historique s'il est récent ;
+  - contrôle croisé : si le cours retenu s'écarte de plus de
+    `CROSS_CHECK_TOLERANCE` du précédent cours retenu pour l'actif (ou au
+    premier appel du processus), la source suivante non encore interrogée
+    reçoit une requête de confirmation, attendue au plus `CROSS_CHECK_WAIT`,
+    et sa réponse est comparée au cours retenu (écart signalé au-delà de
+    `CROSS_CHECK_TOLERANCE`). Les réponses des sources encore en vol sont
+    comparées à leur arrivée, sans être attendues. Le cours retenu n'est
+    pas remplacé : deux sources en désaccord ne disent pas laquelle se
+    trompe. Un cours stable (tick ordinaire du démon) ne coûte donc qu'une
+    requête ;
+  - les champs qu'une source de secours ne fournit pas (variations 7 j et
+    30 j, cours EUR, capitalisation) sont complétés depuis l'historique des
+    cours ; l'ATH et l'offre maximale, depuis les derniers connus de
+    CoinGecko (`history/<slug>-reference.json`).
+
+La durée de l'étape market est ainsi bornée par le délai de couverture,
+un aller-retour et, si le cours a bougé, l'attente de confirmation, au lieu
+des attentes successives d'une source unique.
+"""
+
+import os
+import json
+import math
+import time
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+
+import http_client
+import price_history
+import run_report
+
+
+PROVIDER_TIMEOUT      = 10.0    # s par requête (pas de nouvel essai : la couverture en tient lieu)
+HEDGE_PERCENTILE      = 0.95    # couverture au-delà du p95 des latences de la source
+HEDGE_DEFAULT_DELAY   = 0.8     # s tant que moins de HEDGE_MIN_SAMPLES latences sont connues
+HEDGE_MIN_SAMPLES     = 20
+HEDGE_MIN_DELAY       = 0.05
+HEDGE_MAX_DELAY       = 3.0
+LATENCY_WINDOW        = 200     # latences conservées par source
+CROSS_CHECK_TOLERANCE = 0.03    # écart relatif toléré entre deux sources
+CROSS_CHECK_WAIT      = 0.3     # s d'attente maximale d'une seconde source
+SANITY_BAND           = 0.5     # écart relatif maximal avec le dernier cours connu…
+SANITY_MAX_AGE        = 3       # …s'il date de moins de 3 jours
+DEFAULT_MAX_SUPPLY    = 210_700_000
+
+
+# ──────────────────────────────────────────────
+# 1. Fournisseurs
+# ──────────────────────────────────────────────
+# Chaque fournisseur retourne les champs qu'il connaît du format commun ;
+# les champs absents (None) sont complétés par `complete`.
+
+def _coingecko(asset: dict) -> dict:
+    params = {
+        "localization":    "false",
+        "tickers":         "false",
+        "market_data":     "true",
+        "community_data":  "false",
+        "developer_data":  "false",
+        "sparkline":       "false",
+    }
+    resp = http_client.get(http_client.url("coingecko", f"/coins/{asset['id']}"),
+                           endpoint="coingecko", params=params,
+                           headers={"Accept": "application/json"}, timeout=PROVIDER_TIMEOUT,
+                           conditional=True, max_attempts=1)
+    resp.raise_for_status()
+    md = resp.json()["market_data"]
+    return {
+        "price_usd":          md["current_price"]["usd"],
+        "price_eur":          md["current_price"]["eur"],
+        "change_24h":         md.get("price_change_percentage_24h")  or 0.0,
+        "change_7d":          md.get("price_change_percentage_7d")   or 0.0,
+        "change_30d":         md.get("price_change_percentage_30d")  or 0.0,
+        "market_cap_usd":     md["market_cap"]["usd"],
+        "volume_24h_usd":     md["total_volume"]["usd"],
+        "ath_usd":            md["ath"]["usd"],
+        "ath_date":           md["ath_date"]["usd"][:10],
+        "circulating_supply": md.get("circulating_supply") or 0,
+        "max_supply":         md.get("max_supply") or DEFAULT_MAX_SUPPLY,
+    }
+
+
+def _cryptocompare(asset: dict) -> dict:
+    params = {"fsyms": asset["symbol"], "tsyms": "USD,EUR"}
+    resp = http_client.get(http_client.url("cryptocompare", "/data/pricemultifull"),
+                           endpoint="cryptocompare", params=params, timeout=PROVIDER_TIMEOUT,
+                           max_attempts=1)
+    resp.raise_for_status()
+    raw = resp.json()["RAW"][asset["symbol"]]
+    usd, eur = raw["USD"], raw.get("EUR") or {}
+    return {
+        "price_usd":          usd["PRICE"],
+        "price_eur":          eur.get("PRICE"),
+        "change_24h":         usd.get("CHANGEPCT24HOUR") or 0.0,
+        "market_cap_usd":     usd.get("MKTCAP"),
+        "volume_24h_usd":     usd.get("TOTALVOLUME24HTO"),
+        "circulating_supply": usd.get("CIRCULATINGSUPPLY") or usd.get("SUPPLY"),
+    }
+
+
+def _kraken(asset: dict) -> dict:
+    """Cours d'échange Kraken. La variation est mesurée depuis l'ouverture du
+    jour (UTC), la seule référence fournie par le ticker."""
+    symbol = asset["symbol"]
+    resp = http_client.get(http_client.url("kraken", "/0/public/Ticker"), endpoint="kraken",
+                           params={"pair": f"{symbol}USD,{symbol}EUR"},
+                           timeout=PROVIDER_TIMEOUT, max_attempts=1)
+    resp.raise_for_status()
+    body = resp.json()
+    if body.get("error"):
+        raise ValueError(f"Kraken : {', '.join(body['error'])}")
+    pairs = {pair[-3:]: ticker for pair, ticker in body["result"].items()}
+    usd, eur = pairs["USD"], pairs.get("EUR")
+    last, opening = float(usd["c"][0]), float(usd["o"])
+    return {
+        "price_usd":  last,
+        "price_eur":  float(eur["c"][0]) if eur else None,
+        "change_24h": (last / opening - 1) * 100 if opening else 0.0,
+    }
+
+
+# Ordre de préférence ; le premier est la source principale
+PROVIDERS = (
+    ("coingecko",     _coingecko,     "CoinGecko",     "https://www.coingecko.com"),
+    ("cryptocompare", _cryptocompare, "CryptoCompare", "https://www.cryptocompare.com"),
+    ("kraken",        _kraken,        "Kraken",        "https://www.kraken.com"),
+)
+
+
+# ──────────────────────────────────────────────
+# 2. Validation et complétion
+# ──────────────────────────────────────────────
+
+REFERENCE_FIELDS = ("ath_usd", "ath_date", "max_supply")
+
+
+def reference_path(slug: str) -> str:
+    """Derniers ATH et offre maximale connus d'un actif (mis à jour par CoinGecko)."""
+    return os.path.join("history", f"{slug}-reference.json")
+
+
+def load_reference(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def save_reference(data: dict, path: str) -> None:
+    """Enregistre les champs de référence de `data` s'ils ont changé."""
+    reference = {key: data[key] for key in REFERENCE_FIELDS if data.get(key) is not None}
+    if len(reference) < len(REFERENCE_FIELDS) or reference == load_reference(path):
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(reference, fh, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def is_valid(data: dict, reference: float = None) -> bool:
+    """Prix positif et fini, à moins de `SANITY_BAND` du cours de référence."""
+    price = data.get("price_usd")
+    if not isinstance(price, (int, float)) or not math.isfinite(price) or price <= 0:
+        return False
+    return not reference or abs(price / reference - 1) <= SANITY_BAND
+
+
+def complete(data: dict, now: datetime = None, path: str = price_history.HISTORY_PATH,
+             ref_path: str = reference_path("etc")) -> dict:
+    """Complète les champs absents d'une réponse depuis l'historique des cours
+    (`path`) et les dernières références connues (`ref_path`)."""
+    if all(data.get(key) is not None for key in
+           ("price_eur", "change_7d", "change_30d", "market_cap_usd", "volume_24h_usd", "ath_usd")):
+        return data
+
+    day     = (now or datetime.now()).date()
+    records = {rec["date"]: rec for rec in
+               price_history.read_range(day - timedelta(days=30), day - timedelta(days=1), path)}
+    last    = (price_history.latest(1, path) or [{}])[0]
+    price   = data["price_usd"]
+
+    def change(days: int) -> float:
+        past = records.get((day - timedelta(days=days)).isoformat())
+        return (price / past["price_usd"] - 1) * 100 if past and past["price_usd"] else 0.0
+
+    def scaled(field: str) -> float:
+        return price * last[field] / last["price_usd"] if last.get("price_usd") else 0.0
+
+    data = dict(data)
+    data["price_eur"]      = data.get("price_eur") or scaled("price_eur")
+    data["change_7d"]      = data.get("change_7d") if data.get("change_7d") is not None else change(7)
+    data["change_30d"]     = data.get("change_30d") if data.get("change_30d") is not None else change(30)
+    data["market_cap_usd"] = data.get("market_cap_usd") or scaled("market_cap_usd")
+    data["volume_24h_usd"] = data.get("volume_24h_usd") or last.get("volume_24h_usd") or 0.0
+    data["circulating_supply"] = (data.get("circulating_supply")
+                                  or (data["market_cap_usd"] / price if price else 0))
+
+    # ATH : dernier connu, à défaut le plus haut de l'historique ; dépassé → aujourd'hui
+    if data.get("ath_usd") is None:
+        reference = load_reference(ref_path)
+        if reference:
+            peak = {"price_usd": reference["ath_usd"], "date": reference["ath_date"]}
+        else:
+            peak = max(price_history.read_range(path=path), key=lambda rec: rec["price_usd"],
+                       default={"price_usd": 0.0, "date": day.isoformat()})
+        data["ath_usd"], data["ath_date"] = ((price, day.isoformat()) if price > peak["price_usd"]
+                                             else (peak["price_usd"], peak["date"]))
+        data["max_supply"] = data.get("max_supply") or reference.get("max_supply")
+    data["max_supply"]     = data.get("max_supply") or DEFAULT_MAX_SUPPLY
+    return data
+
+
+# ──────────────────────────────────────────────
+# 3. Requêtes couvertes
+# ──────────────────────────────────────────────
+
+class PriceSources:
+    """Fournisseurs de prix interrogés selon la politique « première réponse
+    valide », avec latences récentes par source (délai de couverture) et
+    pool de threads partagé entre les appels (démon, pipeline)."""
+
+    def __init__(self, providers: tuple = PROVIDERS):
+        self.providers = providers
+        self.latencies = {name: deque(maxlen=LATENCY_WINDOW) for name, *_ in providers}
+        self.quotes    = {}     # slug → dernier cours retenu
+        self._lock     = threading.Lock()
+        self._pool     = ThreadPoolExecutor(max_workers=2 * len(providers),
+                                            thread_name_prefix="price")
+
+    def hedge_delay(self, name: str) -> float:
+        """Délai avant couverture : centile `HEDGE_PERCENTILE` des latences
+        récentes de la source, borné ; valeur par défaut faute d'historique."""
+        with self._lock:
+            samples = sorted(self.latencies[name])
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY
+        value = samples[min(len(samples) - 1, int(len(samples) * HEDGE_PERCENTILE))]
+        return min(HEDGE_MAX_DELAY, max(HEDGE_MIN_DELAY, value))
+
+    def _call(self, name: str, fn, asset: dict) -> dict:
+        start = time.perf_counter()
+        data  = fn(asset)
+        with self._lock:
+            self.latencies[name].append(time.perf_counter() - start)
+        return data
+
+    def fetch(self, asset: dict, now: datetime = None) -> dict:
+        """Données de marché de `asset` : première réponse valide parmi les
+        sources, complétée depuis l'historique. Lève RuntimeError si aucune
+        source ne répond correctement."""
+        now       = now or datetime.now()
+        path      = price_history.history_path(asset["slug"])
+        last      = price_history.latest(1, path)
+        recent    = (now - timedelta(days=SANITY_MAX_AGE)).strftime("%Y-%m-%d")
+        reference = last[0]["price_usd"] if last and last[0]["date"] >= recent else None
+        queue     = list(self.providers)
+        running   = {}        # future → source
+        errors    = {}
+
+        def launch() -> str:
+            name, fn, *_ = queue.pop(0)
+            running[self._pool.submit(self._call, name, fn, asset)] = name
+            run_report.count(f"price.{name}.requests")
+            return name
+
+        latest_source = launch()
+        while running:
+            delay = self.hedge_delay(latest_source) if queue else None
+            done, _ = wait(running, timeout=delay, return_when=FIRST_COMPLETED)
+            if not done:
+                print(f"   ⏱️  {latest_source} sans réponse après {delay:.2f}s — "
+                      f"requête de couverture vers {queue[0][0]}")
+                run_report.count("price.hedged")
+                latest_source = launch()
+                continue
+
+            for future in done:
+                name = running.pop(future)
+                try:
+                    data = future.result()
+                    if not is_valid(data, reference):
+                        raise ValueError(f"cours incohérent ({data.get('price_usd')!r})")
+                except Exception as exc:
+                    errors[name] = exc
+                    run_report.count(f"price.{name}.errors")
+                    print(f"   ⚠️  {name} : {exc}")
+                    if queue:
+                        latest_source = launch()
+                    continue
+
+                confirm = bool(queue) and self._moved(asset["slug"], data["price_usd"])
+                if confirm:
+                    launch()        # requête de confirmation
+                self._cross_check(name, data, running, wait_first=confirm)
+                run_report.set_meta(price_source=name)
+                ref_path = reference_path(asset["slug"])
+                save_reference(data, ref_path)
+                return complete(dict(data, **self._attribution(name)), now, path, ref_path)
+
+        raise RuntimeError("Aucune source de prix disponible ("
+                           + "; ".join(f"{name} : {exc}" for name, exc in errors.items()) + ")")
+
+    def _attribution(self, name: str) -> dict:
+        label, link = next((label, link) for source, _, label, link in self.providers
+                           if source == name)
+        return {"source_name": label, "source_url": link}
+
+    def _moved(self, slug: str, price: float) -> bool:
+        """Enregistre le cours retenu ; vrai au premier cours de l'actif ou
+        s'il s'écarte de plus de `CROSS_CHECK_TOLERANCE` du précédent."""
+        with self._lock:
+            previous, self.quotes[slug] = self.quotes.get(slug), price
+        return not previous or abs(price / previous - 1) > CROSS_CHECK_TOLERANCE
+
+    def _cross_check(self, name: str, data: dict, running: dict,
+                     wait_first: bool = False) -> None:
+        """Compare le cours retenu aux réponses des autres sources en vol, à
+        leur arrivée ; avec `wait_first`, attend au plus `CROSS_CHECK_WAIT`
+        la première d'entre elles (requête de confirmation)."""
+        def compare(future, other: str) -> None:
+            if future.exception() is not None:
+                return
+            price = future.result().get("price_usd")
+            if not is_valid({"price_usd": price}):
+                return
+            run_report.count("price.cross_checked")
+            gap = abs(price / data["price_usd"] - 1)
+            if gap > CROSS_CHECK_TOLERANCE:
+                run_report.count("price.mismatch")
+                print(f"   ⚠️  Écart de {gap:.1%} entre {name} ({data['price_usd']}) "
+                      f"et {other} ({price})")
+
+        if not running:
+            return
+        done = set()
+        if wait_first:
+            done, _ = wait(running, timeout=CROSS_CHECK_WAIT, return_when=FIRST_COMPLETED)
+        for future, other in running.items():
+            if future in done:
+                compare(future, other)
+            else:
+                future.add_done_callback(lambda f, other=other: compare(f, other))
+
+
+_default_sources = None
+
+
+def get_price_sources() -> PriceSources:
+    global _default_sources
+    if _default_sources is None:
+        _default_sources = PriceSources()
+    return _default_sources
+
+
+def fetch_market_data(asset: dict, now: datetime = None) -> dict:
+    """Données de marché de `asset` au format commun (voir module)."""
+    return get_price_sources().fetch(asset, now)
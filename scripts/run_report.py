@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Instrumentation et rapports d'exécution
+=====================================================
+Mesure chaque exécution des scripts quotidiens et l'enregistre dans un
+rapport JSON (reports/<script>-<horodatage>.json) :
+
+  - durée de chaque étape (`with run_report.stage("fetch"): …`) ;
+  - compteurs incrémentés par les modules partagés : requêtes HTTP et
+    nouvelles tentatives par service (http_client), appels Claude, réponses
+    servies par le cache et jetons consommés (llm_cache, llm_batch) ;
+  - détail de chaque appel Claude envoyé : route, modèle, latence, jetons
+    et budget atteint (llm_routing) ;
+  - sur demande (`--profile cpu|memory|all`), profil cProfile (fichier .prof
+    et fonctions les plus coûteuses) et pic mémoire tracemalloc.
+
+Les compteurs et étapes s'accumulent dans un rapport global, même quand
+aucun script ne l'a démarré (bibliothèque utilisée seule, benchmarks) :
+seul `finish` écrit un fichier.
+
+Usage :
+  python scripts/run_report.py summary [JOURS]   p50/p95 des étapes sur les N derniers jours (30)
+  python scripts/run_report.py routes [JOURS]    latence et jetons des appels Claude par route
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import statistics
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+
+REPORTS_DIR   = os.environ.get("RUN_REPORTS_DIR", "reports")
+PROFILE_MODES = ("cpu", "memory", "all")
+PROFILE_TOP   = 25     # fonctions / sites d'allocation conservés dans le rapport
+CALLS_KEPT    = 2000   # appels Claude détaillés conservés par rapport
+
+
+class RunReport:
+    """Étapes chronométrées, compteurs et métadonnées d'une exécution."""
+
+    def __init__(self, script: str = "", profile: str = None):
+        self.script     = script
+        self.started_at = datetime.now()
+        self.started    = time.perf_counter()
+        self.stages     = defaultdict(lambda: {"seconds": 0.0, "calls": 0})
+        self.counters   = defaultdict(int)
+        self.meta       = {}
+        self.llm_calls  = []
+        self.profile    = profile
+        self._lock      = threading.Lock()
+        self._profiler  = None
+        self._stats     = None
+
+        if profile in ("cpu", "all"):
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        if profile in ("memory", "all"):
+            import tracemalloc
+
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Chronomètre un bloc ; les durées d'une même étape s'additionnent."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.stages[name]["seconds"] += elapsed
+                self.stages[name]["calls"]   += 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += n
+
+    def record_call(self, call: dict) -> None:
+        """Consigne un appel Claude (les `CALLS_KEPT` premiers d'une exécution)."""
+        with self._lock:
+            if len(self.llm_calls) < CALLS_KEPT:
+                self.llm_calls.append(call)
+
+    def _profile_data(self) -> dict:
+        """Arrête les profileurs et résume leurs mesures."""
+        data = {}
+        if self._profiler is not None:
+            import pstats
+
+            self._profiler.disable()
+            stats = pstats.Stats(self._profiler)
+            data["cpu"] = [
+                {
+                    "function":   f"{os.path.basename(filename)}:{line}({func})",
+                    "calls":      calls,
+                    "tottime_s":  round(tottime, 4),
+                    "cumtime_s":  round(cumtime, 4),
+                }
+                for (filename, line, func), (_, calls, tottime, cumtime, _) in sorted(
+                    stats.stats.items(), key=lambda item: item[1][3], reverse=True
+                )[:PROFILE_TOP]
+            ]
+            self._stats = stats
+
+        import tracemalloc
+
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics("lineno")[:PROFILE_TOP]
+            tracemalloc.stop()
+            data["memory"] = {
+                "current_kb": round(current / 1024, 1),
+                "peak_kb":    round(peak / 1024, 1),
+                "top":        [{"site": str(stat.traceback), "kb": round(stat.size / 1024, 1),
+                                "count": stat.count} for stat in top],
+            }
+        return data
+
+    def to_dict(self, status: str = "ok") -> dict:
+        with self._lock:
+            return {
+                "script":      self.script,
+                "started_at":  self.started_at.isoformat(timespec="seconds"),
+                "duration_s":  round(time.perf_counter() - self.started, 3),
+                "status":      status,
+                "stages":      {name: {"seconds": round(s["seconds"], 4), "calls": s["calls"]}
+                                for name, s in self.stages.items()},
+                "counters":    dict(sorted(self.counters.items())),
+                "meta":        dict(self.meta),
+                "llm_calls":   list(self.llm_calls),
+            }
+
+    def finish(self, status: str = "ok", out_dir: str = REPORTS_DIR) -> str:
+        """Écrit le rapport JSON (et le profil .prof éventuel). Retourne son chemin."""
+        data = self.to_dict(status)
+        profile = self._profile_data() if self.profile else {}
+
+        os.makedirs(out_dir, exist_ok=True)
+        base = os.path.join(out_dir, f"{self.script}-{self.started_at.strftime('%Y%m%d-%H%M%S')}")
+        if profile:
+            data["profile"] = profile
+            if "cpu" in profile:
+                self._stats.dump_stats(base + ".prof")
+                data["profile"]["prof_file"] = base + ".prof"
+
+        with open(base + ".json", "w", encoding="utf-8") as fh:
+            json.dump(data, fh, ensure_ascii=False, indent=2)
+        return base + ".json"
+
+
+# ──────────────────────────────────────────────
+# 1. Rapport global
+# ──────────────────────────────────────────────
+
+_current = RunReport()
+
+
+def start(script: str, profile: str = None) -> RunReport:
+    """Démarre le rapport de l'exécution en cours (remplace le rapport global)."""
+    global _current
+    _current = RunReport(script, profile)
+    return _current
+
+
+def current() -> RunReport:
+    return _current
+
+
+def stage(name: str):
+    return _current.stage(name)
+
+
+def count(name: str, n: int = 1) -> None:
+    _current.count(name, n)
+
+
+def set_meta(**values) -> None:
+    _current.meta.update(values)
+
+
+def record_usage(usage, prefix: str = "llm") -> None:
+    """Ajoute les jetons d'un objet `usage` Anthropic aux compteurs."""
+    if usage is None:
+        return
+    count(f"{prefix}.input_tokens",  getattr(usage, "input_tokens", 0) or 0)
+    count(f"{prefix}.output_tokens", getattr(usage, "output_tokens", 0) or 0)
+
+
+def record_call(route: str, model: str, seconds: float, usage=None,
+                max_tokens: int = None, stop_reason: str = None) -> None:
+    """Consigne un appel Claude envoyé : route, latence, jetons et budget."""
+    _current.record_call({
+        "route":         route,
+        "model":         model,
+        "seconds":       round(seconds, 4),
+        "input_tokens":  getattr(usage, "input_tokens", 0) or 0,
+        "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+        "max_tokens":    max_tokens,
+        "truncated":     stop_reason == "max_tokens",
+    })
+
+
+def finish(status: str = "ok", out_dir: str = REPORTS_DIR) -> str:
+    return _current.finish(status, out_dir)
+
+
+@contextmanager
+def run(script: str, profile: str = None):
+    """Encadre le `main()` d'un script : démarre le rapport, le termine avec
+    le statut « ok » ou « error », et affiche son emplacement."""
+    start(script, profile)
+    status = "error"
+    try:
+        yield _current
+        status = "ok"
+    except SystemExit as exc:
+        status = "ok" if not exc.code else "error"
+        raise
+    finally:
+        print(f"\n⏱️  Rapport d'exécution : {finish(status)}")
+
+
+# ──────────────────────────────────────────────
+# 2. Synthèse sur plusieurs jours
+# ──────────────────────────────────────────────
+
+def _percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def _recent_reports(days: int, out_dir: str):
+    """Rapports JSON des `days` derniers jours."""
+    cutoff = datetime.now() - timedelta(days=days)
+    for path in glob.glob(os.path.join(out_dir, "*.json")):
+        try:
+            with open(path, encoding="utf-8") as fh:
+                data = json.load(fh)
+            started = datetime.fromisoformat(data["started_at"])
+        except (OSError, ValueError, KeyError):
+            continue
+        if started >= cutoff:
+            yield data
+
+
+def summarize(days: int = 30, out_dir: str = REPORTS_DIR) -> dict:
+    """Retourne {script: {étape: {"runs", "p50_s", "p95_s"}}} sur les `days` derniers jours."""
+    samples = defaultdict(lambda: defaultdict(list))
+    for data in _recent_reports(days, out_dir):
+        samples[data["script"]]["total"].append(data["duration_s"])
+        for name, s in data.get("stages", {}).items():
+            samples[data["script"]][name].append(s["seconds"])
+
+    return {
+        script: {
+            name: {"runs": len(values), "p50_s": round(statistics.median(values), 3),
+                   "p95_s": round(_percentile(values, 0.95), 3)}
+            for name, values in stages.items()
+        }
+        for script, stages in samples.items()
+    }
+
+
+def summarize_calls(days: int = 30, out_dir: str = REPORTS_DIR) -> dict:
+    """Retourne {route: {"calls", "p50_s", "p95_s", "input_avg", "output_avg",
+    "truncated"}} sur les appels Claude des `days` derniers jours."""
+    calls = defaultdict(list)
+    for data in _recent_reports(days, out_dir):
+        for call in data.get("llm_calls", []):
+            calls[call["route"]].append(call)
+
+    return {
+        route: {
+            "calls":      len(items),
+            "p50_s":      round(statistics.median(c["seconds"] for c in items), 3),
+            "p95_s":      round(_percentile([c["seconds"] for c in items], 0.95), 3),
+            "input_avg":  round(statistics.mean(c["input_tokens"] for c in items)),
+            "output_avg": round(statistics.mean(c["output_tokens"] for c in items)),
+            "truncated":  sum(c["truncated"] for c in items),
+        }
+        for route, items in calls.items()
+    }
+
+
+def print_calls(days: int) -> None:
+    summary = summarize_calls(days)
+    if not summary:
+        print(f"ℹ️  Aucun appel Claude consigné dans {REPORTS_DIR}/ sur les {days} derniers jours.")
+        return
+    print(f"\n🧭 Appels Claude par route ({days} jours)")
+    for route, s in sorted(summary.items()):
+        print(f"   {route:<28} {s['calls']:>5} appel(s)   p50 {s['p50_s']:7.3f} s   "
+              f"p95 {s['p95_s']:7.3f} s   jetons {s['input_avg']:>5} → {s['output_avg']:<4}  "
+              f"budget atteint {s['truncated']}")
+    print("\nTerminé ✓")
+
+
+def main() -> None:
+    command = sys.argv[1] if len(sys.argv) > 1 else "summary"
+    if command not in ("summary", "routes"):
+        print(f"❌ Commande inconnue : {command} (attendu : summary, routes)")
+        sys.exit(1)
+
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    if command == "routes":
+        print_calls(days)
+        return
+    summary = summarize(days)
+    if not summary:
+        print(f"ℹ️  Aucun rapport dans {REPORTS_DIR}/ sur les {days} derniers jours.")
+        return
+    for script, stages in sorted(summary.items()):
+        print(f"\n📊 {script}")
+        for name, s in sorted(stages.items(), key=lambda item: -item[1]["p50_s"]):
+            print(f"   {name:<14} {s['runs']:>4} exécution(s)   p50 {s['p50_s']:8.3f} s   "
+                  f"p95 {s['p95_s']:8.3f} s")
+    print("\nTerminé ✓")
+
+
+if __name__ == "__main__":
+    main()
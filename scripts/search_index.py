@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Index de recherche
+================================
+Construit l'index de recherche de la page /search/ (content/search.md) à
+partir du front matter et du corps des articles (content/posts/) et des
+pages (content/pages/). L'index est un index inversé découpé en petits
+fichiers JSON statiques (static/data/search/), servis tels quels par Hugo :
+
+  - `meta.json`           : version, longueur de préfixe, mois indexés,
+                            fragments existants, mots vides et termes trop
+                            fréquents pour être discriminants ;
+  - `terms/<xxx>.json`    : termes commençant par `xxx` → [df, [[réf, poids], …]] ;
+  - `terms/d<AAAA-MM>.json` : dates (AAAA-MM-JJ) du mois ;
+  - `docs/<AAAA-MM>.json` : documents du mois [url, titre, date, description, empreinte].
+
+Une réf. `AAAA-MM/k` désigne le k-ième document du fragment du mois. Une
+recherche ne charge que `meta.json`, un fragment de termes par mot tapé et
+les fragments de documents des mois trouvés : quelques Ko, quelle que soit
+la taille de l'archive (listes limitées à `MAX_POSTINGS` entrées par terme).
+
+Mise à jour incrémentale : seuls les documents nouveaux ou modifiés (empreinte
+du fichier) sont analysés, et seuls les fragments de leurs termes réécrits.
+Un document modifié ou supprimé laisse une entrée vide (`null`) dans son
+fragment de mois (les réf. des autres documents restent valables) ; ses
+entrées sont retirées des fragments de termes et leur `df` décrémenté, à
+partir de la liste de ses termes conservée hors du site (`TERMS_DIR`,
+un fichier par mois aligné sur `docs/<AAAA-MM>.json`). L'index est
+reconstruit entièrement quand les entrées vides dépassent `COMPACT_RATIO`
+des documents.
+
+Usage :
+  python scripts/search_index.py             Mise à jour incrémentale
+  python scripts/search_index.py --rebuild   Reconstruction complète
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import unicodedata
+from collections import defaultdict
+
+
+INDEX_DIR = os.path.join("static", "data", "search")
+TERMS_DIR = os.path.join("history", "search-terms")     # termes de chaque document indexé
+SOURCES   = (os.path.join("content", "posts"), os.path.join("content", "pages"))
+
+PREFIX_LEN      = 3       # caractères du préfixe de fragment des termes
+MAX_POSTINGS    = 50      # documents conservés par terme (meilleurs poids, puis plus récents)
+COMMON_RATIO    = 0.5     # terme présent dans plus de 50 % des documents → ignoré
+COMMON_MIN_DOCS = 20      # … à partir de ce nombre de documents
+COMPACT_RATIO   = 0.1     # entrées vides tolérées avant reconstruction complète
+
+# Poids d'une occurrence selon le champ
+FIELD_WEIGHTS = {"title": 3, "description": 2, "body": 1}
+
+STOPWORDS = frozenset("""
+au aux avec ce ces dans de des du elle en et eux il ils je la le les leur lui ma mais me meme
+mes moi mon ne nos notre nous on ou par pas pour qu que qui sa se ses son sur ta te tes toi ton
+tu un une vos votre vous est sont ete etre avoir fait plus moins tres cette cet entre depuis
+sans sous apres avant comme aussi ainsi dont donc alors si
+the and for with from that this are was were has have had its into over than not but all
+""".split())
+
+_FRONT_MATTER = re.compile(r"\A---\n(.*?)\n---\n?", re.DOTALL)
+_TOKEN        = re.compile(r"\d{4}-\d{2}-\d{2}|[a-z0-9]+")
+_DATE_TERM    = re.compile(r"\d{4}-\d{2}-\d{2}")
+_LINK_TARGET  = re.compile(r"\]\([^)]*\)|https?://\S+")
+
+
+# ──────────────────────────────────────────────
+# 1. Analyse des documents
+# ──────────────────────────────────────────────
+
+def normalize(text: str) -> str:
+    """Minuscules sans accents (même normalisation que le script de la page)."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text: str) -> list:
+    """Termes indexés : mots d'au moins 2 caractères hors mots vides, et dates
+    AAAA-MM-JJ entières ; les nombres isolés (cours, variations) sont ignorés."""
+    return [term for term in _TOKEN.findall(normalize(text))
+            if len(term) >= 2 and term not in STOPWORDS and not term.isdigit()]
+
+
+def shard_key(term: str) -> str:
+    """Fragment d'un terme : mois pour une date, préfixe sinon."""
+    if _DATE_TERM.fullmatch(term):
+        return "d" + term[:7]
+    return term[:PREFIX_LEN]
+
+
+def _front_matter(text: str) -> tuple:
+    """Sépare le front matter (dict de chaînes) du corps Markdown."""
+    match = _FRONT_MATTER.match(text)
+    if not match:
+        return {}, text
+    meta = {}
+    for line in match.group(1).splitlines():
+        key, sep, value = line.partition(":")
+        if sep:
+            meta[key.strip()] = value.strip().strip('"')
+    return meta, text[match.end():]
+
+
+def document_url(path: str, meta: dict) -> str:
+    """URL Hugo du fichier : `url` du front matter, sinon /<section>/<slug>/."""
+    section = os.path.basename(os.path.dirname(path))
+    slug    = meta.get("slug") or os.path.splitext(os.path.basename(path))[0]
+    return meta.get("url") or f"/{section}/{slug}/"
+
+
+def parse_document(path: str, text: str) -> dict:
+    """Front matter (titre, date, description, url) et poids des termes d'un fichier Markdown."""
+    meta, body = _front_matter(text)
+    fields = {
+        "title":       meta.get("title") or os.path.splitext(os.path.basename(path))[0],
+        "description": meta.get("description", ""),
+        "body":        _LINK_TARGET.sub(" ", body),
+    }
+    weights = defaultdict(int)
+    for field, value in fields.items():
+        for term in tokenize(value):
+            weights[term] += FIELD_WEIGHTS[field]
+
+    return {
+        "url":         document_url(path, meta),
+        "title":       fields["title"],
+        "date":        meta.get("date", "")[:10],
+        "description": fields["description"],
+        "terms":       dict(weights),
+    }
+
+
+def _fingerprint(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:10]
+
+
+def scan(sources=SOURCES) -> dict:
+    """Retourne {chemin: (contenu, empreinte)} des fichiers Markdown indexables."""
+    files = {}
+    for directory in sources:
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".md") or name.startswith("_"):
+                continue
+            path = os.path.join(directory, name)
+            with open(path, encoding="utf-8") as fh:
+                text = fh.read()
+            files[path] = (text, _fingerprint(text))
+    return files
+
+
+# ──────────────────────────────────────────────
+# 2. Lecture / écriture des fragments
+# ──────────────────────────────────────────────
+
+def _read_json(path: str, default):
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return default
+
+
+def _write_json(path: str, data) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def _ref_order(posting: list) -> tuple:
+    """Tri des listes : poids décroissant, puis document le plus récent."""
+    month, k = posting[0].split("/")
+    return posting[1], month, int(k)
+
+
+def _cap(postings: list) -> list:
+    return sorted(postings, key=_ref_order, reverse=True)[:MAX_POSTINGS]
+
+
+def _is_common(df: int, total: int) -> bool:
+    return total >= COMMON_MIN_DOCS and df > COMMON_RATIO * total
+
+
+# ──────────────────────────────────────────────
+# 3. Construction
+# ──────────────────────────────────────────────
+
+def build_index(files: dict, out_dir: str = INDEX_DIR, version: int = 0,
+                terms_dir: str = TERMS_DIR) -> dict:
+    """Reconstruction complète à partir de `files` ({chemin: (contenu, empreinte)})."""
+    docs = sorted(
+        ((parse_document(path, text), digest) for path, (text, digest) in files.items()),
+        key=lambda item: (item[0]["date"], item[0]["url"]),
+    )
+
+    months   = defaultdict(list)
+    doc_terms = defaultdict(list)
+    postings = defaultdict(list)
+    for doc, digest in docs:
+        month = doc["date"][:7] or "0000-00"
+        ref   = f"{month}/{len(months[month])}"
+        months[month].append([doc["url"], doc["title"], doc["date"], doc["description"], digest])
+        doc_terms[month].append(sorted(doc["terms"]))
+        for term, weight in doc["terms"].items():
+            postings[term].append([ref, weight])
+
+    common = sorted(term for term, plist in postings.items() if _is_common(len(plist), len(docs)))
+    shards = defaultdict(dict)
+    for term, plist in postings.items():
+        if not _is_common(len(plist), len(docs)):
+            shards[shard_key(term)][term] = [len(plist), _cap(plist)]
+
+    _clear(out_dir)
+    _clear_dir(terms_dir)
+    for month, entries in months.items():
+        _write_json(os.path.join(out_dir, "docs", f"{month}.json"), entries)
+        _write_json(os.path.join(terms_dir, f"{month}.json"), doc_terms[month])
+    for key, terms in shards.items():
+        _write_json(os.path.join(out_dir, "terms", f"{key}.json"), terms)
+
+    meta = {
+        "version":    version + 1,
+        "prefix":     PREFIX_LEN,
+        "docs":       len(docs),
+        "tombstones": 0,
+        "months":     sorted(months),
+        "shards":     sorted(shards),
+        "stopwords":  sorted(STOPWORDS),
+        "common":     common,
+    }
+    _write_json(os.path.join(out_dir, "meta.json"), meta)
+    return {"mode": "full", "added": len(docs), "removed": 0,
+            "shards": len(shards) + len(months)}
+
+
+def _clear(out_dir: str) -> None:
+    for sub in ("docs", "terms"):
+        _clear_dir(os.path.join(out_dir, sub))
+
+
+def _clear_dir(directory: str) -> None:
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+
+
+def update_index(sources=SOURCES, out_dir: str = INDEX_DIR, rebuild: bool = False,
+                 terms_dir: str = TERMS_DIR) -> dict:
+    """Met à jour l'index avec les documents nouveaux, modifiés ou supprimés.
+
+    Retourne {"mode": "full"|"incremental"|"unchanged", "added", "removed",
+    "shards"} (fragments réécrits).
+    """
+    files = scan(sources)
+    meta  = _read_json(os.path.join(out_dir, "meta.json"), None)
+    if rebuild or meta is None:
+        return build_index(files, out_dir, (meta or {}).get("version", 0), terms_dir)
+
+    months   = {month: _read_json(os.path.join(out_dir, "docs", f"{month}.json"), [])
+                for month in meta["months"]}
+    existing = {}     # url → (mois, k, empreinte)
+    for month, entries in months.items():
+        for k, entry in enumerate(entries):
+            if entry:
+                existing[entry[0]] = (month, k, entry[4])
+
+    # Seuls les fichiers nouveaux ou modifiés sont analysés
+    parsed = {}
+    seen   = set()
+    for path, (text, digest) in files.items():
+        url = document_url(path, _front_matter(text)[0])
+        seen.add(url)
+        old = existing.get(url)
+        if old is None or old[2] != digest:
+            parsed[url] = (parse_document(path, text), digest)
+    stale = [url for url in existing if url not in seen or url in parsed]
+
+    if not parsed and not stale:
+        return {"mode": "unchanged", "added": 0, "removed": 0, "shards": 0}
+
+    total      = len(existing) - len(stale) + len(parsed)
+    tombstones = meta["tombstones"] + len(stale)
+    if tombstones > COMPACT_RATIO * max(total, 1):
+        return build_index(files, out_dir, meta["version"], terms_dir)
+
+    doc_terms = {month: _read_json(os.path.join(terms_dir, f"{month}.json"), None)
+                 for month in {existing[url][0] for url in stale}}
+    if any(terms is None for terms in doc_terms.values()):
+        # Termes des documents retirés inconnus (index antérieur à TERMS_DIR)
+        return build_index(files, out_dir, meta["version"], terms_dir)
+
+    # Entrées vides pour les documents supprimés ou remplacés ; leurs entrées
+    # sont retirées des fragments de termes
+    common       = set(meta["common"])
+    removed      = defaultdict(lambda: defaultdict(set))    # fragment → {terme: {réf}}
+    dirty_months = set()
+    for url in stale:
+        month, k, _ = existing[url]
+        months[month][k] = None
+        for term in doc_terms[month][k] or ():
+            if term not in common:
+                removed[shard_key(term)][term].add(f"{month}/{k}")
+        doc_terms[month][k] = None
+        dirty_months.add(month)
+
+    # Nouveaux documents ajoutés en fin de fragment de mois
+    added  = defaultdict(dict)      # fragment → {terme: [réf, poids]}
+    for doc, digest in sorted(parsed.values(), key=lambda item: (item[0]["date"], item[0]["url"])):
+        month = doc["date"][:7] or "0000-00"
+        entries = months.setdefault(month, [])
+        ref = f"{month}/{len(entries)}"
+        entries.append([doc["url"], doc["title"], doc["date"], doc["description"], digest])
+        if month not in doc_terms:
+            doc_terms[month] = _read_json(os.path.join(terms_dir, f"{month}.json"), [])
+        doc_terms[month].append(sorted(doc["terms"]))
+        dirty_months.add(month)
+        for term, weight in doc["terms"].items():
+            if term not in common:
+                added[shard_key(term)].setdefault(term, []).append([ref, weight])
+
+    shard_names = set(meta["shards"])
+    for key in set(added) | set(removed):
+        path  = os.path.join(out_dir, "terms", f"{key}.json")
+        shard = _read_json(path, {}) if key in shard_names else {}
+        for term, refs in removed.get(key, {}).items():
+            if term not in shard:
+                continue
+            df, plist = shard[term]
+            df -= len(refs)
+            if df <= 0:
+                del shard[term]
+            else:
+                shard[term] = [df, [posting for posting in plist if posting[0] not in refs]]
+        for term, new_postings in added.get(key, {}).items():
+            df, plist = shard.get(term, [0, []])
+            df += len(new_postings)
+            if _is_common(df, total):
+                common.add(term)
+                shard.pop(term, None)
+                continue
+            shard[term] = [df, _cap(plist + new_postings)]
+        _write_json(path, shard)
+        shard_names.add(key)
+
+    for month in dirty_months:
+        _write_json(os.path.join(out_dir, "docs", f"{month}.json"), months[month])
+        _write_json(os.path.join(terms_dir, f"{month}.json"), doc_terms[month])
+
+    meta.update(
+        version=meta["version"] + 1,
+        docs=total,
+        tombstones=tombstones,
+        months=sorted(months),
+        shards=sorted(shard_names),
+        common=sorted(common),
+    )
+    _write_json(os.path.join(out_dir, "meta.json"), meta)
+    return {"mode": "incremental", "added": len(parsed), "removed": len(stale),
+            "shards": len(set(added) | set(removed)) + len(dirty_months)}
+
+
+# ──────────────────────────────────────────────
+# 4. Point d'entrée
+# ──────────────────────────────────────────────
+
+def main() -> None:
+    rebuild = "--rebuild" in sys.argv[1:]
+    stats = update_index(rebuild=rebuild)
+    if stats["mode"] == "unchanged":
+        print(f"ℹ️  Index de recherche à jour ({INDEX_DIR}).")
+    else:
+        print(f"✅ Index de recherche ({stats['mode']}) : {stats['added']} document(s) indexé(s), "
+              f"{stats['removed']} retiré(s), {stats['shards']} fragment(s) écrit(s) dans {INDEX_DIR}")
+    print("\nTerminé ✓")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+ETC Tracker — Suivi intrajournalier (démon)
+===========================================
+Interroge les sources de prix à intervalle régulier (`fetch_etc_data`) et tient en
+mémoire les statistiques glissantes des dernières 24 h. N'écrit que lorsque
+c'est utile :
+
+  - une mise à jour (content/updates/) quand le cours s'écarte de plus de
+    `--move` % du dernier cours publié, au plus une fois par `--cooldown` ;
+  - un rafraîchissement des actualités toutes les `--news-interval` secondes,
+    uniquement si au moins `--news-min` nouveaux articles sont parus.
+
+Avec `--beehiiv`, les mises à jour passent par la file d'envoi Beehiiv
+(beehiiv_outbox.py) : une livraison en échec est retentée aux ticks
+suivants, selon son backoff, sans retarder le suivi.
+
+Les sessions HTTP (keep-alive, ETag) et le client Anthropic sont ouverts une
+fois et réutilisés d'un tick à l'autre : un tick sans publication coûte une
+requête conditionnelle et une mise à jour O(1) des statistiques. Une source de
+secours n'est interrogée en plus que si le cours a bougé de plus de
+`price_sources.CROSS_CHECK_TOLERANCE` depuis le tick précédent (confirmation).
+
+Usage :
+  python scripts/tracker_daemon.py [--interval 300] [--move 3] [--cooldown 1800]
+                                   [--news-interval 1800] [--news-min 1]
+                                   [--beehiiv] [--ticks N]
+"""
+
+import os
+import time
+import signal
+import argparse
+import threading
+from collections import deque
+from datetime import datetime
+
+import beehiiv_outbox
+import price_history
+import run_report
+from generate_article import (
+    ETC_ASSET,
+    fetch_etc_data,
+    generate_ai_analysis,
+    generate_basic_analysis,
+    publish_to_beehiiv,
+    render_hugo_article,
+)
+from post_document import build_document
+
+
+POLL_INTERVAL   = 300       # s entre deux interrogations des sources de prix
+MOVE_THRESHOLD  = 3.0       # % d'écart au dernier cours publié
+COOLDOWN        = 1800      # s minimum entre deux mises à jour
+NEWS_INTERVAL   = 1800      # s entre deux vérifications des actualités
+NEWS_MIN        = 1         # nouveaux articles nécessaires pour régénérer les pages
+WINDOW          = 24 * 3600 # s couverts par les statistiques glissantes
+
+UPDATES_SECTION = os.path.join("content", "updates")
+
+# Dernier cours intrajournalier publié de chaque jour, séparé de l'historique
+# quotidien : celui-ci (graphique, indicateurs, synthèses) reste alimenté par
+# l'article du jour seul
+INTRADAY_PATH   = price_history.history_path("etc-intraday")
+
+
+# ──────────────────────────────────────────────
+# 1. Statistiques glissantes sur 24 h
+# ──────────────────────────────────────────────
+
+class RollingWindow:
+    """Cours des dernières `span` secondes : ouverture, plus haut et plus bas
+    glissants (files monotones), en O(1) amorti par point ajouté."""
+
+    def __init__(self, span: float = WINDOW):
+        self.span   = span
+        self.points = deque()    # (horodatage, cours)
+        self._high  = deque()    # cours décroissants
+        self._low   = deque()    # cours croissants
+
+    def add(self, ts: float, price: float) -> None:
+        self.points.append((ts, price))
+        while self._high and self._high[-1][1] <= price:
+            self._high.pop()
+        self._high.append((ts, price))
+        while self._low and self._low[-1][1] >= price:
+            self._low.pop()
+        self._low.append((ts, price))
+
+        cutoff = ts - self.span
+        while self.points[0][0] < cutoff:
+            self.points.popleft()
+        while self._high[0][0] < cutoff:
+            self._high.popleft()
+        while self._low[0][0] < cutoff:
+            self._low.popleft()
+
+    def stats(self) -> dict:
+        if not self.points:
+            return {}
+        first, last = self.points[0][1], self.points[-1][1]
+        high, low   = self._high[0][1], self._low[0][1]
+        return {
+            "open":      first,
+            "last":      last,
+            "high":      high,
+            "low":       low,
+            "change":    (last / first - 1) * 100 if first else 0.0,
+            "range":     (high / low - 1) * 100 if low else 0.0,
+            "samples":   len(self.points),
+        }
+
+
+# ──────────────────────────────────────────────
+# 2. Démon
+# ──────────────────────────────────────────────
+
+class IntradayTracker:
+    """Boucle de suivi : un tick = une interrogation + décision de publier."""
+
+    def __init__(self, interval: float = POLL_INTERVAL, move: float = MOVE_THRESHOLD,
+                 cooldown: float = COOLDOWN, news_interval: float = NEWS_INTERVAL,
+                 news_min: int = NEWS_MIN, beehiiv: bool = False):
+        self.interval      = interval
+        self.move          = move
+        self.cooldown      = cooldown
+        self.news_interval = news_interval
+        self.news_min      = news_min
+        self.beehiiv       = beehiiv
+        self.outbox        = beehiiv_outbox.Outbox() if beehiiv else None
+
+        self.window     = RollingWindow()
+        self.reference  = None      # (horodatage, cours) de la dernière publication
+        self.last_post  = 0.0
+        self.last_news  = 0.0
+        self.stop_event = threading.Event()
+
+        self.api_key     = os.environ.get("ANTHROPIC_API_KEY", "").strip()
+        self.newsapi_key = os.environ.get("NEWSAPI_API_KEY", "").strip()
+        self.client      = None
+        if self.api_key:
+            from fetch_ethereum_news import make_anthropic_client
+
+            self.client = make_anthropic_client(self.api_key)
+
+        # Référence initiale : cours de l'article du jour s'il existe, sinon
+        # premier cours relevé
+        last = price_history.latest(1)
+        if last and last[0]["date"] == datetime.now().strftime("%Y-%m-%d"):
+            day = datetime.fromisoformat(last[0]["date"])
+            self.reference = (day.timestamp(), last[0]["price_usd"])
+
+    def stop(self, *_) -> None:
+        self.stop_event.set()
+
+    # ── Cours ──
+
+    def tick(self, now: datetime = None) -> dict:
+        """Interroge les sources de prix, met à jour les statistiques et publie si le
+        seuil est franchi. Retourne les statistiques glissantes."""
+        now = now or datetime.now()
+        ts  = now.timestamp()
+        with run_report.stage("fetch"):
+            etc_data = fetch_etc_data()
+        run_report.count("daemon.ticks")
+
+        price = etc_data["price_usd"]
+        self.window.add(ts, price)
+        stats = self.window.stats()
+
+        if self.reference is None:
+            self.reference = (ts, price)
+            return stats
+
+        move = (price / self.reference[1] - 1) * 100
+        if abs(move) >= self.move and ts - self.last_post >= self.cooldown:
+            self.publish_update(etc_data, stats, move, now)
+        return stats
+
+    def publish_update(self, etc_data: dict, stats: dict, move: float, now: datetime) -> str:
+        """Écrit une mise à jour intrajournalière et son cours dans `INTRADAY_PATH`."""
+        since = datetime.fromtimestamp(self.reference[0]).strftime("%d/%m %H:%M")
+        print(f"\n🚨 {move:+.2f}% depuis {since} — mise à jour publiée")
+
+        analysis = None
+        if self.client is not None:
+            try:
+                with run_report.stage("analysis"):
+                    analysis = generate_ai_analysis(etc_data, self.api_key, client=self.client)
+            except Exception as exc:
+                print(f"   ⚠️  Erreur API Anthropic ({exc}) — analyse basique utilisée.")
+        analysis = analysis or generate_basic_analysis(etc_data)
+
+        doc = build_document(etc_data, analysis, now, ETC_ASSET)
+        doc["title"] = (f"{ETC_ASSET['symbol']} {doc['date']} {now.strftime('%H:%M')} — "
+                        f"{doc['price_usd']} $ ({move:+.2f}% depuis {since})")
+        doc["description"] = (
+            f"Mise à jour intrajournalière : {move:+.2f}% depuis {since}. "
+            f"Plage 24h {stats['low']:.4f}–{stats['high']:.4f} USD"
+        )
+
+        filepath = os.path.join(UPDATES_SECTION, f"{ETC_ASSET['slug']}-{now.strftime('%Y-%m-%d-%H%M')}.md")
+        with run_report.stage("write"):
+            _ensure_updates_section()
+            with open(filepath, "w", encoding="utf-8") as fh:
+                fh.write(render_hugo_article(etc_data, analysis, now, ETC_ASSET, doc))
+            price_history.append_day(now, etc_data, path=INTRADAY_PATH)
+        print(f"   ✅ {filepath}")
+
+        if self.beehiiv:
+            try:
+                with run_report.stage("publish"):
+                    publish_to_beehiiv(etc_data, analysis, os.environ.get("BEEHIIV_API_KEY", ""),
+                                       os.environ.get("BEEHIIV_PUBLICATION_ID", ""), doc=doc,
+                                       key=os.path.basename(filepath)[:-3], outbox=self.outbox)
+            except Exception as exc:
+                print(f"   ⚠️  Erreur Beehiiv ({exc}) — publication ignorée.")
+
+        run_report.count("daemon.updates")
+        self.reference = (now.timestamp(), etc_data["price_usd"])
+        self.last_post = now.timestamp()
+        return filepath
+
+    def flush_outbox(self) -> dict:
+        """Livre les publications Beehiiv reportées dont l'heure est venue."""
+        if self.outbox is None or not self.outbox.due():
+            return {}
+        with run_report.stage("publish"):
+            return self.outbox.flush(os.environ.get("BEEHIIV_API_KEY", ""),
+                                     os.environ.get("BEEHIIV_PUBLICATION_ID", ""))
+
+    # ── Actualités ──
+
+    def maybe_refresh_news(self, now: datetime = None) -> int:
+        """Vérifie les actualités si l'intervalle est écoulé ; régénère les
+        pages seulement à partir de `news_min` nouveaux articles."""
+        ts = (now or datetime.now()).timestamp()
+        if not self.newsapi_key or ts - self.last_news < self.news_interval:
+            return 0
+        self.last_news = ts
+
+        from fetch_ethereum_news import refresh_news
+
+        added = refresh_news(self.newsapi_key, self.api_key, client=self.client,
+                             min_fresh=self.news_min)
+        run_report.count("daemon.news_checks")
+        run_report.count("daemon.news_added", added)
+        return added
+
+    # ── Boucle ──
+
+    def run(self, ticks: int = None) -> None:
+        count = 0
+        while not self.stop_event.is_set() and (ticks is None or count < ticks):
+            started = time.monotonic()
+            try:
+                stats = self.tick()
+                print(f"📡 {datetime.now():%H:%M:%S}  {stats['last']:.4f} $  "
+                      f"24h {stats['change']:+.2f}%  [{stats['low']:.4f} – {stats['high']:.4f}]")
+                self.maybe_refresh_news()
+                self.flush_outbox()
+            except Exception as exc:
+                run_report.count("daemon.errors")
+                print(f"⚠️  Tick en échec ({exc}) — nouvel essai au prochain intervalle.")
+            count += 1
+            if ticks is None or count < ticks:
+                self.stop_event.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+
+def _ensure_updates_section() -> None:
+    index_path = os.path.join(UPDATES_SECTION, "_index.md")
+    if os.path.exists(index_path):
+        return
+    os.makedirs(UPDATES_SECTION, exist_ok=True)
+    with open(index_path, "w", encoding="utf-8") as fh:
+        fh.write('---\ntitle: "Mises à jour intrajournalières"\n'
+                 'description: "Mouvements marqués du cours ETC au fil de la journée"\n---\n')
+
+
+# ──────────────────────────────────────────────
+# 3. Point d'entrée
+# ──────────────────────────────────────────────
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="ETC Tracker — suivi intrajournalier")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL,
+                        help=f"secondes entre deux interrogations (défaut {POLL_INTERVAL})")
+    parser.add_argument("--move", type=float, default=MOVE_THRESHOLD,
+                        help=f"écart en %% au dernier cours publié déclenchant une mise à jour "
+                             f"(défaut {MOVE_THRESHOLD})")
+    parser.add_argument("--cooldown", type=float, default=COOLDOWN,
+                        help=f"secondes minimum entre deux mises à jour (défaut {COOLDOWN})")
+    parser.add_argument("--news-interval", type=float, default=NEWS_INTERVAL,
+                        help=f"secondes entre deux vérifications des actualités (défaut {NEWS_INTERVAL})")
+    parser.add_argument("--news-min", type=int, default=NEWS_MIN,
+                        help=f"nouveaux articles nécessaires pour régénérer les pages (défaut {NEWS_MIN})")
+    parser.add_argument("--beehiiv", action="store_true",
+                        help="publie aussi les mises à jour sur Beehiiv")
+    parser.add_argument("--ticks", type=int,
+                        help="s'arrête après N interrogations (par défaut : jusqu'à SIGINT/SIGTERM)")
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    args = parse_args()
+
+    with run_report.run("tracker_daemon"):
+        print("═══════════════════════════════════════")
+        print("  ETC Tracker — Suivi intrajournalier  ")
+        print("═══════════════════════════════════════")
+        print(f"   Intervalle {args.interval:.0f}s  |  seuil ±{args.move:.1f}%  |  "
+              f"actualités toutes les {args.news_interval:.0f}s")
+
+        tracker = IntradayTracker(args.interval, args.move, args.cooldown,
+                                  args.news_interval, args.news_min, args.beehiiv)
+        signal.signal(signal.SIGTERM, tracker.stop)
+        signal.signal(signal.SIGINT, tracker.stop)
+        tracker.run(args.ticks)
+        print("\nTerminé ✓")
+
+
+if __name__ == "__main__":
+    main()